@@ -0,0 +1,163 @@
+"""
+Background query execution for CyberPatriot Runbook windows
+Database calls run on a QThreadPool and their results are delivered back to the GUI thread through Qt signals
+"""
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+from PySide6.QtWidgets import QMessageBox, QWidget
+
+from db_config import POOL_CONFIG
+
+_query_pool = None
+
+
+def query_thread_pool() -> QThreadPool:
+    """Shared thread pool for database work.
+
+    Queries are I/O bound, so the pool is sized to the connection pool rather than
+    the CPU count: every thread can hold a connection without waiting on another.
+    """
+    global _query_pool
+    if _query_pool is None:
+        _query_pool = QThreadPool()
+        _query_pool.setMaxThreadCount(POOL_CONFIG['pool_size'] + POOL_CONFIG['max_overflow'])
+    return _query_pool
+
+
+class _WorkerSignals(QObject):
+    """Signals for QueryWorker (QRunnable is not a QObject and cannot declare its own)"""
+
+    finished = Signal(str, int, object)
+    failed = Signal(str, int, str)
+
+
+class QueryWorker(QRunnable):
+    """Runs a single database call on a pool thread"""
+
+    def __init__(self, key: str, generation: int, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # AsyncQueryRunner keeps the worker alive until it reports back
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _WorkerSignals()
+
+    def run(self):
+        """Execute the call and report the result or error"""
+        try:
+            try:
+                result = self.fn(*self.args, **self.kwargs)
+            except Exception as e:
+                self.signals.failed.emit(self.key, self.generation, str(e))
+                return
+            self.signals.finished.emit(self.key, self.generation, result)
+        except RuntimeError:
+            pass  # The window that asked was closed while the query ran
+
+
+class AsyncQueryRunner(QObject):
+    """Submits keyed background queries; a new request for a key supersedes the previous one.
+
+    Callbacks always run on the GUI thread. Results of superseded or cancelled
+    requests are dropped, so a fast series of selections only ever applies the last one.
+    A failed request without its own on_error is reported by _report_failure.
+    """
+
+    loading_changed = Signal(str, bool)
+
+    def __init__(self, parent=None, pool: QThreadPool | None = None):
+        super().__init__(parent)
+        self._pool = pool or query_thread_pool()
+        self._generations = {}
+        self._active = {}   # key -> (worker, on_result, on_error) for the current request
+        self._running = {}  # (key, generation) -> worker, kept referenced until it reports back
+
+    def submit(self, key: str, fn, *args, on_result=None, on_error=None, **kwargs) -> int:
+        """Run fn(*args, **kwargs) in the background and pass its return value to on_result"""
+        was_loading = self._drop(key)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+
+        worker = QueryWorker(key, generation, fn, args, kwargs)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        self._active[key] = (worker, on_result, on_error)
+        self._running[(key, generation)] = worker
+
+        if not was_loading:
+            self.loading_changed.emit(key, True)
+        self._pool.start(worker)
+        return generation
+
+    def cancel(self, key: str):
+        """Cancel the pending request for a key, if any"""
+        if self._drop(key):
+            self.loading_changed.emit(key, False)
+
+    def cancel_all(self):
+        """Cancel every pending request"""
+        for key in list(self._active):
+            self.cancel(key)
+
+    def is_loading(self, key: str) -> bool:
+        """Whether a request for key is still outstanding"""
+        return key in self._active
+
+    def _drop(self, key: str) -> bool:
+        """Forget the current request for key. Returns True if one was pending."""
+        entry = self._active.pop(key, None)
+        if entry is None:
+            return False
+        worker = entry[0]
+        self._generations[key] += 1  # Any result still in flight is now stale
+        if self._pool.tryTake(worker):
+            # Never started, so it will never report back
+            self._running.pop((worker.key, worker.generation), None)
+        return True
+
+    def _complete(self, key: str, generation: int):
+        """Release a finished worker and return its callbacks if it is still current"""
+        self._running.pop((key, generation), None)
+        if self._generations.get(key) != generation or key not in self._active:
+            return None
+        _, on_result, on_error = self._active.pop(key)
+        return on_result, on_error
+
+    @Slot(str, int, object)
+    def _on_finished(self, key, generation, result):
+        callbacks = self._complete(key, generation)
+        if callbacks is None:
+            return
+        try:
+            if callbacks[0]:
+                callbacks[0](result)
+        finally:
+            # Emitted after the callback so listeners see the applied result
+            self._finish_loading(key)
+
+    @Slot(str, int, str)
+    def _on_failed(self, key, generation, message):
+        callbacks = self._complete(key, generation)
+        if callbacks is None:
+            return
+        try:
+            if callbacks[1]:
+                callbacks[1](message)
+            else:
+                self._report_failure(key, message)
+        finally:
+            self._finish_loading(key)
+
+    def _report_failure(self, key: str, message: str):
+        """Default on_error: show the error over the owning window, or print it if there is none"""
+        parent = self.parent()
+        if isinstance(parent, QWidget):
+            QMessageBox.critical(parent, "Error", f"Failed to load data: {message}")
+        else:
+            print(f"Background query '{key}' failed: {message}")
+
+    def _finish_loading(self, key: str):
+        """Report that key is idle, unless a callback already submitted a new request for it"""
+        if key not in self._active:
+            self.loading_changed.emit(key, False)
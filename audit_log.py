@@ -0,0 +1,281 @@
+"""
+Audit logging for CyberPatriot Runbook
+Events are queued in memory and written to audit_logs by a background thread in multi-row
+INSERTs, so recording an action never adds a database round trip to the action itself
+"""
+import atexit
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from db_config import get_connection, close_connection
+
+AUDIT_CONFIG = {
+    'max_queue': 10000,      # Events held in memory; further events are dropped and counted
+    'batch_size': 200,       # Events per INSERT; a full batch is flushed immediately
+    'flush_interval': 2.0,   # Seconds a partial batch may wait before it is written
+    'close_timeout': 5.0,    # Seconds shutdown waits for the backlog to drain
+}
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+@dataclass
+class AuditEvent:
+    """One audit_logs row; created_at is taken when the event is recorded, not when it is written"""
+    action: str
+    resource_type: str
+    resource_id: int | None = None
+    previous_value: str | None = None
+    new_value: str | None = None
+    description: str | None = None
+    user_id: int | None = None
+    team_id: int | None = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+class AuditRepository:
+    """Repository for the audit_logs table"""
+
+    @staticmethod
+    def insert_events(events: list[AuditEvent]) -> bool:
+        """Write events with one multi-row INSERT. Returns False if they were not stored."""
+        connection = get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(events))
+            params = []
+            for event in events:
+                params.extend((
+                    event.user_id, event.team_id, event.action, event.resource_type, event.resource_id,
+                    event.previous_value, event.new_value, event.description, event.created_at,
+                ))
+            cursor.execute(
+                "INSERT INTO audit_logs "
+                "(user_id, team_id, action, resource_type, resource_id, previous_value, new_value, description, created_at) "
+                f"VALUES {values}",
+                params
+            )
+            connection.commit()
+            cursor.close()
+            return True
+        except Exception as e:
+            print(f"Error writing audit log: {e}")
+            connection.rollback()
+            return False
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def find_events(resource_type: str, resource_id: int | None = None, since: datetime | None = None,
+                    until: datetime | None = None, limit: int = 200) -> list[dict] | None:
+        """Newest-first events for a resource type (and optionally one resource) in a time window
+
+        Served by idx_audit_resource; a time window also limits the scan to the months it covers.
+        """
+        where = ["resource_type = %s"]
+        params = [resource_type]
+        if resource_id is not None:
+            where.append("resource_id = %s")
+            params.append(resource_id)
+        if since is not None:
+            where.append("created_at >= %s")
+            params.append(since)
+        if until is not None:
+            where.append("created_at < %s")
+            params.append(until)
+        params.append(limit)
+        return AuditRepository._fetch(
+            "SELECT id, user_id, team_id, action, resource_type, resource_id, previous_value, new_value, "
+            f"description, created_at FROM audit_logs WHERE {' AND '.join(where)} "
+            "ORDER BY created_at DESC, id DESC LIMIT %s",
+            params
+        )
+
+    @staticmethod
+    def daily_counts(team_id: int | None = None, since=None, until=None) -> list[dict] | None:
+        """Rolled-up (day, team_id, action, resource_type, event_count) rows, oldest day first"""
+        where, params = [], []
+        if team_id is not None:
+            where.append("team_id = %s")
+            params.append(team_id)
+        if since is not None:
+            where.append("day >= %s")
+            params.append(since)
+        if until is not None:
+            where.append("day < %s")
+            params.append(until)
+        sql = "SELECT day, team_id, action, resource_type, event_count FROM audit_daily_summary"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return AuditRepository._fetch(sql + " ORDER BY day, team_id, action", params)
+
+    @staticmethod
+    def _fetch(sql: str, params: list) -> list[dict] | None:
+        """Run a query and return rows as dicts (None if the database is unreachable)"""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        finally:
+            close_connection(connection)
+
+
+class AuditWriter:
+    """Bounded queue of audit events drained by a background flusher thread
+
+    log() only appends under a lock and never waits on the database. Events that do not
+    fit in the queue are dropped and counted; a batch that fails to write goes back to the
+    front of the queue and is retried on the next flush.
+    """
+
+    def __init__(self, max_queue: int = AUDIT_CONFIG['max_queue'], batch_size: int = AUDIT_CONFIG['batch_size'],
+                 flush_interval: float = AUDIT_CONFIG['flush_interval']):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._stopped = False
+        self._thread = None
+
+        self._stats = {
+            'logged': 0,
+            'written': 0,
+            'dropped': 0,
+            'failed_flushes': 0,
+        }
+
+    def log(self, action: str, resource_type: str, resource_id: int | None = None,
+            previous_value=None, new_value=None, description: str | None = None,
+            user_id: int | None = None, team_id: int | None = None) -> bool:
+        """Queue an event. Returns False if it was dropped because the queue is full or closed."""
+        event = AuditEvent(
+            action, resource_type, resource_id,
+            None if previous_value is None else str(previous_value),
+            None if new_value is None else str(new_value),
+            description, user_id, team_id,
+        )
+        with self._cond:
+            if self._closed or len(self._queue) >= self.max_queue:
+                self._stats['dropped'] += 1
+                return False
+            self._queue.append(event)
+            self._stats['logged'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Ask for everything queued to be written now and wait for it. Returns True once drained."""
+        with self._cond:
+            if self._thread is None:
+                return not self._queue
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._drained() or self._stopped, timeout)
+            return self._drained()
+
+    def close(self, timeout: float = AUDIT_CONFIG['close_timeout']) -> bool:
+        """Stop accepting events and write the backlog, waiting at most timeout seconds"""
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+        drained = self.flush(timeout)
+        with self._cond:
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        return drained
+
+    def stats(self) -> dict:
+        """Counters plus the current backlog (queued and being written)"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['backlog'] = len(self._queue) + self._in_flight
+        return stats
+
+    def _drained(self) -> bool:
+        return not self._queue and not self._in_flight
+
+    def _run(self):
+        """Flusher loop: write a batch when one is full, flush is asked for, or the interval passes"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._queue) >= self.batch_size or self._flush_requested or self._closed,
+                    self.flush_interval,
+                )
+                if not self._queue:
+                    self._flush_requested = False
+                    if self._closed:
+                        self._stopped = True
+                    self._cond.notify_all()
+                    if self._stopped:
+                        return
+                    continue
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_flight = len(batch)
+
+            written = AuditRepository.insert_events(batch)
+
+            with self._cond:
+                self._in_flight = 0
+                if written:
+                    self._stats['written'] += len(batch)
+                else:
+                    self._stats['failed_flushes'] += 1
+                    # Put the batch back in front, dropping the oldest events if it no longer fits
+                    room = self.max_queue - len(self._queue)
+                    if room < len(batch):
+                        self._stats['dropped'] += len(batch) - room
+                        batch = batch[len(batch) - room:] if room > 0 else []
+                    self._queue.extendleft(reversed(batch))
+                    if self._closed:
+                        # Shutting down with the database unreachable; give up rather than spin
+                        self._stopped = True
+                        self._cond.notify_all()
+                        return
+                self._cond.notify_all()
+
+            if not written:
+                time.sleep(self.flush_interval)  # Back off instead of retrying a down database at once
+
+
+def get_audit_writer() -> AuditWriter:
+    """Return the process-wide audit writer, creating it on first use"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+def audit(action: str, resource_type: str, resource_id: int | None = None, previous_value=None,
+          new_value=None, description: str | None = None, user_id: int | None = None,
+          team_id: int | None = None) -> bool:
+    """Record an audit event through the process-wide writer"""
+    return get_audit_writer().log(
+        action, resource_type, resource_id, previous_value, new_value, description, user_id, team_id
+    )
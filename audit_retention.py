@@ -0,0 +1,269 @@
+"""Retention for the audit log: monthly partitions, daily rollups and bounded purges.
+
+Usage: python audit_retention.py [--horizon-days N] [--months-ahead N] [--batch-size N]
+
+audit_logs is range-partitioned by month. Each run:
+  1. converts an unpartitioned audit_logs from an older install (once),
+  2. makes sure partitions exist for the coming months,
+  3. rolls complete days up into audit_daily_summary (counts per team, action and resource type),
+     re-rolling the last few summarised days to pick up events written late,
+  4. drops whole partitions older than the horizon, then deletes any older rows left in
+     the boundary month in bounded batches.
+Detail rows are never purged before their day has been rolled up.
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from db_config import get_connection, close_connection
+
+RETENTION_CONFIG = {
+    'horizon_days': 365,       # Detail rows older than this are purged; summaries are kept
+    'months_ahead': 3,         # Empty partitions kept ready beyond the current month
+    'purge_batch_size': 5000,  # Rows per DELETE, so a purge never holds long locks
+    'rollup_max_days': 62,     # Days rolled up per run
+    'rollup_overlap_days': 3,  # Summarised days re-rolled each run (retried batches keep their created_at)
+    'settle_minutes': 60,      # A day is rolled up only once it ended this long ago
+}
+
+PARTITION_PREFIX = "p"
+HISTORY_PARTITION = "p_history"
+FUTURE_PARTITION = "p_future"
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+class AuditRetentionRepository:
+    """Schema and maintenance statements for audit_logs and audit_daily_summary."""
+
+    @staticmethod
+    def ensure_schema(cursor):
+        """Partition audit_logs and create the summary table if an older install lacks them."""
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs' AND PARTITION_NAME IS NOT NULL"
+        )
+        if not cursor.fetchone()[0]:
+            # Partitioned tables cannot hold foreign keys, and the key must include created_at
+            cursor.execute(
+                "SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+                "WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs'"
+            )
+            for (constraint,) in cursor.fetchall():
+                cursor.execute(f"ALTER TABLE audit_logs DROP FOREIGN KEY `{constraint}`")
+
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs'"
+            )
+            columns = {row[0] for row in cursor.fetchall()}
+            changes = []
+            if "team_id" not in columns:
+                changes.append("ADD COLUMN team_id INT NULL AFTER user_id")
+            changes += [
+                "MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP",
+                "DROP PRIMARY KEY",
+                "ADD PRIMARY KEY (id, created_at)",
+                "ADD KEY idx_audit_resource (resource_type, resource_id, created_at)",
+            ]
+            cursor.execute(f"ALTER TABLE audit_logs {', '.join(changes)}")
+
+            # Everything logged so far lands in p_history; monthly partitions start this month
+            boundary = _month_start(date.today())
+            cursor.execute(
+                "ALTER TABLE audit_logs PARTITION BY RANGE COLUMNS (created_at) ("
+                f"PARTITION {HISTORY_PARTITION} VALUES LESS THAN ('{boundary:%Y-%m-%d}'), "
+                f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE))"
+            )
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS audit_daily_summary (
+                day DATE NOT NULL,
+                team_id INT NOT NULL DEFAULT 0,
+                action VARCHAR(255) NOT NULL,
+                resource_type VARCHAR(50) NOT NULL DEFAULT '',
+                event_count INT NOT NULL,
+                PRIMARY KEY (day, team_id, action, resource_type),
+                KEY idx_audit_summary_team (team_id, day)
+            )
+        """)
+
+    @staticmethod
+    def partitions(cursor) -> list[tuple[str, date | None]]:
+        """(name, exclusive upper bound) for each partition in order; None for MAXVALUE."""
+        cursor.execute(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs' AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        )
+        result = []
+        for name, description in cursor.fetchall():
+            bound = description.strip("'\"")
+            result.append((name, None if bound == "MAXVALUE" else datetime.strptime(bound[:10], "%Y-%m-%d").date()))
+        return result
+
+    @staticmethod
+    def add_partitions(cursor, months_ahead: int) -> list[str]:
+        """Split p_future so every month up to months_ahead from now has its own partition."""
+        bounds = [bound for _, bound in AuditRetentionRepository.partitions(cursor) if bound is not None]
+        month = max(bounds) if bounds else _month_start(date.today())
+        last = _month_start(date.today())
+        for _ in range(months_ahead):
+            last = _next_month(last)
+
+        new_partitions = []
+        while month <= last:
+            new_partitions.append(
+                f"PARTITION {_partition_name(month)} VALUES LESS THAN ('{_next_month(month):%Y-%m-%d}')"
+            )
+            month = _next_month(month)
+        if not new_partitions:
+            return []
+
+        cursor.execute(
+            f"ALTER TABLE audit_logs REORGANIZE PARTITION {FUTURE_PARTITION} INTO ("
+            f"{', '.join(new_partitions)}, PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE))"
+        )
+        return [definition.split()[1] for definition in new_partitions]
+
+    @staticmethod
+    def roll_up(connection, cursor, settled_before: datetime, max_days: int,
+                overlap_days: int = RETENTION_CONFIG['rollup_overlap_days']) -> tuple[int, date]:
+        """Roll complete days into audit_daily_summary.
+
+        The last overlap_days already summarised are rolled up again, since the upsert
+        replaces their counts. Returns (days rolled up, day up to which every detail row is
+        summarised). Days without events are skipped with one indexed lookup rather than scanned.
+        """
+        last_day = settled_before.date()  # Days before this one have ended and settled
+        cursor.execute("SELECT MAX(day) FROM audit_daily_summary")
+        latest = cursor.fetchone()[0]
+        start = latest + timedelta(days=1 - overlap_days) if latest else None
+
+        rolled = 0
+        while True:
+            if start is None:
+                cursor.execute("SELECT MIN(created_at) FROM audit_logs")
+            else:
+                cursor.execute("SELECT MIN(created_at) FROM audit_logs WHERE created_at >= %s", (start,))
+            first = cursor.fetchone()[0]
+            if first is None or first.date() >= last_day:
+                return rolled, last_day
+            day = first.date()
+            if rolled >= max_days:
+                return rolled, day
+
+            cursor.execute(
+                """
+                INSERT INTO audit_daily_summary (day, team_id, action, resource_type, event_count)
+                SELECT DATE(created_at), COALESCE(team_id, 0), action, COALESCE(resource_type, ''), COUNT(*)
+                FROM audit_logs
+                WHERE created_at >= %s AND created_at < %s
+                GROUP BY DATE(created_at), COALESCE(team_id, 0), action, COALESCE(resource_type, '')
+                ON DUPLICATE KEY UPDATE event_count = VALUES(event_count)
+                """,
+                (day, day + timedelta(days=1))
+            )
+            connection.commit()
+            rolled += 1
+            start = day + timedelta(days=1)
+
+    @staticmethod
+    def drop_partitions(cursor, before: date) -> list[str]:
+        """Drop partitions whose whole range ends on or before the given day."""
+        expired = [
+            name for name, bound in AuditRetentionRepository.partitions(cursor)
+            if bound is not None and bound <= before
+        ]
+        if expired:
+            cursor.execute(f"ALTER TABLE audit_logs DROP PARTITION {', '.join(expired)}")
+        return expired
+
+    @staticmethod
+    def purge_rows(connection, cursor, before: date, batch_size: int) -> int:
+        """Delete detail rows older than before in batches, committing after each one."""
+        deleted = 0
+        while True:
+            cursor.execute(
+                "DELETE FROM audit_logs WHERE created_at < %s ORDER BY created_at LIMIT %s",
+                (before, batch_size)
+            )
+            connection.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return deleted
+
+
+def run_maintenance(horizon_days: int = RETENTION_CONFIG['horizon_days'],
+                    months_ahead: int = RETENTION_CONFIG['months_ahead'],
+                    batch_size: int = RETENTION_CONFIG['purge_batch_size']) -> dict:
+    """Run every retention step once and return what each step did."""
+    connection = get_connection()
+    if not connection:
+        raise ConnectionError("Database unavailable")
+
+    try:
+        cursor = connection.cursor()
+        AuditRetentionRepository.ensure_schema(cursor)
+        added = AuditRetentionRepository.add_partitions(cursor, months_ahead)
+
+        settled_before = datetime.now() - timedelta(minutes=RETENTION_CONFIG['settle_minutes'])
+        rolled, summarised_until = AuditRetentionRepository.roll_up(
+            connection, cursor, settled_before, RETENTION_CONFIG['rollup_max_days']
+        )
+
+        # Never purge a day whose counts are not in the summary yet
+        purge_before = min(date.today() - timedelta(days=horizon_days), summarised_until)
+        dropped = AuditRetentionRepository.drop_partitions(cursor, purge_before)
+        deleted = AuditRetentionRepository.purge_rows(connection, cursor, purge_before, batch_size)
+        cursor.close()
+    finally:
+        close_connection(connection)
+
+    return {
+        'partitions_added': added,
+        'days_rolled_up': rolled,
+        'purged_before': purge_before,
+        'partitions_dropped': dropped,
+        'rows_deleted': deleted,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partition, roll up and purge the audit log.")
+    parser.add_argument("--horizon-days", type=int, default=RETENTION_CONFIG['horizon_days'],
+                        help="keep detail rows for this many days")
+    parser.add_argument("--months-ahead", type=int, default=RETENTION_CONFIG['months_ahead'],
+                        help="monthly partitions to create ahead of time")
+    parser.add_argument("--batch-size", type=int, default=RETENTION_CONFIG['purge_batch_size'],
+                        help="rows per purge DELETE")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        result = run_maintenance(args.horizon_days, args.months_ahead, args.batch_size)
+    except Exception as e:
+        print(f"Audit retention failed: {e}")
+        sys.exit(1)
+
+    print(f"Partitions added: {', '.join(result['partitions_added']) or 'none'}")
+    print(f"Days rolled up: {result['days_rolled_up']}")
+    print(f"Purged detail rows before {result['purged_before']}: "
+          f"{len(result['partitions_dropped'])} partition(s) dropped, {result['rows_deleted']} row(s) deleted")
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 """Login window for CyberPatriot Runbook application."""
 
 import sys
-import hashlib
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -20,24 +19,97 @@ from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont
 
 from db_config import get_connection, close_connection
+from async_query import AsyncQueryRunner
+from reference_cache import get_reference_cache
+from audit_log import audit
+from password_hashing import default_hasher, hasher_for, LegacySha256Hasher
 
 
 class PasswordManager:
-    """Utility class for password hashing and verification."""
+    """Utility class for password hashing and verification.
+
+    Hashing is deliberately slow (see password_hashing.HASH_CONFIG); call these
+    from a worker thread, not the GUI thread.
+    """
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using SHA256."""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash a password with the current algorithm, a random salt and the configured cost."""
+        return default_hasher().hash(password)
     
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
-        """Verify a password against its hash."""
-        return PasswordManager.hash_password(password) == password_hash
+        """Verify a password against its hash, whatever algorithm produced it."""
+        try:
+            return hasher_for(password_hash).verify(password, password_hash)
+        except ValueError:
+            return False
+
+    @staticmethod
+    def needs_rehash(password_hash: str) -> bool:
+        """Whether a hash uses a legacy algorithm or a lower cost than the current one."""
+        hasher = hasher_for(password_hash)
+        return isinstance(hasher, LegacySha256Hasher) or default_hasher().needs_rehash(password_hash)
 
 
 class UserRepository:
     """Repository for user database operations."""
+
+    # Most privileged first; decides which membership a multi-team user logs in with
+    ROLE_PRIORITY = ("admin", "coach", "team_captain", "mentor", "competitor")
+    
+    @staticmethod
+    def get_login_record(username: str) -> dict | None:
+        """Get a user, their password hash and all team memberships in one query."""
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(
+                """
+                SELECT u.id, u.name, u.username, u.password_hash, u.is_active,
+                       tm.team_id, tm.status, r.name AS role
+                FROM users u
+                LEFT JOIN team_members tm ON tm.user_id = u.id
+                LEFT JOIN roles r ON r.id = tm.role_id
+                WHERE u.username = %s
+                ORDER BY tm.team_id
+                """,
+                (username,)
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            close_connection(connection)
+        
+        if not rows:
+            return None
+        
+        first = rows[0]
+        return {
+            'id': first['id'],
+            'name': first['name'],
+            'username': first['username'],
+            'password_hash': first['password_hash'],
+            'is_active': first['is_active'],
+            'memberships': [
+                {'team_id': row['team_id'], 'role': row['role'], 'status': row['status']}
+                for row in rows if row['team_id'] is not None
+            ],
+        }
+    
+    @staticmethod
+    def primary_membership(memberships: list[dict]) -> dict | None:
+        """Pick the membership to log in with: usable ones first, then highest role, then lowest team id."""
+        def rank(membership):
+            usable = membership['status'] == 'approved' or membership['role'] == 'admin'
+            roles = UserRepository.ROLE_PRIORITY
+            priority = roles.index(membership['role']) if membership['role'] in roles else len(roles)
+            return (not usable, priority, membership['team_id'])
+        
+        return min(memberships, key=rank, default=None)
     
     @staticmethod
     def get_user_by_username(username: str) -> dict | None:
@@ -77,6 +149,23 @@ class UserRepository:
         finally:
             close_connection(connection)
     
+    @staticmethod
+    def update_password_hash(user_id: int, password_hash: str) -> bool:
+        """Replace a user's stored password hash."""
+        connection = get_connection()
+        if not connection:
+            return False
+        
+        try:
+            cursor = connection.cursor()
+            cursor.execute("UPDATE users SET password_hash = %s WHERE id = %s", (password_hash, user_id))
+            connection.commit()
+            cursor.close()
+            audit("password_rehashed", "user", user_id, new_value=password_hash.split("$", 1)[0], user_id=user_id)
+            return True
+        finally:
+            close_connection(connection)
+    
     @staticmethod
     def username_exists(username: str) -> bool:
         """Check if a username already exists."""
@@ -101,6 +190,7 @@ class UserRepository:
             return None
         
         cursor = None
+        created_team = False
         try:
             cursor = connection.cursor(dictionary=True)
             
@@ -114,17 +204,18 @@ class UserRepository:
             )
             user_id = cursor.lastrowid
             
-            # Ensure roles exist
-            roles = ['admin', 'coach', 'team_captain', 'mentor', 'competitor']
-            for r in roles:
-                cursor.execute("SELECT id FROM roles WHERE name = %s", (r,))
-                if not cursor.fetchone():
-                    cursor.execute("INSERT INTO roles (name) VALUES (%s)", (r,))
+            # Role ids come from the shared cache; the roles are only written on a fresh database
+            cache = get_reference_cache()
+            role_ids = cache.role_ids()
+            missing_roles = [r for r in UserRepository.ROLE_PRIORITY if r not in role_ids]
+            if missing_roles:
+                cursor.executemany("INSERT IGNORE INTO roles (name) VALUES (%s)", [(r,) for r in missing_roles])
+                placeholders = ", ".join(["%s"] * len(missing_roles))
+                cursor.execute(f"SELECT id, name FROM roles WHERE name IN ({placeholders})", missing_roles)
+                role_ids.update({row['name']: row['id'] for row in cursor.fetchall()})
             
             # Get role ID
-            cursor.execute("SELECT id FROM roles WHERE name = %s", (role,))
-            role_result = cursor.fetchone()
-            role_id = int(role_result['id']) if role_result else 1
+            role_id = int(role_ids[role]) if role in role_ids else 1
             
             # Create team membership
             if role in ['admin', 'coach']:
@@ -147,6 +238,7 @@ class UserRepository:
                             ('Default Team', '00-0000', 'Open', user_id)
                         )
                         team_id = cursor.lastrowid
+                        created_team = True
             else:
                 status = 'pending'
                 if not team_id:
@@ -161,10 +253,19 @@ class UserRepository:
                     """,
                     (user_id, team_id, role_id, status)
                 )
+                member_id = cursor.lastrowid
             else:
                 raise ValueError("No valid team_id for team membership")
             
             connection.commit()
+            if missing_roles:
+                cache.invalidate_roles()
+            if created_team:
+                cache.invalidate_teams()
+                audit("team_created", "team", team_id, new_value="Default Team", user_id=user_id, team_id=team_id)
+            audit("user_created", "user", user_id, new_value=username, description=f"Signed up as {role}", user_id=user_id)
+            audit(f"membership_{'approved' if status == 'approved' else 'requested'}", "team_member", member_id,
+                  new_value=status, description=f"Joined team {team_id} as {role}", user_id=user_id, team_id=team_id)
             
             return {
                 'id': user_id,
@@ -189,29 +290,15 @@ class TeamRepository:
     
     @staticmethod
     def get_team_by_id(team_id: int):
-        """Get team by ID from database."""
-        connection = get_connection()
-        if not connection:
-            return None
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute(
-                "SELECT id, name, team_code FROM teams WHERE id = %s",
-                (team_id,)
-            )
-            result = cursor.fetchone()
-            cursor.close()
-            
-            if result:
-                return {
-                    'id': result[0],
-                    'name': result[1],
-                    'team_code': result[2]
-                }
-            return None
-        finally:
-            close_connection(connection)
+        """Get team by ID from the shared reference cache."""
+        team = get_reference_cache().team_by_id(team_id)
+        if team:
+            return {
+                'id': team['id'],
+                'name': team['name'],
+                'team_code': team['team_code']
+            }
+        return None
 
 
 class LoginWindow(QMainWindow):
@@ -224,6 +311,7 @@ class LoginWindow(QMainWindow):
         self.setWindowTitle("CyberPatriot Runbook - Authentication")
         self.setGeometry(100, 100, 600, 500)
         self.setStyleSheet(self._get_stylesheet())
+        self.query_runner = AsyncQueryRunner(self)
 
         # Create central widget with tabs
         self.central_widget = QWidget()
@@ -335,10 +423,10 @@ class LoginWindow(QMainWindow):
         layout.addWidget(self.signup_team_id)
 
         # Signup button
-        signup_button = QPushButton("Sign Up")
-        signup_button.setMinimumHeight(40)
-        signup_button.clicked.connect(self._handle_signup)
-        layout.addWidget(signup_button)
+        self.signup_button = QPushButton("Sign Up")
+        self.signup_button.setMinimumHeight(40)
+        self.signup_button.clicked.connect(self._handle_signup)
+        layout.addWidget(self.signup_button)
 
         layout.addStretch()
         widget.setLayout(layout)
@@ -362,77 +450,92 @@ class LoginWindow(QMainWindow):
             self._show_message("Input Error", "Please enter both username and password.", QMessageBox.Icon.Warning)
             return
 
-        try:
-            user = UserRepository.get_user_by_username(username)
+        # Password verification is deliberately expensive, so it runs off the GUI thread
+        self.login_button.setEnabled(False)
+        self.query_runner.submit(
+            "login", self._authenticate, username, password,
+            on_result=self._on_login_result,
+            on_error=self._on_login_error,
+        )
 
-            if not user:
-                self._show_message("Login Failed", "User not found.", QMessageBox.Icon.Warning)
-                return
+    @staticmethod
+    def _authenticate(username: str, password: str) -> tuple[str, dict | None]:
+        """Look up and verify a user on a worker thread. Returns (outcome, user data)."""
+        # User, hash and memberships arrive together: one pooled connection per login
+        user = UserRepository.get_login_record(username)
+        if not user:
+            return "not_found", None
 
-            if not PasswordManager.verify_password(password, user['password_hash']):
-                self._show_message("Login Failed", "Invalid password.", QMessageBox.Icon.Warning)
-                return
+        if not PasswordManager.verify_password(password, user['password_hash']):
+            return "bad_password", None
 
-            if not user['is_active']:
-                self._show_message("Account Inactive", "Your account has been deactivated.", QMessageBox.Icon.Warning)
-                return
-
-            # Get user role and approval status
-            connection = get_connection()
-            if not connection:
-                self._show_message("Error", "Cannot connect to database.", QMessageBox.Icon.Critical)
-                return
+        if not user['is_active']:
+            return "inactive", None
 
+        # Upgrade legacy or outdated hashes while the plaintext is at hand
+        if PasswordManager.needs_rehash(user['password_hash']):
             try:
-                cursor = connection.cursor()
-                cursor.execute(
-                    """
-                    SELECT r.name, tm.status 
-                    FROM team_members tm
-                    JOIN roles r ON tm.role_id = r.id
-                    WHERE tm.user_id = %s
-                    LIMIT 1
-                    """,
-                    (user['id'],)
-                )
-                role_result = cursor.fetchone()
-                cursor.close()
+                UserRepository.update_password_hash(user['id'], PasswordManager.hash_password(password))
+            except Exception as e:
+                print(f"Could not upgrade password hash for user {user['id']}: {e}")
+
+        membership = UserRepository.primary_membership(user['memberships'])
+        if not membership:
+            return "no_membership", None
+
+        return "ok", {
+            "id": user['id'],
+            "name": user['name'],
+            "username": user['username'],
+            "role": membership['role'],
+            "team_id": membership['team_id'],
+            "is_approved": (membership['status'] == 'approved'),
+        }
 
-                if role_result:
-                    role, approval_status = role_result
-                    is_approved = (approval_status == 'approved')
-
-                    # Check if user is approved (except for admins)
-                    if role != "admin" and not is_approved:
-                        pending_msg = "Your account is pending admin approval. "
-                        if role == "coach":
-                            pending_msg += "Please wait for an admin to approve your access."
-                        else:
-                            pending_msg += "Please wait for your team captain to approve your access."
-                        self._show_message(
-                            "Pending Approval",
-                            pending_msg,
-                            QMessageBox.Icon.Warning,
-                        )
-                        return
-
-                    # Successful login
-                    user_data = {
-                        "id": user['id'],
-                        "name": user['name'],
-                        "username": user['username'],
-                        "role": role,
-                        "is_approved": is_approved,
-                    }
-
-                    self.login_successful.emit(user_data)
-                    self.login_username.clear()
-                    self.login_password.clear()
-            finally:
-                close_connection(connection)
+    def _on_login_result(self, result):
+        """Report the outcome of a background login attempt."""
+        self.login_button.setEnabled(True)
+        outcome, user_data = result
 
-        except Exception as e:
-            self._show_message("Error", f"An error occurred during login: {str(e)}", QMessageBox.Icon.Critical)
+        if outcome == "not_found":
+            self._show_message("Login Failed", "User not found.", QMessageBox.Icon.Warning)
+            return
+
+        if outcome == "bad_password":
+            self._show_message("Login Failed", "Invalid password.", QMessageBox.Icon.Warning)
+            return
+
+        if outcome == "inactive":
+            self._show_message("Account Inactive", "Your account has been deactivated.", QMessageBox.Icon.Warning)
+            return
+
+        if outcome != "ok":
+            return
+
+        # Check if user is approved (except for admins)
+        role = user_data["role"]
+        if role != "admin" and not user_data["is_approved"]:
+            pending_msg = "Your account is pending admin approval. "
+            if role == "coach":
+                pending_msg += "Please wait for an admin to approve your access."
+            else:
+                pending_msg += "Please wait for your team captain to approve your access."
+            self._show_message(
+                "Pending Approval",
+                pending_msg,
+                QMessageBox.Icon.Warning,
+            )
+            return
+
+        # Successful login
+        self.login_successful.emit(user_data)
+        self.login_username.clear()
+        self.login_password.clear()
+
+    def _on_login_error(self, message: str):
+        """Report an error raised during a background login attempt."""
+        self.login_button.setEnabled(True)
+        self._show_message("Error", f"An error occurred during login: {message}", QMessageBox.Icon.Critical)
 
     def _validate_team_code(self, team_code: str) -> tuple[bool, str]:
         """Validate team code format (XX-XXXX where X is digit)."""
@@ -444,22 +547,11 @@ class LoginWindow(QMainWindow):
         return True, ""
     
     def _get_team_by_code(self, team_code: str) -> dict | None:
-        """Get team by team code from database."""
-        connection = get_connection()
-        if not connection:
-            return None
-        
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT id, name, team_code FROM teams WHERE team_code = %s",
-                (team_code,)
-            )
-            result = cursor.fetchone()
-            cursor.close()
-            return result
-        finally:
-            close_connection(connection)
+        """Get team by team code from the shared reference cache."""
+        team = get_reference_cache().team_by_code(team_code)
+        if team:
+            return {'id': team['id'], 'name': team['name'], 'team_code': team['team_code']}
+        return None
 
     def _show_message(self, title: str, message: str, icon: QMessageBox.Icon = QMessageBox.Icon.Information):
         """Show a message box with selectable text."""
@@ -527,55 +619,68 @@ class LoginWindow(QMainWindow):
                 self._show_message("Team Not Found", f"Team code '{team_id_str}' does not exist.", QMessageBox.Icon.Warning)
                 return
 
-        try:
-            # Hash password
-            password_hash = PasswordManager.hash_password(password)
-
-            # Create user
-            new_user = UserRepository.create_user(
-                name=name,
-                username=username,
-                password_hash=password_hash,
-                role=role_str,
-                team_id=int(team['id']) if team else None
-            )
+        # Hashing with the configured KDF cost runs off the GUI thread
+        self.signup_button.setEnabled(False)
+        self.query_runner.submit(
+            "signup", self._register, name, username, password, role_str,
+            int(team['id']) if team else None,
+            on_result=lambda new_user: self._on_signup_result(new_user, role_str, role_display),
+            on_error=self._on_signup_error,
+        )
 
-            if new_user:
-                if role_str in ['admin', 'coach', 'mentor']:
-                    message = (
-                        f"Your {role_display.capitalize()} account has been created successfully!\n"
-                        f"You can now log in with your credentials."
-                    )
-                    self._show_message("Account Created", message, QMessageBox.Icon.Information)
-                    # Auto-login admin/coach/mentor
-                    user_data = {
-                        "id": new_user['id'],
-                        "name": new_user['name'],
-                        "username": new_user['username'],
-                        "role": new_user['role'],
-                        "is_approved": new_user['is_approved'],
-                    }
-                    self.login_successful.emit(user_data)
-                else:
-                    message = (
-                        "Your account has been created and is pending approval.\n"
-                    "Your team coach will review your request soon."
+    @staticmethod
+    def _register(name: str, username: str, password: str, role: str, team_id: int | None) -> dict | None:
+        """Hash the password and create the user on a worker thread."""
+        password_hash = PasswordManager.hash_password(password)
+        return UserRepository.create_user(
+            name=name,
+            username=username,
+            password_hash=password_hash,
+            role=role,
+            team_id=team_id
+        )
+
+    def _on_signup_result(self, new_user: dict | None, role_str: str, role_display: str):
+        """Report a completed background signup."""
+        self.signup_button.setEnabled(True)
+        if new_user:
+            if role_str in ['admin', 'coach', 'mentor']:
+                message = (
+                    f"Your {role_display.capitalize()} account has been created successfully!\n"
+                    f"You can now log in with your credentials."
                 )
                 self._show_message("Account Created", message, QMessageBox.Icon.Information)
-
-            # Clear fields
-            self.signup_name.clear()
-            self.signup_username.clear()
-            self.signup_password.clear()
-            self.signup_confirm.clear()
-            self.signup_team_id.clear()
-
-            # Switch to login tab if not auto-logged in
-            if role_str not in ["admin", "coach", "mentor"]:
-                self.tab_widget.setCurrentIndex(0)
-
-        except Exception as e:
-            self._show_message("Error", f"An error occurred during signup: {str(e)}", QMessageBox.Icon.Critical)
+                # Auto-login admin/coach/mentor
+                user_data = {
+                    "id": new_user['id'],
+                    "name": new_user['name'],
+                    "username": new_user['username'],
+                    "role": new_user['role'],
+                    "is_approved": new_user['is_approved'],
+                }
+                self.login_successful.emit(user_data)
+            else:
+                message = (
+                    "Your account has been created and is pending approval.\n"
+                "Your team coach will review your request soon."
+            )
+            self._show_message("Account Created", message, QMessageBox.Icon.Information)
+
+        # Clear fields
+        self.signup_name.clear()
+        self.signup_username.clear()
+        self.signup_password.clear()
+        self.signup_confirm.clear()
+        self.signup_team_id.clear()
+
+        # Switch to login tab if not auto-logged in
+        if role_str not in ["admin", "coach", "mentor"]:
+            self.tab_widget.setCurrentIndex(0)
+
+    def _on_signup_error(self, message: str):
+        """Report an error raised during a background signup."""
+        self.signup_button.setEnabled(True)
+        self._show_message("Error", f"An error occurred during signup: {message}", QMessageBox.Icon.Critical)
 
     def _get_stylesheet(self) -> str:
         """Return the stylesheet for the login window."""
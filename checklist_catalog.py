@@ -0,0 +1,137 @@
+"""Persistent index of checklist JSON files.
+
+The catalog remembers each file's mtime, size, team and item count so a team switch
+only looks up that team's entries, and a refresh only re-parses files that changed.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from checklist_loader import StreamingChecklist
+
+CATALOG_FILENAME = ".catalog.json"
+CATALOG_VERSION = 1
+
+
+class ChecklistCatalog:
+    """Index of the checklist files in a directory, keyed by file name."""
+
+    def __init__(self, checklists_dir: Path):
+        self.checklists_dir = Path(checklists_dir)
+        self.index_path = self.checklists_dir / CATALOG_FILENAME
+        self.entries = {}
+        self._by_team = {}
+        self._load_index()
+
+    def refresh(self) -> bool:
+        """Bring the catalog up to date with the directory. Returns True if anything changed."""
+        if not self.checklists_dir.exists():
+            changed = bool(self.entries)
+            self.entries = {}
+            self._rebuild_team_index()
+            return changed
+
+        changed = False
+        seen = set()
+        with os.scandir(self.checklists_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(".json") or dir_entry.name == CATALOG_FILENAME:
+                    continue
+                if not dir_entry.is_file():
+                    continue
+                seen.add(dir_entry.name)
+                if self._index_file(dir_entry.name, dir_entry.stat()):
+                    changed = True
+
+        for filename in set(self.entries) - seen:
+            del self.entries[filename]
+            changed = True
+
+        if changed:
+            self._rebuild_team_index()
+            self._save_index()
+        return changed
+
+    def update_file(self, filename: str) -> bool:
+        """Re-index one file if its mtime or size changed. Returns True if the entry changed."""
+        try:
+            stat_result = (self.checklists_dir / filename).stat()
+        except OSError:
+            return self.remove_file(filename)
+
+        if not self._index_file(filename, stat_result):
+            return False
+        self._rebuild_team_index()
+        self._save_index()
+        return True
+
+    def remove_file(self, filename: str) -> bool:
+        """Drop a file from the catalog. Returns True if it was indexed."""
+        if self.entries.pop(filename, None) is None:
+            return False
+        self._rebuild_team_index()
+        self._save_index()
+        return True
+
+    def _index_file(self, filename: str, stat_result) -> bool:
+        """Parse a file into its catalog entry unless the stored entry is current."""
+        path = self.checklists_dir / filename
+
+        entry = self.entries.get(filename)
+        if entry and entry["mtime_ns"] == stat_result.st_mtime_ns and entry["size"] == stat_result.st_size:
+            return False
+
+        try:
+            # Indexing reads names and offsets only; item text is never decoded here
+            checklist = StreamingChecklist(path)
+            team_id, name, item_count = checklist.team_id, checklist.name, len(checklist)
+        except Exception:
+            # Unreadable or half-written files are skipped until they change again
+            team_id, name, item_count = None, Path(filename).stem, 0
+
+        self.entries[filename] = {
+            "mtime_ns": stat_result.st_mtime_ns,
+            "size": stat_result.st_size,
+            "team_id": team_id,
+            "name": name,
+            "item_count": item_count,
+        }
+        return True
+
+    def checklists_for_team(self, team_id) -> list[tuple[str, Path]]:
+        """Return (display name, path) pairs for a team's checklists, sorted by file name."""
+        return [
+            (Path(filename).stem, self.checklists_dir / filename)
+            for filename in self._by_team.get(team_id, [])
+        ]
+
+    def _rebuild_team_index(self):
+        """Group file names by team id."""
+        by_team = {}
+        for filename in sorted(self.entries):
+            by_team.setdefault(self.entries[filename]["team_id"], []).append(filename)
+        self._by_team = by_team
+
+    def _load_index(self):
+        """Read the catalog written by a previous run, if any."""
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == CATALOG_VERSION:
+                self.entries = data.get("entries", {})
+        except Exception:
+            self.entries = {}
+        self._rebuild_team_index()
+
+    def _save_index(self):
+        """Write the catalog atomically so a crash never leaves a truncated index."""
+        if not self.checklists_dir.exists():
+            return
+        tmp_path = self.index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": CATALOG_VERSION, "entries": self.entries}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save checklist catalog: {e}")
@@ -0,0 +1,137 @@
+"""Streaming loader for large checklist JSON files.
+
+Imported benchmark checklists can be tens of MB. StreamingChecklist maps the file
+once and records the byte span and name of every item, without decoding
+descriptions or how-to text. An item's full text is read from disk only when it
+is displayed.
+"""
+
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+
+from checklist_model import ChecklistItem
+
+# JSON strings (with escapes) and structural characters; numbers, literals and
+# whitespace are skipped, so a long description costs a single match
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:,]', re.DOTALL)
+
+
+class StreamingChecklist:
+    """A checklist file indexed by item offsets, with item text read on demand."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.metadata = {}
+        self.names = []
+        self._spans = []
+        self._signature = None
+        self._index()
+
+    @property
+    def name(self) -> str:
+        return self.metadata.get("name") or self.path.stem
+
+    @property
+    def team_id(self):
+        return self.metadata.get("team_id")
+
+    def __len__(self):
+        return len(self._spans)
+
+    def headers(self) -> list[ChecklistItem]:
+        """Items with names only (text not yet read) for the list pane."""
+        return [ChecklistItem(name, None, None) for name in self.names]
+
+    def item(self, idx: int) -> dict:
+        """Read and decode one item in full."""
+        if self._current_signature() != self._signature:
+            self._index()  # The file changed since it was indexed
+        start, end = self._spans[idx]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+    def items(self):
+        """Yield every item in full, one at a time, reading the file sequentially."""
+        if self._current_signature() != self._signature:
+            self._index()
+        with open(self.path, "rb") as f:
+            for start, end in self._spans:
+                f.seek(start)
+                yield json.loads(f.read(end - start))
+
+    def _current_signature(self):
+        stat_result = os.stat(self.path)
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def _index(self):
+        """Scan the file once, recording top-level fields and each item's span and name."""
+        self.metadata, self.names, self._spans = {}, [], []
+        self._signature = self._current_signature()
+        if self._signature[1] == 0:
+            raise ValueError(f"{self.path} is empty")
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            stack = []          # Open containers, b"{" or b"["
+            key = None          # Last object key seen
+            expecting_key = False
+            in_items = False    # Inside the top-level "items" array
+            value_key = None    # Top-level key whose value is being skipped
+            value_start = None  # Start of that value
+            item_start = None
+            item_name = None
+
+            for match in _TOKEN.finditer(mm):
+                token = match.group()
+                depth = len(stack)
+                if token[0] == 0x22:  # '"'
+                    if expecting_key:
+                        key = json.loads(token)
+                        expecting_key = False
+                    elif depth == 3 and in_items and key == "name":
+                        item_name = json.loads(token)
+                    continue
+
+                if token == b"{":
+                    stack.append(token)
+                    expecting_key = True
+                    if depth == 2 and in_items:
+                        item_start, item_name = match.start(), None
+                elif token == b"[":
+                    stack.append(token)
+                    if depth == 1 and key == "items":
+                        in_items = True
+                elif token in (b"}", b"]"):
+                    if not stack:
+                        raise ValueError(f"{self.path} is not valid JSON")
+                    if depth == 1 and value_start is not None:
+                        self._set_metadata(value_key, mm[value_start:match.start()])
+                        value_start = None
+                    elif depth == 3 and in_items and item_start is not None:
+                        self._spans.append((item_start, match.end()))
+                        self.names.append(item_name if item_name is not None else "")
+                        item_start = None
+                    elif depth == 2 and in_items:
+                        in_items = False
+                    stack.pop()
+                elif token == b":":
+                    if depth == 1 and key != "items":
+                        value_key, value_start = key, match.end()
+                elif token == b",":
+                    if depth == 1 and value_start is not None:
+                        self._set_metadata(value_key, mm[value_start:match.start()])
+                        value_start = None
+                    expecting_key = bool(stack) and stack[-1] == b"{"
+
+            if stack:
+                raise ValueError(f"{self.path} is not a complete JSON document")
+
+    def _set_metadata(self, key: str, raw: bytes):
+        """Decode one top-level value other than the items."""
+        try:
+            self.metadata[key] = json.loads(raw)
+        except ValueError:
+            pass
@@ -0,0 +1,70 @@
+"""Compact in-memory representation of checklists, shared by the creator and the runner."""
+
+import sys
+
+# Run statuses, stored as one byte per item; the index is the stored code
+STATUSES = ("incomplete", "complete", "skipped")
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+class ChecklistItem:
+    """One checklist item.
+
+    Slots keep an item to a fixed handful of pointers instead of a dict. Names are
+    interned, so the same item across several open checklists shares one string.
+    description and how_to are None for items whose text has not been read yet.
+    """
+
+    __slots__ = ("id", "name", "description", "how_to")
+
+    def __init__(self, name: str, description: str | None = "", how_to: str | None = "", id: int | None = None):
+        self.id = id
+        self.name = sys.intern(name)
+        self.description = description
+        self.how_to = how_to
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChecklistItem":
+        """Build an item from its JSON form."""
+        return cls(data.get("name", ""), data.get("description", ""), data.get("how_to", ""), data.get("id"))
+
+    def to_dict(self) -> dict:
+        """Return the item's JSON form."""
+        data = {"name": self.name, "description": self.description or "", "how_to": self.how_to or ""}
+        if self.id is not None:
+            data["id"] = self.id
+        return data
+
+
+class ChecklistRun:
+    """Status and viewed flags for a run through a list of items, one byte each."""
+
+    __slots__ = ("items", "_statuses", "_viewed")
+
+    def __init__(self, items: list[ChecklistItem]):
+        self.items = items
+        self._statuses = bytearray(len(items))  # All "incomplete"
+        self._viewed = bytearray(len(items))
+
+    def __len__(self):
+        return len(self.items)
+
+    def status(self, idx: int) -> str:
+        return STATUSES[self._statuses[idx]]
+
+    def set_status(self, idx: int, status: str):
+        self._statuses[idx] = _STATUS_CODES[status]
+
+    def is_viewed(self, idx: int) -> bool:
+        return bool(self._viewed[idx])
+
+    def mark_viewed(self, idx: int) -> bool:
+        """Mark an item viewed. Returns True if it was not viewed before."""
+        if self._viewed[idx]:
+            return False
+        self._viewed[idx] = 1
+        return True
+
+    def counts(self) -> dict[str, int]:
+        """Number of items in each status."""
+        return {status: self._statuses.count(code) for status, code in _STATUS_CODES.items()}
@@ -0,0 +1,130 @@
+"""Persistence of checklist runner progress in the checklist_status table."""
+
+from PySide6.QtCore import QObject, QTimer
+
+from db_config import get_connection, close_connection
+from async_query import AsyncQueryRunner
+
+# Rows per INSERT statement; keeps packets well under max_allowed_packet
+WRITE_CHUNK_SIZE = 500
+
+
+class ChecklistProgressRepository:
+    """Repository for per-user checklist item status."""
+
+    @staticmethod
+    def load_statuses(user_id: int, item_ids: list[int]) -> dict[int, str] | None:
+        """Return {checklist_item_id: status} for a user's items in one query."""
+        if not item_ids:
+            return {}
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            placeholders = ", ".join(["%s"] * len(item_ids))
+            cursor.execute(
+                f"SELECT checklist_item_id, status FROM checklist_status "
+                f"WHERE user_id = %s AND checklist_item_id IN ({placeholders})",
+                (user_id, *item_ids)
+            )
+            statuses = {item_id: status for item_id, status in cursor.fetchall()}
+            cursor.close()
+            return statuses
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def save_statuses(user_id: int, statuses: dict[int, str]) -> bool:
+        """Upsert many item statuses with multi-row INSERT ... ON DUPLICATE KEY UPDATE."""
+        if not statuses:
+            return True
+        connection = get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            items = list(statuses.items())
+            for start in range(0, len(items), WRITE_CHUNK_SIZE):
+                chunk = items[start:start + WRITE_CHUNK_SIZE]
+                values = ", ".join(["(%s, %s, %s)"] * len(chunk))
+                params = []
+                for item_id, status in chunk:
+                    params.extend((user_id, item_id, status))
+                cursor.execute(
+                    f"INSERT INTO checklist_status (user_id, checklist_item_id, status) VALUES {values} "
+                    f"ON DUPLICATE KEY UPDATE status = VALUES(status)",
+                    params
+                )
+            connection.commit()
+            cursor.close()
+            return True
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            close_connection(connection)
+
+
+class ChecklistProgressWriter(QObject):
+    """Write-behind queue for a user's checklist item statuses.
+
+    Changes are coalesced per item, so rapid clicks on the same item cost one row,
+    and written in the background on a timer. flush(wait=True) writes synchronously,
+    for use when the window closes.
+    """
+
+    def __init__(self, user_id: int, flush_interval_ms: int = 2000, parent=None):
+        super().__init__(parent)
+        self.user_id = user_id
+        self._pending = {}
+        self._in_flight = {}
+        self._query_runner = AsyncQueryRunner(self)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def record(self, item_id: int, status: str):
+        """Queue a status change; the latest change for an item wins."""
+        self._pending[item_id] = status
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self, wait: bool = False):
+        """Write queued changes, in the background unless wait is True."""
+        self._timer.stop()
+        if wait:
+            self._query_runner.cancel("flush")
+            # Anything in flight is written again; the upsert makes that harmless
+            rows = {**self._in_flight, **self._pending}
+            self._in_flight, self._pending = {}, {}
+            try:
+                if not ChecklistProgressRepository.save_statuses(self.user_id, rows):
+                    print("Could not save checklist progress: database unavailable")
+            except Exception as e:
+                print(f"Could not save checklist progress: {e}")
+            return
+
+        if not self._pending or self._query_runner.is_loading("flush"):
+            if self._pending:
+                self._timer.start()  # A write is still running; try again next tick
+            return
+
+        self._in_flight, self._pending = self._pending, {}
+        self._query_runner.submit(
+            "flush", ChecklistProgressRepository.save_statuses, self.user_id, self._in_flight,
+            on_result=self._on_flushed,
+            on_error=lambda message: self._on_flushed(False),
+        )
+
+    def _on_flushed(self, saved: bool):
+        """Requeue rows from a failed write unless they were changed again meanwhile."""
+        rows, self._in_flight = self._in_flight, {}
+        if not saved:
+            for item_id, status in rows.items():
+                self._pending.setdefault(item_id, status)
+        if self._pending:
+            self._timer.start()
@@ -0,0 +1,190 @@
+"""Database storage for checklists and their items."""
+
+import json
+from pathlib import Path
+
+from db_config import get_connection, close_connection
+from checklist_model import ChecklistItem
+from audit_log import audit
+
+# Rows per multi-row INSERT; keeps packets well under max_allowed_packet
+INSERT_CHUNK_SIZE = 500
+
+
+class ChecklistRepository:
+    """Repository for the checklists and checklist_items tables."""
+
+    @staticmethod
+    def save_checklist(title: str, team_id: int, items: list[ChecklistItem], created_by: int | None = None) -> int | None:
+        """Insert a checklist and all of its items in one transaction. Returns the checklist id."""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            checklist_id = ChecklistRepository._insert_checklist(cursor, title, team_id, created_by)
+            ChecklistRepository._insert_items(cursor, [(checklist_id, items)], created_by)
+            connection.commit()
+            cursor.close()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            close_connection(connection)
+
+        audit("checklist_created", "checklist", checklist_id, new_value=title,
+              description=f"{len(items)} item(s) for team {team_id}", user_id=created_by, team_id=team_id)
+        return checklist_id
+
+    @staticmethod
+    def list_checklists(team_id: int) -> list[tuple[int, str]] | None:
+        """Return (id, title) pairs for a team's checklists, or None if the database is unreachable."""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT id, title FROM checklists WHERE team_id = %s ORDER BY title", (team_id,))
+            checklists = [(row[0], row[1]) for row in cursor.fetchall()]
+            cursor.close()
+            return checklists
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def load_checklist(checklist_id: int) -> dict | None:
+        """Load a checklist with its items in order, using a single join.
+
+        The result has the same fields as a checklist JSON file, with ChecklistItem items.
+        """
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(
+                """
+                SELECT c.id, c.title, c.team_id,
+                       ci.id AS item_id, ci.title AS item_title, ci.description, ci.steps
+                FROM checklists c
+                LEFT JOIN checklist_items ci ON ci.checklist_id = c.id
+                WHERE c.id = %s
+                ORDER BY ci.item_order, ci.id
+                """,
+                (checklist_id,)
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            close_connection(connection)
+
+        if not rows:
+            return None
+
+        first = rows[0]
+        return {
+            "id": first["id"],
+            "name": first["title"],
+            "team_id": first["team_id"],
+            "items": [
+                ChecklistItem(row["item_title"], row["description"] or "", row["steps"] or "", row["item_id"])
+                for row in rows if row["item_id"] is not None
+            ],
+        }
+
+    @staticmethod
+    def import_checklist_files(paths: list[Path], created_by: int | None = None) -> tuple[list[Path], list[Path]]:
+        """Ingest checklist JSON files in one transaction.
+
+        Files whose team and name already exist in the database are treated as
+        already imported. Returns (imported, already present); files that cannot
+        be read or reference an unknown team are reported and left out of both.
+        """
+        parsed = []
+        for path in paths:
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                items = [ChecklistItem.from_dict(item) for item in data.get("items", [])]
+                parsed.append((Path(path), data.get("name") or Path(path).stem, data.get("team_id"), items))
+            except Exception as e:
+                print(f"Skipping {path}: {e}")
+
+        if not parsed:
+            return [], []
+
+        connection = get_connection()
+        if not connection:
+            raise ConnectionError("Database unavailable")
+
+        try:
+            cursor = connection.cursor()
+            team_ids = sorted({team_id for _, _, team_id, _ in parsed if team_id is not None})
+            known_teams = set()
+            existing = set()
+            if team_ids:
+                placeholders = ", ".join(["%s"] * len(team_ids))
+                cursor.execute(f"SELECT id FROM teams WHERE id IN ({placeholders})", team_ids)
+                known_teams = {row[0] for row in cursor.fetchall()}
+                cursor.execute(
+                    f"SELECT team_id, title FROM checklists WHERE team_id IN ({placeholders})", team_ids
+                )
+                existing = {(row[0], row[1]) for row in cursor.fetchall()}
+
+            imported, present, batches = [], [], []
+            for path, title, team_id, items in parsed:
+                if team_id not in known_teams:
+                    print(f"Skipping {path}: team {team_id} does not exist")
+                    continue
+                if (team_id, title) in existing:
+                    present.append(path)
+                    continue
+                checklist_id = ChecklistRepository._insert_checklist(cursor, title, team_id, created_by)
+                existing.add((team_id, title))
+                batches.append((checklist_id, items))
+                imported.append((path, checklist_id, title, team_id))
+
+            # Items from every file go out together in as few statements as possible
+            ChecklistRepository._insert_items(cursor, batches, created_by)
+            connection.commit()
+            cursor.close()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            close_connection(connection)
+
+        for path, checklist_id, title, team_id in imported:
+            audit("checklist_imported", "checklist", checklist_id, new_value=title,
+                  description=f"Imported from {path.name}", user_id=created_by, team_id=team_id)
+        return [path for path, _, _, _ in imported], present
+
+    @staticmethod
+    def _insert_checklist(cursor, title: str, team_id: int, created_by: int | None) -> int:
+        """Insert one checklist row and return its id."""
+        cursor.execute(
+            "INSERT INTO checklists (team_id, title, created_by) VALUES (%s, %s, %s)",
+            (team_id, title, created_by)
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _insert_items(cursor, batches: list[tuple[int, list[ChecklistItem]]], created_by: int | None):
+        """Insert the items of one or more checklists with chunked multi-row INSERTs."""
+        rows = [
+            (checklist_id, item.name, item.description or "", item.how_to or "", order, created_by, created_by)
+            for checklist_id, items in batches
+            for order, item in enumerate(items)
+        ]
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+            cursor.execute(
+                f"INSERT INTO checklist_items "
+                f"(checklist_id, title, description, steps, item_order, created_by, last_modified_by) "
+                f"VALUES {values}",
+                [value for row in chunk for value in row]
+            )
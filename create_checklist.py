@@ -1,8 +1,6 @@
 """Script to create checklists with items, descriptions, and how-to instructions."""
 
 import sys
-import json
-from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -24,6 +22,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QFont
 
+from async_query import AsyncQueryRunner
+from reference_cache import get_reference_cache
+from checklist_repository import ChecklistRepository
+from checklist_model import ChecklistItem
+
 
 class ChecklistItemDialog(QDialog):
     """Dialog for creating/editing checklist items."""
@@ -72,9 +75,9 @@ class ChecklistItemDialog(QDialog):
 
         # Load existing data if editing
         if self.item_data:
-            self.name_input.setText(self.item_data.get("name", ""))
-            self.desc_input.setText(self.item_data.get("description", ""))
-            self.howto_input.setText(self.item_data.get("how_to", ""))
+            self.name_input.setText(self.item_data.name)
+            self.desc_input.setText(self.item_data.description)
+            self.howto_input.setText(self.item_data.how_to)
 
     def get_item_data(self):
         """Return the item data from the dialog."""
@@ -94,11 +97,7 @@ class ChecklistItemDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "How-to instructions cannot be empty.")
             return None
 
-        return {
-            "name": name,
-            "description": description,
-            "how_to": how_to,
-        }
+        return ChecklistItem(name, description, how_to)
 
     def _get_stylesheet(self) -> str:
         """Return the stylesheet for the dialog."""
@@ -155,33 +154,34 @@ class CreateChecklistWindow(QMainWindow):
         self.setGeometry(100, 100, 900, 700)
         self.setStyleSheet(self._get_stylesheet())
         self.checklist_items = []
-        self.checklists_dir = Path("checklists")
-        self.checklists_dir.mkdir(exist_ok=True)
-        self.teams = self._load_teams()
+        self.teams = {}
+        self.query_runner = AsyncQueryRunner(self)
         self._init_ui()
+        self._request_teams()
 
     def _load_teams(self):
-        """Load teams from the database."""
-        from db_config import get_connection, close_connection
-        
-        teams = {}
-        connection = get_connection()
-        if not connection:
-            return teams
-        
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute("SELECT id, name, team_code FROM teams ORDER BY name")
-            results = cursor.fetchall()
-            for row in results:
-                teams[row['name']] = row['id']
-            cursor.close()
-        except Exception as e:
-            QMessageBox.warning(self, "Database Error", f"Failed to load teams: {str(e)}")
-        finally:
-            close_connection(connection)
-        
-        return teams
+        """Load teams through the shared reference cache (queries only when it is cold or stale)."""
+        return get_reference_cache().team_ids_by_name()
+
+    def _request_teams(self):
+        """Load teams in the background and fill the team combo when they arrive."""
+        self.team_combo.setEnabled(False)
+        self.query_runner.submit(
+            "teams",
+            self._load_teams,
+            on_result=self._on_teams_loaded,
+            on_error=lambda message: QMessageBox.warning(self, "Database Error", f"Failed to load teams: {message}"),
+        )
+
+    def _on_teams_loaded(self, teams):
+        """Apply the loaded teams to the team combo."""
+        self.teams = teams
+        self.team_combo.setEnabled(True)
+        self.team_combo.clear()
+        if self.teams:
+            self.team_combo.addItems(sorted(self.teams.keys()))
+        else:
+            self.team_combo.addItem("No teams available")
 
     def _init_ui(self):
         """Initialize the main UI."""
@@ -199,10 +199,6 @@ class CreateChecklistWindow(QMainWindow):
         team_label = QLabel("Assign to Team:")
         team_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
         self.team_combo = QComboBox()
-        if self.teams:
-            self.team_combo.addItems(sorted(self.teams.keys()))
-        else:
-            self.team_combo.addItem("No teams available")
         team_layout.addWidget(team_label)
         team_layout.addWidget(self.team_combo)
         team_layout.addStretch()
@@ -291,7 +287,7 @@ class CreateChecklistWindow(QMainWindow):
         reply = QMessageBox.question(
             self,
             "Confirm Delete",
-            f"Are you sure you want to delete '{self.checklist_items[current_row]['name']}'?",
+            f"Are you sure you want to delete '{self.checklist_items[current_row].name}'?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
 
@@ -303,18 +299,18 @@ class CreateChecklistWindow(QMainWindow):
         """Refresh the items table."""
         self.items_table.setRowCount(len(self.checklist_items))
         for row, item in enumerate(self.checklist_items):
-            name_item = QTableWidgetItem(item["name"])
+            name_item = QTableWidgetItem(item.name)
             name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            desc_item = QTableWidgetItem(item["description"][:50] + "..." if len(item["description"]) > 50 else item["description"])
+            desc_item = QTableWidgetItem(item.description[:50] + "..." if len(item.description) > 50 else item.description)
             desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            howto_item = QTableWidgetItem(item["how_to"][:50] + "..." if len(item["how_to"]) > 50 else item["how_to"])
+            howto_item = QTableWidgetItem(item.how_to[:50] + "..." if len(item.how_to) > 50 else item.how_to)
             howto_item.setFlags(howto_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
             self.items_table.setItem(row, 0, name_item)
             self.items_table.setItem(row, 1, desc_item)
             self.items_table.setItem(row, 2, howto_item)
 
     def _save_checklist(self):
-        """Save the checklist to a JSON file."""
+        """Save the checklist and its items to the database."""
         checklist_name = self.checklist_name.text().strip()
         if not checklist_name:
             QMessageBox.warning(self, "Validation Error", "Checklist name cannot be empty.")
@@ -334,18 +330,14 @@ class CreateChecklistWindow(QMainWindow):
             QMessageBox.warning(self, "Validation Error", "Invalid team selected.")
             return
 
-        checklist_data = {
-            "name": checklist_name,
-            "team_id": team_id,
-            "team_name": selected_team,
-            "items": self.checklist_items,
-        }
-
-        filename = self.checklists_dir / f"{checklist_name.lower().replace(' ', '_')}.json"
         try:
-            with open(filename, "w") as f:
-                json.dump(checklist_data, f, indent=2)
-            QMessageBox.information(self, "Success", f"Checklist saved to {filename}")
+            checklist_id = ChecklistRepository.save_checklist(checklist_name, team_id, self.checklist_items)
+            if checklist_id is None:
+                QMessageBox.critical(self, "Database Error", "Could not connect to database.")
+                return
+            QMessageBox.information(
+                self, "Success", f"Checklist '{checklist_name}' saved with {len(self.checklist_items)} items."
+            )
             self._reset_form()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save checklist: {str(e)}")
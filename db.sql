@@ -147,19 +147,39 @@ CREATE TABLE IF NOT EXISTS notes (
 );
 
 -- Audit logs table
+-- Range-partitioned by month so expired months are dropped whole (see audit_retention.py).
+-- Partitioned tables cannot hold foreign keys, and audit rows should outlive the users and
+-- teams they mention anyway, so user_id and team_id are plain columns.
 CREATE TABLE IF NOT EXISTS audit_logs (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id INT AUTO_INCREMENT,
     user_id INT NULL,
+    team_id INT NULL,
     action VARCHAR(255) NOT NULL,
     resource_type VARCHAR(50),
     resource_id INT,
     previous_value TEXT,
     new_value TEXT,
     description TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL ON UPDATE CASCADE,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at),
     KEY idx_user_id (user_id),
-    KEY idx_created_at (created_at)
+    KEY idx_created_at (created_at),
+    KEY idx_audit_resource (resource_type, resource_id, created_at)
+)
+PARTITION BY RANGE COLUMNS (created_at) (
+    PARTITION p_history VALUES LESS THAN ('2026-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- Daily audit counts per team and action, kept after the detail rows are purged
+CREATE TABLE IF NOT EXISTS audit_daily_summary (
+    day DATE NOT NULL,
+    team_id INT NOT NULL DEFAULT 0, -- 0 for events not tied to a team
+    action VARCHAR(255) NOT NULL,
+    resource_type VARCHAR(50) NOT NULL DEFAULT '',
+    event_count INT NOT NULL,
+    PRIMARY KEY (day, team_id, action, resource_type),
+    KEY idx_audit_summary_team (team_id, day)
 );
 
 -- System settings table
@@ -185,3 +205,18 @@ CREATE INDEX idx_readme_team ON readmes(team_id);
 CREATE INDEX idx_note_team ON notes(team_id);
 CREATE INDEX idx_team_members_status_role ON team_members(team_id, role_id, status);
 
+-- Indexes backing keyset-paginated listings (see paging.py)
+CREATE INDEX idx_users_created_id ON users(created_at, id);
+CREATE INDEX idx_team_members_listing ON team_members(team_id, user_id);
+CREATE INDEX idx_team_members_status_listing ON team_members(status, team_id, user_id);
+
+-- Indexes backing delta refresh (see delta_sync.py); they also make the fingerprint's MAX(updated_at) a single lookup
+CREATE INDEX idx_users_updated ON users(updated_at);
+CREATE INDEX idx_teams_updated ON teams(updated_at);
+CREATE INDEX idx_team_members_updated ON team_members(updated_at);
+
+-- Indexes backing note listing and search (see notes_repository.py)
+CREATE INDEX idx_notes_user_updated ON notes(user_id, updated_at, id);
+CREATE FULLTEXT INDEX ft_notes_title_content ON notes(title, content);
+-- Encrypted notes match on their title alone, since their indexed content is ciphertext
+CREATE FULLTEXT INDEX ft_notes_title ON notes(title);
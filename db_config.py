@@ -1,6 +1,10 @@
 """
 Database configuration module for CyberPatriot Runbook
 """
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
 from mysql.connector import Error
 
@@ -12,17 +16,223 @@ DB_CONFIG = {
     'database': 'cyberpatriot_runbook'
 }
 
+# Connection pool parameters
+POOL_CONFIG = {
+    'pool_size': 5,          # Connections kept open between checkouts
+    'max_overflow': 5,       # Extra connections allowed under load, closed on return
+    'idle_timeout': 300,     # Seconds an idle connection may sit before it is recycled
+    'checkout_timeout': 10,  # Seconds to wait for a free connection before giving up
+}
+
+
+class PoolTimeoutError(Error):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of MySQL connections."""
+
+    def __init__(self, db_config: dict, pool_size: int = 5, max_overflow: int = 5,
+                 idle_timeout: float = 300, checkout_timeout: float = 10):
+        self.db_config = dict(db_config)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+
+        self._cond = threading.Condition()
+        self._idle = []          # (connection, last_returned) pairs, most recent last
+        self._owned = set()      # ids of every connection this pool opened
+        self._checked_out = set()
+        self._open_count = 0
+
+        self._stats = {
+            'checkouts': 0,
+            'connects': 0,
+            'discards': 0,
+            'exhausted': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    @property
+    def max_connections(self) -> int:
+        """Upper bound on simultaneously open connections."""
+        return self.pool_size + self.max_overflow
+
+    def acquire(self):
+        """Check out a healthy connection, opening one if the pool has room."""
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        waited_for_slot = False
+
+        while True:
+            connection = None
+            last_returned = None
+            with self._cond:
+                while not self._idle and self._open_count >= self.max_connections:
+                    if not waited_for_slot:
+                        self._stats['exhausted'] += 1
+                        waited_for_slot = True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            msg=f"No database connection available after {self.checkout_timeout}s"
+                        )
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    connection, last_returned = self._idle.pop()
+                else:
+                    self._open_count += 1
+
+            if connection is None:
+                try:
+                    connection = mysql.connector.connect(**self.db_config)
+                except Exception:
+                    with self._cond:
+                        self._open_count -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._owned.add(id(connection))
+                    self._stats['connects'] += 1
+            elif (time.monotonic() - last_returned > self.idle_timeout
+                  or not self._is_healthy(connection)):
+                self._discard(connection)
+                continue
+
+            waited = time.monotonic() - start
+            with self._cond:
+                self._checked_out.add(id(connection))
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_total'] += waited
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+            return connection
+
+    def release(self, connection) -> bool:
+        """Return a connection to the pool. Returns False if the pool does not own it."""
+        with self._cond:
+            conn_id = id(connection)
+            if conn_id not in self._owned:
+                return False
+            if conn_id not in self._checked_out:
+                return True  # Already returned; ignore the duplicate release
+            self._checked_out.discard(conn_id)
+
+        try:
+            healthy = connection.is_connected()
+            if healthy and connection.in_transaction:
+                connection.rollback()
+        except Exception:
+            healthy = False
+
+        if not healthy:
+            self._discard(connection)
+            return True
+
+        with self._cond:
+            if len(self._idle) < self.pool_size:
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+                return True
+        self._discard(connection)  # Overflow connection; don't keep it around
+        return True
+
+    def close_all(self):
+        """Close every idle connection. Checked-out connections close on return."""
+        with self._cond:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool counters."""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot['open'] = self._open_count
+            snapshot['idle'] = len(self._idle)
+            snapshot['in_use'] = len(self._checked_out)
+        checkouts = snapshot['checkouts']
+        snapshot['wait_time_avg'] = snapshot['wait_time_total'] / checkouts if checkouts else 0.0
+        return snapshot
+
+    def _is_healthy(self, connection) -> bool:
+        """Ping a connection before handing it out."""
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        """Close a connection and free its slot."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._owned.discard(id(connection))
+            self._checked_out.discard(id(connection))
+            self._open_count -= 1
+            self._stats['discards'] += 1
+            self._cond.notify()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    """Return checkout, wait time and exhaustion counters for the pool."""
+    return get_pool().stats()
+
+
+@contextmanager
+def pooled_connection():
+    """Borrow a pooled connection for the duration of a with-block.
+
+    Uncommitted work is rolled back if the block raises.
+    """
+    connection = get_pool().acquire()
+    try:
+        yield connection
+    except Exception:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        get_pool().release(connection)
+
+
 def get_connection():
-    """Establish and return a database connection"""
+    """Borrow a connection from the pool (returns None if the database is unreachable)"""
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            return connection
+        return get_pool().acquire()
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
         return None
 
 def close_connection(connection):
-    """Close the database connection"""
-    if connection and connection.is_connected():
+    """Return a connection to the pool (or close it if it was opened elsewhere)"""
+    if not connection:
+        return
+    if get_pool().release(connection):
+        return
+    if connection.is_connected():
         connection.close()
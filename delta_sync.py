@@ -0,0 +1,84 @@
+"""
+Incremental refresh for CyberPatriot Runbook listings
+Each listing remembers the fingerprint (row count, newest updated_at and highest id per table)
+it was loaded with; later checks fetch only the rows changed since that watermark and merge them in
+"""
+from datetime import timedelta
+
+# Rows are re-read this far behind the watermark: updated_at has one-second resolution and a
+# transaction may commit a moment after the timestamp it wrote. Merging is idempotent.
+DELTA_OVERLAP_SECONDS = 2
+
+# How often the viewer polls the visible tab when auto-refresh is on
+DEFAULT_POLL_INTERVAL_MS = 15000
+
+
+class DeltaSync:
+    """Watermarks per listing, and the choice between a delta fetch and a full reload
+
+    A delta is only safe when the listing's own table changed and nothing was deleted from it.
+    Edits to a joined table (a renamed team, say) or deletions from any table can touch
+    rows a delta would not return, so those fall back to a full reload. A deletion hidden by
+    an insert leaves the row count unchanged, so accepts() also checks a fetched delta: the
+    count must have grown by exactly the number of new ids it contains.
+    """
+
+    UNCHANGED = "unchanged"
+    DELTA = "delta"
+    RELOAD = "reload"
+
+    def __init__(self, primary_tables: dict[str, str]):
+        # Query key -> table whose updated_at drives its delta; keys not listed always reload
+        self.primary_tables = dict(primary_tables)
+        self._fingerprints = {}
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._fingerprints
+
+    def record(self, key: str, fingerprint):
+        """Remember the fingerprint a listing's rows are now current with"""
+        if fingerprint is not None:
+            self._fingerprints[key] = fingerprint
+
+    def plan(self, key: str, fingerprint) -> tuple[str, object]:
+        """Return (action, since): what to do about a listing given a fresh fingerprint"""
+        previous = self._fingerprints.get(key)
+        if previous is None:
+            return self.RELOAD, None
+        if fingerprint == previous:
+            return self.UNCHANGED, None
+
+        table = self.primary_tables.get(key)
+        if table is None:
+            return self.RELOAD, None
+
+        before = {row[0]: tuple(row[1:]) for row in previous}
+        after = {row[0]: tuple(row[1:]) for row in fingerprint}
+        if any(after[name] != before.get(name) for name in after if name != table):
+            return self.RELOAD, None
+
+        old_count, watermark, _ = before[table]
+        new_count, _, _ = after[table]
+        if watermark is None or new_count < old_count:
+            return self.RELOAD, None
+        return self.DELTA, watermark - timedelta(seconds=DELTA_OVERLAP_SECONDS)
+
+    def accepts(self, key: str, fingerprint, rows: list[tuple]) -> bool:
+        """Whether delta rows (id first) fetched for a DELTA plan account for every insert
+
+        Ids only grow, so rows between the old and new highest id are the inserts; if the
+        count grew by less, something was deleted and the listing must reload instead.
+        """
+        table = self.primary_tables[key]
+        old_count, _, old_max_id = next(row[1:] for row in self._fingerprints[key] if row[0] == table)
+        new_count, _, new_max_id = next(row[1:] for row in fingerprint if row[0] == table)
+        old_max_id = old_max_id or 0
+        inserted = sum(1 for row in rows if old_max_id < row[0] <= (new_max_id or 0))
+        return new_count - old_count == inserted
+
+
+def split_changes(rows: list[tuple]) -> tuple[list[tuple], list]:
+    """Split delta rows (ending in a still-matches flag) into rows to merge and ids to drop"""
+    upserts = [row[:-1] for row in rows if row[-1]]
+    removed = [row[0] for row in rows if not row[-1]]
+    return upserts, removed
@@ -0,0 +1,126 @@
+"""Debounced change feed for the checklist and notes directories.
+
+QFileSystemWatcher only reports that a directory or file changed. DirectoryWatcher
+keeps a stat snapshot of each watched directory, and once changes settle it diffs the
+snapshot to emit one coalesced batch of added/modified/removed events.
+"""
+
+import os
+from pathlib import Path
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+ADDED = "added"
+MODIFIED = "modified"
+REMOVED = "removed"
+
+
+class DirectoryWatcher(QObject):
+    """Watches a directory (and optionally its immediate subdirectories) for file changes."""
+
+    # List of (event, Path) tuples, where event is ADDED, MODIFIED or REMOVED
+    files_changed = Signal(object)
+
+    def __init__(self, directory: Path, suffix: str = ".json", include_subdirs: bool = False,
+                 ignore: set[str] | None = None, debounce_ms: int = 250, parent=None):
+        super().__init__(parent)
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.include_subdirs = include_subdirs
+        self.ignore = set(ignore or ())
+        self._snapshots = {}  # directory path -> {file name: (mtime_ns, size)}
+        self._dirty = set()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._flush)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._watch_directory(self.directory)
+        if include_subdirs:
+            for subdir in self._subdirectories(self.directory):
+                self._watch_directory(subdir)
+
+    def _watch_directory(self, directory: Path):
+        """Start watching a directory and every matching file in it."""
+        snapshot = self._scan(directory)
+        self._snapshots[str(directory)] = snapshot
+        paths = [str(directory)] + [str(directory / name) for name in snapshot]
+        self._watcher.addPaths(paths)
+
+    def _subdirectories(self, directory: Path) -> list[Path]:
+        """Immediate subdirectories of a directory."""
+        try:
+            with os.scandir(directory) as it:
+                return [Path(entry.path) for entry in it if entry.is_dir()]
+        except OSError:
+            return []
+
+    def _scan(self, directory: Path) -> dict:
+        """Stat every matching file in a directory."""
+        snapshot = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.suffix) or entry.name in self.ignore:
+                        continue
+                    try:
+                        if entry.is_file():
+                            stat_result = entry.stat()
+                            snapshot[entry.name] = (stat_result.st_mtime_ns, stat_result.st_size)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return snapshot
+
+    def _on_directory_changed(self, path: str):
+        self._dirty.add(path)
+        self._timer.start()
+
+    def _on_file_changed(self, path: str):
+        self._dirty.add(str(Path(path).parent))
+        self._timer.start()
+
+    def _flush(self):
+        """Diff every directory that changed since the last flush and emit one batch."""
+        dirty, self._dirty = self._dirty, set()
+        events = []
+
+        for path in sorted(dirty):
+            directory = Path(path)
+            if path not in self._snapshots:
+                continue
+
+            if not directory.exists():
+                for name in self._snapshots.pop(path):
+                    events.append((REMOVED, directory / name))
+                continue
+
+            if self.include_subdirs and directory == self.directory:
+                for subdir in self._subdirectories(directory):
+                    if str(subdir) not in self._snapshots:
+                        self._watch_directory(subdir)
+                        events.extend((ADDED, subdir / name) for name in self._snapshots[str(subdir)])
+
+            old = self._snapshots[path]
+            new = self._scan(directory)
+            self._snapshots[path] = new
+
+            for name, signature in new.items():
+                if name not in old:
+                    events.append((ADDED, directory / name))
+                    self._watcher.addPath(str(directory / name))
+                elif old[name] != signature:
+                    events.append((MODIFIED, directory / name))
+                    # Editors that replace files drop the watch; re-adding is a no-op otherwise
+                    self._watcher.addPath(str(directory / name))
+            for name in old.keys() - new.keys():
+                events.append((REMOVED, directory / name))
+
+        if events:
+            self.files_changed.emit(events)
@@ -0,0 +1,279 @@
+"""Script to onboard many users at once from a roster file.
+
+Usage: python import_roster.py roster.csv [--pending] [--batch-size N] [--workers N]
+
+The roster is a CSV file with a header row, or a JSON list of objects, with the
+fields name, username, password, role and team_code (email is optional). Rows are
+validated up front, passwords are hashed in a process pool, and users and their team
+memberships are inserted in batched transactions. A bad row is reported with its line
+number and never aborts the rest of the import.
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from db_config import get_connection, close_connection
+from password_hashing import default_hasher
+from reference_cache import get_reference_cache
+from audit_log import audit
+
+REQUIRED_FIELDS = ("name", "username", "password", "role", "team_code")
+ROLES = ("admin", "coach", "team_captain", "mentor", "competitor")
+MIN_PASSWORD_LENGTH = 8
+DEFAULT_BATCH_SIZE = 200
+
+
+@dataclass
+class RosterRow:
+    """One validated roster entry."""
+
+    line: int
+    name: str
+    username: str
+    email: str
+    password: str
+    role_id: int
+    team_id: int
+    password_hash: str = ""
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a roster import."""
+
+    created: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+
+def read_roster(path: Path) -> list[tuple[int, dict]]:
+    """Read (line number, fields) pairs from a CSV or JSON roster."""
+    if path.suffix.lower() == ".json":
+        with open(path, "r") as f:
+            entries = json.load(f)
+        # JSON entries are numbered from 1 in file order
+        return [(index, entry) for index, entry in enumerate(entries, start=1)]
+
+    with open(path, "r", newline="") as f:
+        # Line 1 is the header
+        return [(index, row) for index, row in enumerate(csv.DictReader(f), start=2)]
+
+
+def validate_rows(entries: list[tuple[int, dict]]) -> tuple[list[RosterRow], list[tuple[int, str]]]:
+    """Check every entry against the roster rules and reference data."""
+    cache = get_reference_cache()
+    role_ids = cache.role_ids()
+    rows, errors = [], []
+    seen_usernames = set()
+    seen_missing = set()  # Unknown team codes; each miss reloads the team cache, so look each up once
+
+    for line, entry in entries:
+        values = {key: str(entry.get(key) or "").strip() for key in REQUIRED_FIELDS + ("email",)}
+        values["password"] = str(entry.get("password") or "")
+
+        missing = [key for key in REQUIRED_FIELDS if not values[key]]
+        if missing:
+            errors.append((line, f"missing {', '.join(missing)}"))
+            continue
+
+        role = values["role"].lower().replace(" ", "_")
+        if role not in ROLES or role not in role_ids:
+            errors.append((line, f"unknown role '{values['role']}'"))
+            continue
+
+        if len(values["password"]) < MIN_PASSWORD_LENGTH:
+            errors.append((line, f"password must be at least {MIN_PASSWORD_LENGTH} characters"))
+            continue
+
+        if not re.match(r'^\d{2}-\d{4}$', values["team_code"]):
+            errors.append((line, "team code must be in format XX-XXXX"))
+            continue
+
+        team = None if values["team_code"] in seen_missing else cache.team_by_code(values["team_code"])
+        if not team:
+            seen_missing.add(values["team_code"])
+            errors.append((line, f"team code '{values['team_code']}' does not exist"))
+            continue
+
+        username = values["username"]
+        if username.lower() in seen_usernames:
+            errors.append((line, f"username '{username}' appears more than once in the roster"))
+            continue
+        seen_usernames.add(username.lower())
+
+        rows.append(RosterRow(
+            line=line,
+            name=values["name"],
+            username=username,
+            email=values["email"] or f"{username}@cyberpatriot.local",
+            password=values["password"],
+            role_id=role_ids[role],
+            team_id=team["id"],
+        ))
+
+    return rows, errors
+
+
+def _hash_password(password: str) -> str:
+    """Hash one password (runs in a worker process)."""
+    return default_hasher().hash(password)
+
+
+def hash_passwords(rows: list[RosterRow], workers: int | None = None):
+    """Hash every row's password in parallel; the KDF is CPU bound, so processes, not threads."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        hashes = executor.map(_hash_password, [row.password for row in rows], chunksize=8)
+        for row, password_hash in zip(rows, hashes):
+            row.password_hash = password_hash
+            row.password = ""  # Drop the plaintext as soon as it is no longer needed
+
+
+class RosterRepository:
+    """Batched inserts of users and their team memberships."""
+
+    @staticmethod
+    def insert_batch(rows: list[RosterRow], status: str) -> tuple[int, list[tuple[int, str]]]:
+        """Insert a batch in one transaction. Returns (created, per-row errors)."""
+        connection = get_connection()
+        if not connection:
+            return 0, [(row.line, "database unavailable") for row in rows]
+
+        try:
+            cursor = connection.cursor()
+            rows, errors = RosterRepository._drop_existing(cursor, rows)
+            if not rows:
+                return 0, errors
+
+            try:
+                RosterRepository._insert_rows(cursor, rows, status)
+                connection.commit()
+                return len(rows), errors
+            except Exception:
+                # Something in the batch conflicted; retry row by row so only that row fails
+                connection.rollback()
+
+            created = 0
+            for row in rows:
+                cursor.execute("SAVEPOINT roster_row")
+                try:
+                    RosterRepository._insert_rows(cursor, [row], status)
+                    cursor.execute("RELEASE SAVEPOINT roster_row")
+                    created += 1
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT roster_row")
+                    errors.append((row.line, str(e)))
+            connection.commit()
+            return created, errors
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def _drop_existing(cursor, rows: list[RosterRow]) -> tuple[list[RosterRow], list[tuple[int, str]]]:
+        """Split off rows whose username or email is already taken, with one query."""
+        placeholders = ", ".join(["%s"] * len(rows))
+        cursor.execute(
+            f"SELECT username, email FROM users WHERE username IN ({placeholders}) OR email IN ({placeholders})",
+            [row.username for row in rows] + [row.email for row in rows]
+        )
+        taken_usernames, taken_emails = set(), set()
+        for username, email in cursor.fetchall():
+            taken_usernames.add((username or "").lower())
+            taken_emails.add((email or "").lower())
+
+        kept, errors = [], []
+        for row in rows:
+            if row.username.lower() in taken_usernames:
+                errors.append((row.line, f"username '{row.username}' already exists"))
+            elif row.email.lower() in taken_emails:
+                errors.append((row.line, f"email '{row.email}' already exists"))
+            else:
+                kept.append(row)
+        return kept, errors
+
+    @staticmethod
+    def _insert_rows(cursor, rows: list[RosterRow], status: str):
+        """Insert users with one multi-row INSERT, look up their ids, then insert memberships."""
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+        params = []
+        for row in rows:
+            params.extend((row.name, row.username, row.password_hash, row.email, True))
+        cursor.execute(
+            f"INSERT INTO users (name, username, password_hash, email, is_active) VALUES {values}", params
+        )
+
+        # Auto-increment ids are not guaranteed consecutive, so read them back by username
+        placeholders = ", ".join(["%s"] * len(rows))
+        cursor.execute(
+            f"SELECT id, username FROM users WHERE username IN ({placeholders})", [row.username for row in rows]
+        )
+        user_ids = {username: user_id for user_id, username in cursor.fetchall()}
+
+        values = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+        params = []
+        for row in rows:
+            params.extend((user_ids[row.username], row.team_id, row.role_id, status))
+        cursor.execute(
+            f"INSERT INTO team_members (user_id, team_id, role_id, status) VALUES {values}", params
+        )
+
+
+def import_roster(path: Path, status: str = "approved", batch_size: int = DEFAULT_BATCH_SIZE,
+                  workers: int | None = None) -> ImportResult:
+    """Validate, hash and insert a roster, printing progress and throughput."""
+    start = time.perf_counter()
+    result = ImportResult()
+
+    rows, result.errors = validate_rows(read_roster(path))
+    print(f"Validated {len(rows) + len(result.errors)} row(s): {len(rows)} valid, {len(result.errors)} rejected")
+    if not rows:
+        return result
+
+    hash_start = time.perf_counter()
+    hash_passwords(rows, workers)
+    hash_elapsed = time.perf_counter() - hash_start
+    print(f"Hashed {len(rows)} password(s) in {hash_elapsed:.1f}s ({len(rows) / hash_elapsed:.1f}/s)")
+
+    insert_start = time.perf_counter()
+    for offset in range(0, len(rows), batch_size):
+        created, errors = RosterRepository.insert_batch(rows[offset:offset + batch_size], status)
+        result.created += created
+        result.errors.extend(errors)
+    insert_elapsed = time.perf_counter() - insert_start
+    print(f"Inserted {result.created} user(s) in {insert_elapsed:.1f}s ({result.created / insert_elapsed:.1f}/s)")
+    audit("roster_imported", "user", new_value=result.created,
+          description=f"{path.name}: {result.created} created as {status}, {len(result.errors)} rejected")
+
+    total = time.perf_counter() - start
+    print(f"Total: {result.created} created in {total:.1f}s ({result.created / total:.1f} users/s)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import users and team memberships from a roster file.")
+    parser.add_argument("roster", type=Path, help="CSV (with header) or JSON roster file")
+    parser.add_argument("--pending", action="store_true", help="create memberships as pending instead of approved")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--workers", type=int, default=None, help="password hashing processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        result = import_roster(
+            args.roster, "pending" if args.pending else "approved", args.batch_size, args.workers
+        )
+    except Exception as e:
+        print(f"Roster import failed: {e}")
+        sys.exit(1)
+
+    for line, message in sorted(result.errors):
+        print(f"  line {line}: {message}")
+    sys.exit(1 if result.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Script to move checklist JSON files into the database.
+
+Usage: python migrate_checklists.py [checklists directory]
+
+Files are ingested in one transaction and then moved to an "imported" subdirectory,
+so running the script again only picks up files added since.
+"""
+
+import sys
+import shutil
+from pathlib import Path
+
+from checklist_catalog import CATALOG_FILENAME
+from checklist_repository import ChecklistRepository
+
+IMPORTED_DIRNAME = "imported"
+
+
+def migrate_checklists(checklists_dir: Path) -> int:
+    """Import every checklist file in a directory. Returns the number imported."""
+    paths = sorted(p for p in checklists_dir.glob("*.json") if p.name != CATALOG_FILENAME)
+    if not paths:
+        print(f"No checklist files found in {checklists_dir}")
+        return 0
+
+    imported, present = ChecklistRepository.import_checklist_files(paths)
+
+    imported_dir = checklists_dir / IMPORTED_DIRNAME
+    imported_dir.mkdir(exist_ok=True)
+    for path in imported + present:
+        shutil.move(str(path), str(imported_dir / path.name))
+
+    print(f"Imported {len(imported)} checklist(s); {len(present)} already in the database")
+    return len(imported)
+
+
+if __name__ == "__main__":
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("checklists")
+    try:
+        migrate_checklists(directory)
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,131 @@
+"""
+At-rest encryption for notes
+A note's content is encrypted with AES-256-GCM under a key derived from its owner's password
+and the note's encryption_key_salt. Titles stay in plaintext, so listing and searching notes
+never needs a key and bodies are decrypted only when a note is opened.
+
+Key derivation is deliberately slow, so each key is derived once per session and kept in the
+process-wide NoteKeyCache; the password itself is never kept. Keys come from the password, not
+its stored hash, so notes encrypted before a password change need the old password.
+"""
+import base64
+import hashlib
+import os
+import threading
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from password_hashing import HASH_CONFIG, SALT_BYTES
+
+KEY_BYTES = 32
+NONCE_BYTES = 12
+KDF_ALGORITHM = "pbkdf2_sha256"
+CIPHER_ALGORITHM = "aesgcm"
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _associated_data(user_id: int) -> bytes:
+    # Binds a ciphertext to its owner, so it cannot be moved into another user's note
+    return f"notes:{user_id}".encode()
+
+
+def new_key_salt() -> str:
+    """A fresh encryption_key_salt value: "pbkdf2_sha256$iterations$salt", like password hashes"""
+    return f"{KDF_ALGORITHM}${HASH_CONFIG['pbkdf2_iterations']}${_b64encode(os.urandom(SALT_BYTES))}"
+
+
+def derive_key(password: str, key_salt: str) -> bytes:
+    """Derive the note key for a password and encryption_key_salt (slow; call from a worker thread)"""
+    algorithm, iterations, salt = key_salt.split("$")
+    if algorithm != KDF_ALGORITHM:
+        raise ValueError(f"Unknown note key derivation: {algorithm}")
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), _b64decode(salt), int(iterations), KEY_BYTES)
+
+
+def encrypt_content(key: bytes, content: str, user_id: int) -> str:
+    """Encrypt note content as "aesgcm$nonce$ciphertext" with a fresh nonce"""
+    nonce = os.urandom(NONCE_BYTES)
+    ciphertext = AESGCM(key).encrypt(nonce, content.encode(), _associated_data(user_id))
+    return f"{CIPHER_ALGORITHM}${_b64encode(nonce)}${_b64encode(ciphertext)}"
+
+
+def decrypt_content(key: bytes, stored: str, user_id: int) -> str:
+    """Decrypt content written by encrypt_content. Raises ValueError if it cannot be authenticated."""
+    try:
+        algorithm, nonce, ciphertext = stored.split("$")
+        if algorithm != CIPHER_ALGORITHM:
+            raise ValueError(f"Unknown note cipher: {algorithm}")
+        plaintext = AESGCM(key).decrypt(_b64decode(nonce), _b64decode(ciphertext), _associated_data(user_id))
+    except InvalidTag:
+        raise ValueError("Note content was altered or encrypted with a different key") from None
+    return plaintext.decode()
+
+
+class NoteKeyCache:
+    """Derived note keys per user for this session, safe to use from worker threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}     # user id -> {encryption_key_salt: key}
+        self._current = {}  # user id -> salt that new notes are encrypted under
+
+    def unlock(self, user_id: int, password: str, key_salts: list[str]):
+        """Derive keys for a user's salts that are not cached yet (slow; call from a worker thread).
+
+        key_salts are the salts the user's notes already use, most used first; new notes
+        reuse the first so a user keeps one key. A user with no encrypted notes gets a new salt.
+        """
+        salts = list(dict.fromkeys(key_salts)) or [new_key_salt()]
+        with self._lock:
+            cached = set(self._keys.get(user_id, {}))
+        keys = {salt: derive_key(password, salt) for salt in salts if salt not in cached}
+        with self._lock:
+            self._keys.setdefault(user_id, {}).update(keys)
+            self._current.setdefault(user_id, salts[0])
+
+    def is_unlocked(self, user_id: int, key_salt: str | None = None) -> bool:
+        """Whether a key is cached for the user (and for key_salt, if given)"""
+        with self._lock:
+            keys = self._keys.get(user_id)
+            return bool(keys) and (key_salt is None or key_salt in keys)
+
+    def key(self, user_id: int, key_salt: str) -> bytes | None:
+        with self._lock:
+            return self._keys.get(user_id, {}).get(key_salt)
+
+    def current(self, user_id: int) -> tuple[str, bytes] | None:
+        """(salt, key) to encrypt the user's new and edited notes with, or None if locked"""
+        with self._lock:
+            salt = self._current.get(user_id)
+            return (salt, self._keys[user_id][salt]) if salt else None
+
+    def lock(self, user_id: int | None = None):
+        """Forget one user's keys, or everyone's"""
+        with self._lock:
+            if user_id is None:
+                self._keys.clear()
+                self._current.clear()
+            else:
+                self._keys.pop(user_id, None)
+                self._current.pop(user_id, None)
+
+
+def get_note_key_cache() -> NoteKeyCache:
+    """Return the process-wide note key cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = NoteKeyCache()
+    return _cache
@@ -0,0 +1,247 @@
+"""Append-only journal of a user's locally stored notes.
+
+Each save appends one small record to user_notes/<username>/notes.jsonl instead of
+rewriting a file, so autosaving every few seconds stays cheap. Records are framed as
+"<crc32>\\t<json>\\n" and fsynced; on load the journal is replayed in order and a tail cut
+short by a crash is detected by its checksum and truncated, leaving every complete save.
+Once superseded records outnumber live notes the journal is compacted by atomically
+replacing it with one record per note.
+
+Notes are identified by random ids that never change, so renaming a note keeps its
+history and two notes with similar titles never overwrite each other.
+"""
+
+import json
+import os
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+JOURNAL_FILENAME = "notes.jsonl"
+
+JOURNAL_CONFIG = {
+    'compact_min_records': 200,  # Journals shorter than this are never compacted
+    'compact_ratio': 3,          # Compact once records outnumber live notes this many times
+    'autosave_seconds': 3,       # How often the notes window appends unsaved edits
+}
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def new_note_id() -> str:
+    """A unique, permanent id for a new note."""
+    return uuid.uuid4().hex
+
+
+def _frame(record: dict) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return b"%08x\t%s\n" % (zlib.crc32(payload), payload)
+
+
+def _unframe(line: bytes) -> dict | None:
+    """Decode one framed line, or None if it is torn or corrupt."""
+    if not line.endswith(b"\n"):
+        return None
+    checksum, _, payload = line.rstrip(b"\n").partition(b"\t")
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _apply(notes: dict, record: dict):
+    """Apply one record to a note id -> note data mapping."""
+    note_id = record["id"]
+    if record["op"] == "delete":
+        notes.pop(note_id, None)
+        return
+
+    note = notes.get(note_id)
+    if note is None:
+        note = notes[note_id] = {
+            "title": "",
+            "content": "",
+            "created": record.get("created") or record["at"],
+        }
+    for field in ("title", "content"):
+        if field in record:
+            note[field] = record[field]
+    note["modified"] = record["at"]
+
+
+def replay(path: Path) -> tuple[dict, int, int]:
+    """Read a journal without changing it.
+
+    Returns (note id -> note data, records read, length in bytes of the intact prefix).
+    """
+    notes = {}
+    records = 0
+    intact = 0
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                record = _unframe(line)
+                if record is None:
+                    break
+                _apply(notes, record)
+                records += 1
+                intact += len(line)
+    except FileNotFoundError:
+        pass
+    return notes, records, intact
+
+
+class NoteJournal:
+    """One user's notes, kept as an append-only journal in their notes directory.
+
+    Only one process should write a user's journal at a time; refresh() picks up
+    records appended by anyone else.
+    """
+
+    def __init__(self, user_dir: Path):
+        self.user_dir = Path(user_dir)
+        self.path = self.user_dir / JOURNAL_FILENAME
+        self.notes = {}  # note id -> {"title", "content", "created", "modified"}
+        self._records = 0
+        self._offset = 0       # Bytes of the journal already applied
+        self._identity = None  # (device, inode) of the file those bytes came from
+        self.load(repair=True)
+
+    def load(self, repair: bool = False):
+        """Replay the journal from the start.
+
+        The writer loads with repair, which truncates a torn tail and imports old note files;
+        otherwise reading stops before a partial record, which may still be being written.
+        """
+        if repair:
+            self.user_dir.mkdir(parents=True, exist_ok=True)
+        self.notes, self._records, intact = replay(self.path)
+        try:
+            stat_result = self.path.stat()
+            if repair and stat_result.st_size > intact:
+                print(f"Discarding {stat_result.st_size - intact} bytes of an incomplete save in {self.path}")
+                with open(self.path, "rb+") as f:
+                    f.truncate(intact)
+                    os.fsync(f.fileno())
+            self._identity = (stat_result.st_dev, stat_result.st_ino)
+        except FileNotFoundError:
+            self._identity = None
+        self._offset = intact
+
+        if repair:
+            self._import_note_files()
+            if self._should_compact():
+                self.compact()
+
+    def refresh(self) -> bool:
+        """Apply records appended since the journal was last read. Returns True if any were."""
+        try:
+            stat_result = self.path.stat()
+        except FileNotFoundError:
+            changed = bool(self.notes)
+            self.notes, self._records, self._offset, self._identity = {}, 0, 0, None
+            return changed
+
+        if (stat_result.st_dev, stat_result.st_ino) != self._identity or stat_result.st_size < self._offset:
+            # Compacted (replaced) or truncated elsewhere; start over
+            before = self.notes
+            self.load()
+            return self.notes != before
+        if stat_result.st_size == self._offset:
+            return False
+
+        changed = False
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                record = _unframe(line)
+                if record is None:
+                    break  # Still being written; picked up by the next refresh
+                _apply(self.notes, record)
+                self._records += 1
+                self._offset += len(line)
+                changed = True
+        return changed
+
+    def put(self, note_id: str, title: str, content: str) -> dict:
+        """Record a new note or an edit, appending only the fields that changed. Returns the note."""
+        note = self.notes.get(note_id)
+        record = {"op": "put", "id": note_id, "at": datetime.now().strftime(TIMESTAMP_FORMAT)}
+        if note is None or note["title"] != title:
+            record["title"] = title
+        if note is None or note["content"] != content:
+            record["content"] = content
+        if note is not None and len(record) == 3:
+            return note  # Nothing changed; autosave calls this freely
+        self._append(record)
+        return self.notes[note_id]
+
+    def delete(self, note_id: str) -> bool:
+        """Record a note's deletion. Returns False if there was no such note."""
+        if note_id not in self.notes:
+            return False
+        self._append({"op": "delete", "id": note_id, "at": datetime.now().strftime(TIMESTAMP_FORMAT)})
+        return True
+
+    def compact(self):
+        """Replace the journal with one record per live note, atomically."""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            for note_id, note in self.notes.items():
+                f.write(_frame({
+                    "op": "put", "id": note_id, "title": note["title"], "content": note["content"],
+                    "created": note["created"], "at": note["modified"],
+                }))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        stat_result = self.path.stat()
+        self._records = len(self.notes)
+        self._offset = stat_result.st_size
+        self._identity = (stat_result.st_dev, stat_result.st_ino)
+
+    def _append(self, record: dict):
+        """Write one record durably, then apply it."""
+        # Pick up anything appended elsewhere first, so our offset stays at the end of the file
+        self.refresh()
+        if self.path.exists() and self.path.stat().st_size > self._offset:
+            self.load(repair=True)  # A torn tail would swallow the record appended after it
+        line = _frame(record)
+        with open(self.path, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            stat_result = os.fstat(f.fileno())
+        _apply(self.notes, record)
+        self._records += 1
+        self._offset += len(line)
+        self._identity = (stat_result.st_dev, stat_result.st_ino)
+
+        if self._should_compact():
+            self.compact()
+
+    def _should_compact(self) -> bool:
+        return (self._records >= JOURNAL_CONFIG['compact_min_records']
+                and self._records > JOURNAL_CONFIG['compact_ratio'] * max(len(self.notes), 1))
+
+    def _import_note_files(self):
+        """Move notes saved one-file-per-note by earlier versions into the journal."""
+        for note_file in sorted(self.user_dir.glob("*.json")):
+            try:
+                with open(note_file, "r") as f:
+                    note = json.load(f)
+            except Exception:
+                continue  # Left in place for a later attempt
+            if note_file.stem not in self.notes:
+                now = datetime.now().strftime(TIMESTAMP_FORMAT)
+                self._append({
+                    "op": "put", "id": note_file.stem,
+                    "title": note.get("title", note_file.stem), "content": note.get("content", ""),
+                    "created": note.get("created", now), "at": note.get("modified", now),
+                })
+            # The journal record is on disk, so the file can go
+            note_file.unlink()
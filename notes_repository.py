@@ -0,0 +1,221 @@
+"""Database storage and full-text search for user notes."""
+
+import re
+
+from db_config import get_connection, close_connection
+from note_journal import TIMESTAMP_FORMAT
+from paging import KeysetPager, like_pattern
+
+NOTES_PAGE_SIZE = 100
+SEARCH_LIMIT = 50
+
+# InnoDB's default innodb_ft_min_token_size; shorter words are not in the FULLTEXT index
+MIN_SEARCH_TERM_LENGTH = 3
+
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def fulltext_query(text: str) -> str:
+    """Turn free text into a BOOLEAN MODE query requiring every word as a prefix.
+
+    Operator characters are dropped so user input can never be a syntax error, and words
+    too short to be indexed are left out rather than making the whole query match nothing.
+    """
+    terms = [term for term in _SEARCH_TERM.findall(text) if len(term) >= MIN_SEARCH_TERM_LENGTH]
+    return " ".join(f"+{term}*" for term in terms)
+
+
+class NotesRepository:
+    """Repository for the notes table."""
+
+    @staticmethod
+    def notes_pager(user_id: int, page_size: int = NOTES_PAGE_SIZE) -> KeysetPager:
+        """A user's notes, most recently updated first, without their content."""
+        return KeysetPager(
+            columns=["n.id", "n.title", "n.created_at", "n.updated_at", "n.is_encrypted"],
+            source="notes n",
+            order_by=[("n.updated_at", True), ("n.id", True)],
+            filters=[("n.user_id = %s", (user_id,))],
+            page_size=page_size,
+            changed_column="n.updated_at",
+        )
+
+    @staticmethod
+    def get_note(note_id: int, user_id: int) -> dict | None:
+        """Load one of the user's notes with its content."""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(
+                "SELECT id, user_id, team_id, title, content, note_type, is_encrypted, encryption_key_salt, "
+                "created_at, updated_at FROM notes WHERE id = %s AND user_id = %s",
+                (note_id, user_id)
+            )
+            note = cursor.fetchone()
+            cursor.close()
+            return note
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def save_note(user_id: int, title: str, content: str, note_id: int | None = None,
+                  team_id: int | None = None, encryption_key_salt: str | None = None) -> dict | None:
+        """Insert a note, or update one of the user's notes. Returns its id and timestamps.
+
+        With encryption_key_salt, content is ciphertext from note_crypto.encrypt_content.
+        """
+        is_encrypted = encryption_key_salt is not None
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor(dictionary=True)
+            if note_id is None:
+                cursor.execute(
+                    "INSERT INTO notes (user_id, team_id, title, content, is_encrypted, encryption_key_salt) "
+                    "VALUES (%s, %s, %s, %s, %s, %s)",
+                    (user_id, team_id, title, content, is_encrypted, encryption_key_salt)
+                )
+                note_id = cursor.lastrowid
+            else:
+                cursor.execute(
+                    "UPDATE notes SET title = %s, content = %s, is_encrypted = %s, encryption_key_salt = %s "
+                    "WHERE id = %s AND user_id = %s",
+                    (title, content, is_encrypted, encryption_key_salt, note_id, user_id)
+                )
+            cursor.execute("SELECT id, created_at, updated_at FROM notes WHERE id = %s", (note_id,))
+            saved = cursor.fetchone()
+            connection.commit()
+            cursor.close()
+            return saved
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def delete_note(note_id: int, user_id: int) -> bool:
+        """Delete one of the user's notes. Returns False if it was not found or the database is unreachable."""
+        connection = get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM notes WHERE id = %s AND user_id = %s", (note_id, user_id))
+            deleted = cursor.rowcount > 0
+            connection.commit()
+            cursor.close()
+            return deleted
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def import_notes(user_id: int, notes: dict[str, dict]) -> tuple[list[str], list[str]] | None:
+        """Insert notes kept on disk (journal id -> note data) into the table in one transaction.
+
+        Notes whose title and creation time already exist for the user are treated as
+        imported by an earlier run. Returns (imported ids, already present ids), or None
+        if the database is unreachable.
+        """
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT title, created_at FROM notes WHERE user_id = %s", (user_id,))
+            existing = {(title, created_at.strftime(TIMESTAMP_FORMAT)) for title, created_at in cursor.fetchall()}
+
+            imported, present = [], []
+            for note_id, note in notes.items():
+                if (note["title"], note["created"]) in existing:
+                    present.append(note_id)
+                    continue
+                cursor.execute(
+                    "INSERT INTO notes (user_id, title, content, created_at, updated_at) VALUES (%s, %s, %s, %s, %s)",
+                    (user_id, note["title"], note["content"], note["created"], note["modified"])
+                )
+                existing.add((note["title"], note["created"]))
+                imported.append(note_id)
+            connection.commit()
+            cursor.close()
+            return imported, present
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def key_material(user_id: int) -> tuple[str, list[str]] | None:
+        """The user's password hash and the salts of their encrypted notes, most used first."""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT password_hash FROM users WHERE id = %s", (user_id,))
+            row = cursor.fetchone()
+            cursor.execute(
+                "SELECT encryption_key_salt FROM notes "
+                "WHERE user_id = %s AND is_encrypted = TRUE AND encryption_key_salt IS NOT NULL "
+                "GROUP BY encryption_key_salt ORDER BY COUNT(*) DESC",
+                (user_id,)
+            )
+            salts = [salt for (salt,) in cursor.fetchall()]
+            cursor.close()
+            return (row[0] if row else None), salts
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def search(user_id: int, text: str, limit: int = SEARCH_LIMIT) -> list[dict] | None:
+        """Rank a user's notes against free text using the FULLTEXT index on (title, content).
+
+        Returns id, title, created_at, updated_at, is_encrypted and score, best match first. Text with no
+        indexable words falls back to a title substring match. Encrypted notes match on their
+        title only (through ft_notes_title), since their indexed content is ciphertext.
+        """
+        query = fulltext_query(text)
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor(dictionary=True)
+            if query:
+                cursor.execute(
+                    """
+                    SELECT id, title, created_at, updated_at, is_encrypted,
+                           MATCH(title, content) AGAINST (%s IN BOOLEAN MODE) AS score
+                    FROM notes
+                    WHERE user_id = %s AND MATCH(title, content) AGAINST (%s IN BOOLEAN MODE)
+                      AND (is_encrypted = FALSE OR MATCH(title) AGAINST (%s IN BOOLEAN MODE))
+                    ORDER BY score DESC, updated_at DESC
+                    LIMIT %s
+                    """,
+                    (query, user_id, query, query, limit)
+                )
+            else:
+                cursor.execute(
+                    """
+                    SELECT id, title, created_at, updated_at, is_encrypted, 0 AS score
+                    FROM notes
+                    WHERE user_id = %s AND title LIKE %s ESCAPE '\\\\'
+                    ORDER BY updated_at DESC
+                    LIMIT %s
+                    """,
+                    (user_id, like_pattern(text.strip()), limit)
+                )
+            hits = cursor.fetchall()
+            cursor.close()
+            return hits
+        finally:
+            close_connection(connection)
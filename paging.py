@@ -0,0 +1,201 @@
+"""
+Keyset pagination for CyberPatriot Runbook listings
+Pages are fetched with WHERE (sort keys) past the last row seen instead of OFFSET,
+so every page costs the same no matter how deep the user has scrolled
+"""
+from db_config import get_connection, close_connection
+
+DEFAULT_PAGE_SIZE = 200
+
+
+def like_pattern(text: str) -> str:
+    """A LIKE pattern matching text anywhere, with its own wildcards taken literally (use with ESCAPE '\\\\')"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class KeysetPager:
+    """Fetches a filtered, ordered query one page at a time.
+
+    order_by is a list of (sql_expression, descending) pairs whose combined
+    values are unique per row. Sort key values are selected as hidden trailing
+    columns, so the rows handed back contain only the visible columns.
+    changed_column is the updated_at column fetch_changed compares against.
+    """
+
+    def __init__(self, columns: list[str], source: str, order_by: list[tuple[str, bool]],
+                 filters: list[tuple[str, tuple]] | None = None, page_size: int = DEFAULT_PAGE_SIZE,
+                 changed_column: str | None = None):
+        self.columns = list(columns)
+        self.source = source
+        self.order_by = list(order_by)
+        self.filters = list(filters or [])
+        self.page_size = page_size
+        self.changed_column = changed_column
+        self.has_more = True
+        self._last_key = None
+
+    def reset(self):
+        """Start again from the first page"""
+        self.has_more = True
+        self._last_key = None
+
+    def fetch_next(self) -> list[tuple] | None:
+        """Fetch the next page of rows (None if the database is unreachable)"""
+        if not self.has_more:
+            return []
+
+        rows = self._run(*self.build_query())
+        if rows is None:
+            return None
+
+        # One extra row tells us whether another page exists
+        self.has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if rows:
+            self._last_key = tuple(rows[-1][len(self.columns):])
+
+        visible = len(self.columns)
+        return [row[:visible] for row in rows]
+
+    def fetch_changed(self, since) -> list[tuple] | None:
+        """Fetch rows whose changed_column is at or after since
+
+        Each row ends with a flag telling whether it still belongs in the listing: it matches
+        the filters and sorts within the loaded pages. Rows flagged out are dropped, so a row
+        that moved past the last loaded page (to a later team, say) leaves the listing and is
+        picked up again by fetch_next.
+        """
+        if self.has_more and self._last_key is None:
+            return []  # Nothing loaded yet
+
+        conditions = []
+        params = []
+        for clause, clause_params in self.filters:
+            conditions.append(clause)
+            params.extend(clause_params)
+        if self.has_more:
+            clause, key_params = self._keyset_clause(self._last_key)
+            conditions.append(f"NOT ({clause})")
+            params.extend(key_params)
+        belongs = "(" + " AND ".join(conditions) + ")" if conditions else "1"
+
+        params.append(since)
+        sql = (
+            f"SELECT {', '.join(self.columns)}, {belongs} FROM {self.source} "
+            f"WHERE {self.changed_column} >= %s"
+        )
+        return self._run(sql, params)
+
+    @staticmethod
+    def _run(sql: str, params: list) -> list[tuple] | None:
+        """Execute a query and return all rows (None if the database is unreachable)"""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        finally:
+            close_connection(connection)
+
+    def build_query(self) -> tuple[str, list]:
+        """Return the SQL and parameters for the next page"""
+        select_list = self.columns + [expr for expr, _ in self.order_by]
+        where = []
+        params = []
+        for clause, clause_params in self.filters:
+            where.append(clause)
+            params.extend(clause_params)
+
+        if self._last_key is not None:
+            clause, key_params = self._keyset_clause(self._last_key)
+            where.append(clause)
+            params.extend(key_params)
+
+        sql = f"SELECT {', '.join(select_list)} FROM {self.source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + ", ".join(
+            f"{expr} DESC" if descending else expr for expr, descending in self.order_by
+        )
+        sql += " LIMIT %s"
+        params.append(self.page_size + 1)
+        return sql, params
+
+    def _keyset_clause(self, last_key: tuple) -> tuple[str, list]:
+        """Build the predicate selecting rows after last_key in sort order"""
+        directions = {descending for _, descending in self.order_by}
+        if len(directions) == 1:
+            # Uniform direction: a row comparison lets MySQL range-scan the index
+            operator = "<" if directions.pop() else ">"
+            exprs = ", ".join(expr for expr, _ in self.order_by)
+            placeholders = ", ".join(["%s"] * len(self.order_by))
+            return f"({exprs}) {operator} ({placeholders})", list(last_key)
+
+        # Mixed directions: expand into (a > x) OR (a = x AND b < y) OR ...
+        alternatives = []
+        params = []
+        for position, (expr, descending) in enumerate(self.order_by):
+            parts = [f"{prior} = %s" for prior, _ in self.order_by[:position]]
+            parts.append(f"{expr} {'<' if descending else '>'} %s")
+            alternatives.append("(" + " AND ".join(parts) + ")")
+            params.extend(last_key[:position + 1])
+        return "(" + " OR ".join(alternatives) + ")", params
+
+
+class ListingRepository:
+    """Paged listings for the database viewer"""
+
+    @staticmethod
+    def users_pager(search: str | None = None, page_size: int = DEFAULT_PAGE_SIZE) -> KeysetPager:
+        """Users, newest first, optionally filtered by name/username"""
+        filters = []
+        if search:
+            pattern = like_pattern(search)
+            filters.append(("(u.name LIKE %s ESCAPE '\\\\' OR u.username LIKE %s ESCAPE '\\\\')", (pattern, pattern)))
+
+        return KeysetPager(
+            columns=["u.id", "u.name", "u.username", "u.email", "u.is_active", "u.created_at"],
+            source="users u",
+            order_by=[("u.created_at", True), ("u.id", True)],
+            filters=filters,
+            page_size=page_size,
+            changed_column="u.updated_at",
+        )
+
+    @staticmethod
+    def team_members_pager(search: str | None = None, team_id: int | None = None,
+                           role: str | None = None, status: str | None = None,
+                           page_size: int = DEFAULT_PAGE_SIZE) -> KeysetPager:
+        """Team members grouped by team, optionally filtered by name/team/role/status"""
+        filters = []
+        if search:
+            pattern = like_pattern(search)
+            filters.append(("(u.name LIKE %s ESCAPE '\\\\' OR u.username LIKE %s ESCAPE '\\\\' "
+                            "OR t.name LIKE %s ESCAPE '\\\\')", (pattern, pattern, pattern)))
+        if team_id is not None:
+            filters.append(("tm.team_id = %s", (team_id,)))
+        if role:
+            filters.append(("r.name = %s", (role,)))
+        if status:
+            filters.append(("tm.status = %s", (status,)))
+
+        return KeysetPager(
+            columns=["tm.id", "u.name", "u.username", "t.name", "r.name", "tm.status", "tm.created_at"],
+            source=(
+                "team_members tm "
+                "JOIN users u ON tm.user_id = u.id "
+                "JOIN teams t ON tm.team_id = t.id "
+                "JOIN roles r ON tm.role_id = r.id"
+            ),
+            # (team_id, user_id) is unique, so it is a complete key on its own
+            order_by=[("tm.team_id", False), ("tm.user_id", False)],
+            filters=filters,
+            page_size=page_size,
+            changed_column="tm.updated_at",
+        )
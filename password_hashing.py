@@ -0,0 +1,156 @@
+"""
+Password hashing for CyberPatriot Runbook
+Hashes are self-describing strings ("algorithm$cost...$salt$hash"), so the cost can be
+raised later and old hashes are upgraded the next time their owner logs in.
+
+Run this module to pick cost parameters for the current machine:
+    python password_hashing.py [target milliseconds]
+"""
+import base64
+import hashlib
+import hmac
+import os
+import re
+import sys
+import time
+
+SALT_BYTES = 16
+
+# Current defaults; raise the cost as hardware gets faster (see calibrate())
+HASH_CONFIG = {
+    "algorithm": "pbkdf2_sha256",
+    "pbkdf2_iterations": 600_000,
+    "scrypt_n": 2 ** 15,
+    "scrypt_r": 8,
+    "scrypt_p": 1,
+}
+
+_LEGACY_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class Pbkdf2Hasher:
+    """PBKDF2-HMAC-SHA256: pbkdf2_sha256$iterations$salt$hash"""
+
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations: int):
+        self.iterations = iterations
+
+    def hash(self, password: str, salt: bytes | None = None) -> str:
+        salt = salt or os.urandom(SALT_BYTES)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, iterations, salt, digest = encoded.split("$")
+        expected = _b64decode(digest)
+        actual = hashlib.pbkdf2_hmac("sha256", password.encode(), _b64decode(salt), int(iterations))
+        return hmac.compare_digest(actual, expected)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        parts = encoded.split("$")
+        return parts[0] != self.algorithm or int(parts[1]) < self.iterations
+
+
+class ScryptHasher:
+    """scrypt: scrypt$n$r$p$salt$hash"""
+
+    algorithm = "scrypt"
+
+    def __init__(self, n: int, r: int, p: int):
+        self.n, self.r, self.p = n, r, p
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        # maxmem must cover 128 * n * r bytes, which OpenSSL's 32 MiB default does not at n >= 2**15
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024)
+
+    def hash(self, password: str, salt: bytes | None = None) -> str:
+        salt = salt or os.urandom(SALT_BYTES)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{self.algorithm}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, n, r, p, salt, digest = encoded.split("$")
+        actual = self._derive(password, _b64decode(salt), int(n), int(r), int(p))
+        return hmac.compare_digest(actual, _b64decode(digest))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        parts = encoded.split("$")
+        if parts[0] != self.algorithm:
+            return True
+        return (int(parts[1]), int(parts[2]), int(parts[3])) < (self.n, self.r, self.p)
+
+
+class LegacySha256Hasher:
+    """Unsalted SHA-256 hex digests written by earlier versions; verify only"""
+
+    algorithm = "sha256"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), encoded)
+
+
+def default_hasher():
+    """The hasher new passwords are stored with, built from HASH_CONFIG"""
+    if HASH_CONFIG["algorithm"] == ScryptHasher.algorithm:
+        return ScryptHasher(HASH_CONFIG["scrypt_n"], HASH_CONFIG["scrypt_r"], HASH_CONFIG["scrypt_p"])
+    return Pbkdf2Hasher(HASH_CONFIG["pbkdf2_iterations"])
+
+
+def hasher_for(encoded: str):
+    """The hasher that can verify an encoded hash"""
+    if _LEGACY_SHA256.match(encoded):
+        return LegacySha256Hasher()
+    algorithm = encoded.split("$", 1)[0]
+    if algorithm == Pbkdf2Hasher.algorithm:
+        return Pbkdf2Hasher(HASH_CONFIG["pbkdf2_iterations"])
+    if algorithm == ScryptHasher.algorithm:
+        return ScryptHasher(HASH_CONFIG["scrypt_n"], HASH_CONFIG["scrypt_r"], HASH_CONFIG["scrypt_p"])
+    raise ValueError(f"Unknown password hash format: {algorithm}")
+
+
+def calibrate(target_ms: float = 250.0) -> dict:
+    """Pick cost parameters whose hash time on this machine is close to target_ms"""
+    password = "calibration-password"
+    salt = os.urandom(SALT_BYTES)
+
+    def elapsed_ms(hasher) -> float:
+        start = time.perf_counter()
+        hasher.hash(password, salt)
+        return (time.perf_counter() - start) * 1000
+
+    # PBKDF2 time is linear in the iteration count, so one measurement scales
+    probe = 100_000
+    per_iteration = elapsed_ms(Pbkdf2Hasher(probe)) / probe
+    iterations = int(target_ms / per_iteration)
+    # One corrective measurement at the estimated cost absorbs warm-up noise in the probe
+    iterations = int(iterations * target_ms / elapsed_ms(Pbkdf2Hasher(iterations)))
+    iterations = max(probe, iterations // 10_000 * 10_000)
+
+    # scrypt cost doubles with n, so raise n until the next step would overshoot
+    n = 2 ** 14
+    while n < 2 ** 20 and elapsed_ms(ScryptHasher(n * 2, 8, 1)) <= target_ms:
+        n *= 2
+
+    return {
+        "pbkdf2_iterations": iterations,
+        "pbkdf2_ms": round(elapsed_ms(Pbkdf2Hasher(iterations)), 1),
+        "scrypt_n": n,
+        "scrypt_ms": round(elapsed_ms(ScryptHasher(n, 8, 1)), 1),
+    }
+
+
+if __name__ == "__main__":
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+    result = calibrate(target)
+    print(f"Target: {target:.0f} ms per hash")
+    print(f"PBKDF2-SHA256: pbkdf2_iterations = {result['pbkdf2_iterations']} ({result['pbkdf2_ms']} ms)")
+    print(f"scrypt (r=8, p=1): scrypt_n = {result['scrypt_n']} ({result['scrypt_ms']} ms)")
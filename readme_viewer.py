@@ -2,6 +2,7 @@
 
 import sys
 import json
+import re
 from pathlib import Path
 from datetime import datetime
 from PySide6.QtWidgets import (
@@ -26,6 +27,10 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QFont, QColor
 from db_config import get_connection, close_connection
+from async_query import AsyncQueryRunner
+from reference_cache import get_reference_cache
+from audit_log import audit
+from search_index import get_search_index, SOURCE_DIRS, READMES
 
 
 class ReadmeViewerWindow(QMainWindow):
@@ -36,34 +41,16 @@ class ReadmeViewerWindow(QMainWindow):
         self.setWindowTitle("CyberPatriot Team README Viewer")
         self.setGeometry(100, 100, 1200, 700)
         self.setStyleSheet(self._get_stylesheet())
-        self.teams = self._load_teams()
+        self.teams = {}
         self.current_user_id = None
         self.current_username = None
         self.current_team_id = None
+        self.query_runner = AsyncQueryRunner(self)
         self._init_ui()
 
     def _load_teams(self):
-        """Load teams from the database."""
-        from db_config import get_connection, close_connection
-        
-        teams = {}
-        connection = get_connection()
-        if not connection:
-            return teams
-        
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute("SELECT id, name FROM teams ORDER BY name")
-            results = cursor.fetchall()
-            for row in results:
-                teams[row['name']] = row['id']
-            cursor.close()
-        except Exception:
-            pass
-        finally:
-            close_connection(connection)
-        
-        return teams
+        """Load teams through the shared reference cache (queries only when it is cold or stale)."""
+        return get_reference_cache().team_ids_by_name()
 
     def _get_team_members(self, team_id):
         """Get all members of a specific team."""
@@ -179,6 +166,17 @@ class ReadmeViewerWindow(QMainWindow):
         main_layout.addLayout(bottom_button_layout)
 
         central_widget.setLayout(main_layout)
+        self._request_teams()
+
+    def _request_teams(self):
+        """Load teams in the background and fill the team combo when they arrive."""
+        self.team_combo.setEnabled(False)
+        self.query_runner.submit("teams", self._load_teams, on_result=self._on_teams_loaded)
+
+    def _on_teams_loaded(self, teams):
+        """Apply the loaded teams to the team combo."""
+        self.teams = teams
+        self.team_combo.setEnabled(True)
         self._load_teams_combo()
 
     def _load_teams_combo(self):
@@ -211,7 +209,13 @@ class ReadmeViewerWindow(QMainWindow):
         if not team_id:
             return
 
-        members = self._get_team_members(team_id)
+        # A newer team selection supersedes any member query still running
+        self.query_runner.submit(
+            "members", self._get_team_members, team_id, on_result=self._show_members
+        )
+
+    def _show_members(self, members):
+        """Display a loaded member list."""
         self.members_list.clear()
 
         for username, user_id in sorted(members.items()):
@@ -233,7 +237,12 @@ class ReadmeViewerWindow(QMainWindow):
 
         connection = get_connection()
         if not connection:
-            self.readme_content.setPlainText("Database connection error.")
+            cached = self._read_cached_readme(self.current_team_id, username)
+            if cached is None:
+                self.readme_content.setPlainText("Database connection error.")
+            else:
+                self.readme_content.setPlainText(cached)
+                self.member_name_label.setText(f"README - {username} (offline copy)")
             return
 
         try:
@@ -248,6 +257,7 @@ class ReadmeViewerWindow(QMainWindow):
 
             if result:
                 self.readme_content.setPlainText(result['content'])
+                self._cache_readme(self.current_team_id, username, result['content'])
             else:
                 self.readme_content.setPlainText("No README file uploaded yet.")
         except Exception as e:
@@ -255,6 +265,30 @@ class ReadmeViewerWindow(QMainWindow):
         finally:
             close_connection(connection)
 
+    def _readme_cache_path(self, team_id, username):
+        """Path of the local copy of a member's README (readme_cache/<team id>/<username>.txt)."""
+        safe_name = re.sub(r"[^\w.-]", "_", username)
+        return SOURCE_DIRS[READMES] / str(team_id) / f"{safe_name}.txt"
+
+    def _cache_readme(self, team_id, username, content):
+        """Keep a local copy of a README so it can be read and searched while offline."""
+        path = self._readme_cache_path(team_id, username)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+            get_search_index().update_file(path)
+        except OSError as e:
+            print(f"Could not cache README: {e}")
+
+    def _read_cached_readme(self, team_id, username):
+        """Return the local copy of a README, or None if it was never cached."""
+        try:
+            with open(self._readme_cache_path(team_id, username), "r") as f:
+                return f.read()
+        except OSError:
+            return None
+
     def _upload_readme(self):
         """Upload a README file to database."""
         team_name = self.team_combo.currentText()
@@ -335,11 +369,16 @@ class ReadmeViewerWindow(QMainWindow):
                         "ON DUPLICATE KEY UPDATE content = VALUES(content), os_type = VALUES(os_type), updated_at = CURRENT_TIMESTAMP",
                         (team_id, user_id, f"{username}'s README", os_type, content)
                     )
+                    readme_id = cursor.lastrowid or None  # 0 when an existing README was replaced
                     
                     connection.commit()
                     cursor.close()
                     close_connection(connection)
+                    audit("readme_uploaded", "readme", readme_id, new_value=os_type,
+                          description=f"{len(content)} characters for team {team_id}", user_id=user_id,
+                          team_id=team_id)
 
+                    self._cache_readme(team_id, username, content)
                     QMessageBox.information(self, "Success", "README uploaded successfully!")
                     self._refresh_members()
                 except Exception as e:
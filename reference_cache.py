@@ -0,0 +1,155 @@
+"""
+In-process cache of reference data for CyberPatriot Runbook
+Roles and teams change rarely but are looked up by every window, so they are loaded
+once, kept for a TTL and dropped explicitly by the code paths that modify them
+"""
+import threading
+import time
+
+from db_config import get_connection, close_connection
+
+DEFAULT_TTL_SECONDS = 300
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class ReferenceCache:
+    """Roles by name/id and teams by id/name/code, safe to use from worker threads"""
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._roles = None   # (by_name, by_id, loaded_at)
+        self._teams = None   # (ordered list, by_id, by_code, loaded_at)
+        self._teams_miss_reload_at = None  # When a lookup miss last forced a teams reload
+
+    # Roles
+
+    def role_ids(self) -> dict[str, int]:
+        """Role ids keyed by role name ({} if the database is unreachable)"""
+        roles = self._get_roles()
+        return dict(roles[0]) if roles else {}
+
+    def role_id(self, name: str) -> int | None:
+        roles = self._get_roles()
+        return roles[0].get(name) if roles else None
+
+    def role_name(self, role_id: int) -> str | None:
+        roles = self._get_roles()
+        return roles[1].get(role_id) if roles else None
+
+    def invalidate_roles(self):
+        with self._lock:
+            self._roles = None
+
+    def _get_roles(self):
+        with self._lock:
+            roles = self._roles
+        if roles is not None and time.monotonic() - roles[2] < self.ttl:
+            return roles
+
+        rows = self._query("SELECT id, name FROM roles")
+        if rows is None:
+            return roles  # Serve stale data rather than nothing while the database is down
+        roles = ({name: role_id for role_id, name in rows}, {role_id: name for role_id, name in rows}, time.monotonic())
+        with self._lock:
+            self._roles = roles
+        return roles
+
+    # Teams
+
+    def teams(self) -> list[dict]:
+        """Every team as {'id', 'name', 'team_code', 'division'}, ordered by name"""
+        teams = self._get_teams()
+        return [dict(team) for team in teams[0]] if teams else []
+
+    def team_ids_by_name(self) -> dict[str, int]:
+        """Team ids keyed by team name, as the windows' team combos use them"""
+        teams = self._get_teams()
+        return {team['name']: team['id'] for team in teams[0]} if teams else {}
+
+    def team_by_id(self, team_id: int) -> dict | None:
+        return self._lookup_team(1, team_id)
+
+    def team_by_code(self, team_code: str) -> dict | None:
+        return self._lookup_team(2, team_code)
+
+    def invalidate_teams(self):
+        with self._lock:
+            self._teams = None
+
+    def _lookup_team(self, index: int, key) -> dict | None:
+        """Find a team in one of the lookup maps
+
+        A miss reloads the teams in case the team is new, but at most once per TTL, so
+        repeated lookups of deleted or mistyped teams do not each query the table.
+        """
+        teams = self._get_teams()
+        team = teams[index].get(key) if teams else None
+        if team is None and teams is not None:
+            now = time.monotonic()
+            with self._lock:
+                reload = self._teams_miss_reload_at is None or now - self._teams_miss_reload_at >= self.ttl
+                if reload:
+                    self._teams_miss_reload_at = now
+                    self._teams = None
+            if reload:
+                teams = self._get_teams()
+                team = teams[index].get(key) if teams else None
+        return dict(team) if team else None
+
+    def _get_teams(self):
+        with self._lock:
+            teams = self._teams
+        if teams is not None and time.monotonic() - teams[3] < self.ttl:
+            return teams
+
+        rows = self._query("SELECT id, name, team_code, division FROM teams ORDER BY name")
+        if rows is None:
+            return teams
+        ordered = [
+            {'id': team_id, 'name': name, 'team_code': team_code, 'division': division}
+            for team_id, name, team_code, division in rows
+        ]
+        teams = (
+            ordered,
+            {team['id']: team for team in ordered},
+            {team['team_code']: team for team in ordered},
+            time.monotonic(),
+        )
+        with self._lock:
+            self._teams = teams
+        return teams
+
+    def invalidate(self):
+        """Drop everything"""
+        self.invalidate_roles()
+        self.invalidate_teams()
+
+    @staticmethod
+    def _query(sql: str) -> list[tuple] | None:
+        connection = get_connection()
+        if not connection:
+            return None
+        try:
+            cursor = connection.cursor()
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        except Exception as e:
+            print(f"Reference data query failed: {e}")
+            return None
+        finally:
+            close_connection(connection)
+
+
+def get_reference_cache() -> ReferenceCache:
+    """Return the process-wide reference data cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReferenceCache()
+    return _cache
@@ -1,7 +1,6 @@
 """Script to run and complete checklists."""
 
 import sys
-import json
 from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication,
@@ -21,6 +20,25 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QFont, QColor
 
+from async_query import AsyncQueryRunner
+from reference_cache import get_reference_cache
+from checklist_loader import StreamingChecklist
+from checklist_model import ChecklistItem, ChecklistRun
+from checklist_catalog import ChecklistCatalog, CATALOG_FILENAME
+from checklist_repository import ChecklistRepository
+from checklist_progress import ChecklistProgressRepository, ChecklistProgressWriter
+from file_watcher import DirectoryWatcher, REMOVED
+from search_index import get_search_index
+
+# Item colors, shared by every row instead of allocated per update
+STATUS_COLORS = {
+    "complete": QColor("#4CAF50"),
+    "skipped": QColor("#2196F3"),
+    "unviewed": QColor("#000000"),
+    "incomplete": QColor("#F44336"),
+    "other": QColor("#333333"),
+}
+
 
 class RunChecklistWindow(QMainWindow):
     """Main window for running checklists."""
@@ -31,37 +49,79 @@ class RunChecklistWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 700)
         self.setStyleSheet(self._get_stylesheet())
         self.checklists_dir = Path("checklists")
+        self.catalog = ChecklistCatalog(self.checklists_dir)
+        self.catalog.refresh()
+        self.watcher = DirectoryWatcher(self.checklists_dir, ignore={CATALOG_FILENAME}, parent=self)
+        self.watcher.files_changed.connect(self._on_checklist_files_changed)
         self.current_checklist = None
+        self.checklist_file = None  # StreamingChecklist when the open checklist is a file
+        self.db_checklists = []  # (id, title) pairs for the selected team
         self.checklist_items = []
-        self.item_statuses = {}
-        self.item_viewed = {}  # Track which items have been viewed
+        self.run = ChecklistRun([])  # Status and viewed flags per item
         self.current_item_index = 0
-        self.teams = self._load_teams()
+        self.changed_items = set()  # Items marked since the checklist was loaded
+        self.teams = {}
+        self.users = {}
+        self.current_user_id = None
+        self.progress_writers = {}  # user id -> ChecklistProgressWriter
+        self.query_runner = AsyncQueryRunner(self)
         self._init_ui()
-        self._load_teams_combo()
+        self._request_users()
+        self._request_teams()
+
+    def _request_users(self):
+        """Load users in the background and fill the user combo when they arrive."""
+        self.user_combo.setEnabled(False)
+        self.query_runner.submit("users", self._load_users, on_result=self._on_users_loaded)
+
+    def _on_users_loaded(self, users):
+        """Apply the loaded users to the user combo."""
+        self.users = users
+        self.user_combo.setEnabled(True)
+        self.user_combo.clear()
+        if self.users:
+            self.user_combo.addItems(sorted(self.users.keys()))
+        else:
+            self.user_combo.addItem("No users available")
 
-    def _load_teams(self):
-        """Load teams from the database."""
+    def _load_users(self):
+        """Load users from the database."""
         from db_config import get_connection, close_connection
-        
-        teams = {}
+
+        users = {}
         connection = get_connection()
         if not connection:
-            return teams
-        
+            return users
+
         try:
             cursor = connection.cursor(dictionary=True)
-            cursor.execute("SELECT id, name FROM teams ORDER BY name")
-            results = cursor.fetchall()
-            for row in results:
-                teams[row['name']] = row['id']
+            cursor.execute("SELECT id, username FROM users WHERE is_active = 1 ORDER BY username")
+            for row in cursor.fetchall():
+                users[row['username']] = row['id']
             cursor.close()
-        except Exception as e:
+        except Exception:
             pass
         finally:
             close_connection(connection)
-        
-        return teams
+
+        return users
+
+    def _request_teams(self):
+        """Load teams in the background and fill the team combo when they arrive."""
+        self.team_combo.setEnabled(False)
+        self.progress_label.setText("Loading teams...")
+        self.query_runner.submit("teams", self._load_teams, on_result=self._on_teams_loaded)
+
+    def _on_teams_loaded(self, teams):
+        """Apply the loaded teams to the team combo."""
+        self.teams = teams
+        self.progress_label.setText("")
+        self.team_combo.setEnabled(True)
+        self._load_teams_combo()
+
+    def _load_teams(self):
+        """Load teams through the shared reference cache (queries only when it is cold or stale)."""
+        return get_reference_cache().team_ids_by_name()
 
     def _init_ui(self):
         """Initialize the main UI."""
@@ -74,6 +134,17 @@ class RunChecklistWindow(QMainWindow):
         title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         main_layout.addWidget(title)
 
+        # User selection
+        user_layout = QHBoxLayout()
+        user_label = QLabel("Select User:")
+        user_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.user_combo = QComboBox()
+        self.user_combo.currentTextChanged.connect(self._on_user_changed)
+        user_layout.addWidget(user_label)
+        user_layout.addWidget(self.user_combo)
+        user_layout.addStretch()
+        main_layout.addLayout(user_layout)
+
         # Team selection
         team_layout = QHBoxLayout()
         team_label = QLabel("Select Team:")
@@ -106,6 +177,7 @@ class RunChecklistWindow(QMainWindow):
         left_panel.addWidget(items_label)
 
         self.items_list = QListWidget()
+        self.items_list.setUniformItemSizes(True)
         self.items_list.itemClicked.connect(self._on_item_clicked)
         left_panel.addWidget(self.items_list)
 
@@ -196,7 +268,7 @@ class RunChecklistWindow(QMainWindow):
         # Bottom buttons
         bottom_button_layout = QHBoxLayout()
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self._load_checklists)
+        refresh_btn.clicked.connect(self._refresh_checklists)
         export_btn = QPushButton("Export Report")
         export_btn.clicked.connect(self._export_report)
         close_btn = QPushButton("Close")
@@ -217,6 +289,14 @@ class RunChecklistWindow(QMainWindow):
         else:
             self.team_combo.addItem("No teams available")
 
+    def _on_user_changed(self, username):
+        """Switch whose progress is saved, and show that user's progress on the open checklist."""
+        self.current_user_id = self.users.get(username)
+        if self.current_user_id is not None and self.current_user_id not in self.progress_writers:
+            self.progress_writers[self.current_user_id] = ChecklistProgressWriter(self.current_user_id, parent=self)
+        if self.current_checklist is not None:
+            self._start_checklist()
+
     def _on_team_changed(self, team_name):
         """Handle team selection change."""
         if not team_name or team_name == "No teams available":
@@ -226,42 +306,85 @@ class RunChecklistWindow(QMainWindow):
         
         self._load_checklists()
 
+    def _refresh_checklists(self):
+        """Re-index changed checklist files and reload the list."""
+        self.catalog.refresh()
+        self._load_checklists()
+
+    def _on_checklist_files_changed(self, events):
+        """Apply watcher events to the catalog and, if the current team is affected, the list."""
+        team_id = self.teams.get(self.team_combo.currentText())
+        affects_team = False
+
+        index = get_search_index()
+        for event, path in events:
+            before = self.catalog.entries.get(path.name, {}).get("team_id")
+            if event == REMOVED:
+                self.catalog.remove_file(path.name)
+                index.remove_file(path)
+            else:
+                self.catalog.update_file(path.name)
+                index.update_file(path)
+            after = self.catalog.entries.get(path.name, {}).get("team_id")
+            if team_id is not None and team_id in (before, after):
+                affects_team = True
+
+        if affects_team:
+            self._reload_checklist_combo()
+
+    def _reload_checklist_combo(self):
+        """Re-list the team's checklists, keeping the open checklist selected if it still exists."""
+        current_data = self.checklist_combo.currentData()
+        self.checklist_combo.blockSignals(True)
+        self._fill_checklist_combo()
+        index = next(
+            (i for i in range(self.checklist_combo.count()) if self.checklist_combo.itemData(i) == current_data),
+            -1,
+        )
+        if index >= 0:
+            self.checklist_combo.setCurrentIndex(index)
+        self.checklist_combo.blockSignals(False)
+
+        if index < 0:
+            # The open checklist is gone (or there wasn't one); show whatever is now selected
+            self._on_checklist_changed(self.checklist_combo.currentText())
+
     def _load_checklists(self):
         """Load checklists for the selected team."""
         selected_team = self.team_combo.currentText()
         if not selected_team or selected_team == "No teams available":
+            self.query_runner.cancel("checklists")
             self.checklist_combo.clear()
             return
 
-        if not self.checklists_dir.exists():
-            self.checklists_dir.mkdir(exist_ok=True)
-            return
+        self.query_runner.submit(
+            "checklists", ChecklistRepository.list_checklists, self.teams.get(selected_team),
+            on_result=self._on_team_checklists_loaded,
+        )
 
-        self.checklist_combo.clear()
-        checklist_files = list(self.checklists_dir.glob("*.json"))
+    def _on_team_checklists_loaded(self, checklists):
+        """Remember the team's database checklists and re-list the combo."""
+        self.db_checklists = checklists or []
+        self._reload_checklist_combo()
 
-        if not checklist_files:
-            self.progress_label.setText("No checklists found for this team. Create one using create_checklist.py")
+    def _fill_checklist_combo(self):
+        """List the team's database checklists, then any checklist files not yet migrated."""
+        self.checklist_combo.clear()
+        selected_team = self.team_combo.currentText()
+        if not selected_team or selected_team == "No teams available":
             return
 
-        # Filter checklists by selected team
+        # Only this team's catalog entries are touched; no files are opened
         team_id = self.teams.get(selected_team)
-        team_checklists = []
-
-        for file in checklist_files:
-            try:
-                with open(file, "r") as f:
-                    checklist_data = json.load(f)
-                    if checklist_data.get("team_id") == team_id:
-                        team_checklists.append((file.stem, file))
-            except Exception:
-                pass
-
-        if not team_checklists:
-            self.progress_label.setText("No checklists found for this team")
+        team_files = self.catalog.checklists_for_team(team_id)
+
+        if not self.db_checklists and not team_files:
+            self.progress_label.setText("No checklists found for this team. Create one using create_checklist.py")
             return
 
-        for name, file_path in team_checklists:
+        for checklist_id, title in self.db_checklists:
+            self.checklist_combo.addItem(title, checklist_id)
+        for name, file_path in team_files:
             self.checklist_combo.addItem(name, file_path)
 
     def _on_checklist_changed(self, checklist_name):
@@ -269,65 +392,148 @@ class RunChecklistWindow(QMainWindow):
         if not checklist_name:
             return
 
-        file_path = self.checklist_combo.currentData()
-        if not file_path:
+        source = self.checklist_combo.currentData()
+        if source is None:
             return
 
-        try:
-            with open(file_path, "r") as f:
-                checklist_data = json.load(f)
-
-            self.current_checklist = checklist_data
-            self.checklist_items = checklist_data.get("items", [])
-            self.item_statuses = {i: "incomplete" for i in range(len(self.checklist_items))}
-            self.item_viewed = {i: False for i in range(len(self.checklist_items))}  # Initialize as not viewed
-            self.current_item_index = 0
-            self._refresh_items_list()
-            self._display_current_item()
-            self._mark_item_viewed(0)  # Mark first item as viewed
-            self._update_progress_label()
+        if isinstance(source, int):
+            self.query_runner.submit(
+                "checklist", ChecklistRepository.load_checklist, source,
+                on_result=self._on_checklist_loaded,
+                on_error=lambda message: QMessageBox.critical(self, "Error", f"Failed to load checklist: {message}"),
+            )
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load checklist: {str(e)}")
+        # Large files are indexed in the background; item text is read when displayed
+        self.query_runner.submit(
+            "checklist", StreamingChecklist, source,
+            on_result=self._on_checklist_file_loaded,
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Failed to load checklist: {message}"),
+        )
+
+    def _on_checklist_file_loaded(self, checklist_file):
+        """Show an indexed checklist file, starting from item names only."""
+        self._on_checklist_loaded(
+            {"name": checklist_file.name, "team_id": checklist_file.team_id, "items": checklist_file.headers()},
+            checklist_file,
+        )
+
+    def _on_checklist_loaded(self, checklist_data, checklist_file=None):
+        """Show a loaded checklist, from the database or a file."""
+        if checklist_data is None:
+            QMessageBox.critical(self, "Error", "Failed to load checklist: database unavailable or checklist deleted")
+            return
 
-    def _refresh_items_list(self):
-        """Refresh the items list display."""
-        self.items_list.clear()
+        self.current_checklist = checklist_data
+        self.checklist_file = checklist_file
+        self.checklist_items = checklist_data.get("items", [])
+        self._start_checklist()
+
+    def _start_checklist(self):
+        """Reset the runner to the first item and restore the user's saved progress."""
+        self.run = ChecklistRun(self.checklist_items)
+        self.changed_items = set()
+        self.current_item_index = 0
+        self._request_progress()
+        self._refresh_items_list()
+        self._display_current_item()
+        self._mark_item_viewed(0)  # Mark first item as viewed
+        self._update_progress_label()
+
+    def _request_progress(self):
+        """Load the user's saved statuses for the open checklist in one background query."""
+        item_ids = [item.id for item in self.checklist_items if item.id is not None]
+        if self.current_user_id is None or not item_ids:
+            self.query_runner.cancel("progress")
+            return
+        self.query_runner.submit(
+            "progress", ChecklistProgressRepository.load_statuses, self.current_user_id, item_ids,
+            on_result=self._on_progress_loaded,
+        )
+
+    def _on_progress_loaded(self, statuses):
+        """Apply saved statuses, then queue whatever changed locally while they were loading."""
+        if statuses is None:
+            return  # Database unavailable; leave saved progress untouched
 
         for idx, item in enumerate(self.checklist_items):
-            status = self.item_statuses.get(idx, "incomplete")
-            viewed = self.item_viewed.get(idx, False)
-            item_text = item["name"]
-            
-            # Add status indicator to item name
-            if status == "complete":
-                status_indicator = "✓"
-                text_color = QColor("#4CAF50")  # Green text
-            elif status == "skipped":
-                status_indicator = "⊘"
-                text_color = QColor("#2196F3")  # Blue text
-            elif status == "incomplete" and not viewed:
-                status_indicator = "●"  # White dot with black outline
-                text_color = QColor("#000000")  # Black text
-            elif status == "incomplete" and viewed:
-                status_indicator = "●"  # Red dot
-                text_color = QColor("#F44336")  # Red text
-            else:
-                status_indicator = "○"
-                text_color = QColor("#333333")  # Dark gray
+            if item.id is None:
+                continue
+            stored = statuses.get(item.id)
+            if stored is not None and idx not in self.changed_items:
+                # Items clicked before the restore finished keep the user's choice
+                self.run.set_status(idx, "incomplete" if stored == "pending" else stored)
+                if stored != "pending":
+                    self.run.mark_viewed(idx)
+                self._update_item_row(idx)
+
+            status = self._progress_status(idx)
+            if status != stored and not (stored is None and status == "pending"):
+                self._record_progress(idx)
+
+    def _progress_status(self, idx):
+        """checklist_status value for an item: 'pending' until it has been viewed."""
+        status = self.run.status(idx)
+        if status == "incomplete" and not self.run.is_viewed(idx):
+            return "pending"
+        return status
+
+    def _record_progress(self, idx):
+        """Queue an item's status for the write-behind progress writer."""
+        writer = self.progress_writers.get(self.current_user_id)
+        item_id = self.checklist_items[idx].id
+        if writer is None or item_id is None:
+            return
+        if self.query_runner.is_loading("progress"):
+            return  # Reconciled against the saved state once it arrives
+        writer.record(item_id, self._progress_status(idx))
 
-            display_text = f"{status_indicator} {item_text}"
+    def _refresh_items_list(self):
+        """Rebuild the items list display (only needed when a checklist is loaded)."""
+        self.items_list.setUpdatesEnabled(False)
+        self.items_list.clear()
 
-            list_item = QListWidgetItem(display_text)
+        for idx, item in enumerate(self.checklist_items):
+            list_item = QListWidgetItem()
             list_item.setData(Qt.ItemDataRole.UserRole, idx)
-            list_item.setForeground(text_color)
-
             self.items_list.addItem(list_item)
+            self._update_item_row(idx)
+
+        self.items_list.setUpdatesEnabled(True)
 
         # Select current item
         if 0 <= self.current_item_index < len(self.checklist_items):
             self.items_list.setCurrentRow(self.current_item_index)
 
+    def _update_item_row(self, idx):
+        """Update one row's status indicator and color in place."""
+        list_item = self.items_list.item(idx)
+        if list_item is None:
+            return
+
+        status = self.run.status(idx)
+        viewed = self.run.is_viewed(idx)
+        
+        # Add status indicator to item name
+        if status == "complete":
+            status_indicator = "✓"
+            text_color = STATUS_COLORS["complete"]  # Green text
+        elif status == "skipped":
+            status_indicator = "⊘"
+            text_color = STATUS_COLORS["skipped"]  # Blue text
+        elif status == "incomplete" and not viewed:
+            status_indicator = "●"  # White dot with black outline
+            text_color = STATUS_COLORS["unviewed"]  # Black text
+        elif status == "incomplete" and viewed:
+            status_indicator = "●"  # Red dot
+            text_color = STATUS_COLORS["incomplete"]  # Red text
+        else:
+            status_indicator = "○"
+            text_color = STATUS_COLORS["other"]  # Dark gray
+
+        list_item.setText(f"{status_indicator} {self.checklist_items[idx].name}")
+        list_item.setForeground(text_color)
+
     def _display_current_item(self):
         """Display the current item in the details panel."""
         if not self.checklist_items or self.current_item_index < 0 or self.current_item_index >= len(self.checklist_items):
@@ -336,14 +542,26 @@ class RunChecklistWindow(QMainWindow):
             self.item_howto.setPlainText("")
             return
 
-        item = self.checklist_items[self.current_item_index]
-        self.item_name_label.setText(item["name"])
-        self.item_description.setPlainText(item["description"])
-        self.item_howto.setPlainText(item["how_to"])
+        try:
+            item = self._item_details(self.current_item_index)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read checklist item: {str(e)}")
+            return
+        if self.items_list.currentRow() != self.current_item_index:
+            self.items_list.setCurrentRow(self.current_item_index)
+        self.item_name_label.setText(item.name)
+        self.item_description.setPlainText(item.description)
+        self.item_howto.setPlainText(item.how_to)
 
         # Update button states
         self._update_navigation_buttons()
 
+    def _item_details(self, idx):
+        """Full item, read from the checklist file on demand for file checklists."""
+        if self.checklist_file is not None:
+            return ChecklistItem.from_dict(self.checklist_file.item(idx))
+        return self.checklist_items[idx]
+
     def _on_item_clicked(self, item):
         """Handle item click to change current item."""
         idx = item.data(Qt.ItemDataRole.UserRole)
@@ -355,29 +573,35 @@ class RunChecklistWindow(QMainWindow):
 
     def _mark_item_viewed(self, idx):
         """Mark an item as viewed."""
-        if 0 <= idx < len(self.checklist_items):
-            self.item_viewed[idx] = True
-            self._refresh_items_list()
+        if 0 <= idx < len(self.checklist_items) and self.run.mark_viewed(idx):
+            self._update_item_row(idx)
+            self._record_progress(idx)
 
     def _mark_complete(self):
         """Mark current item as complete and go to next."""
         if 0 <= self.current_item_index < len(self.checklist_items):
-            self.item_statuses[self.current_item_index] = "complete"
-            self._refresh_items_list()
+            self.run.set_status(self.current_item_index, "complete")
+            self.changed_items.add(self.current_item_index)
+            self._update_item_row(self.current_item_index)
+            self._record_progress(self.current_item_index)
             self._go_next()
 
     def _mark_skipped(self):
         """Mark current item as skipped and go to next."""
         if 0 <= self.current_item_index < len(self.checklist_items):
-            self.item_statuses[self.current_item_index] = "skipped"
-            self._refresh_items_list()
+            self.run.set_status(self.current_item_index, "skipped")
+            self.changed_items.add(self.current_item_index)
+            self._update_item_row(self.current_item_index)
+            self._record_progress(self.current_item_index)
             self._go_next()
 
     def _mark_not_done(self):
         """Mark current item as not done and go to next."""
         if 0 <= self.current_item_index < len(self.checklist_items):
-            self.item_statuses[self.current_item_index] = "incomplete"
-            self._refresh_items_list()
+            self.run.set_status(self.current_item_index, "incomplete")
+            self.changed_items.add(self.current_item_index)
+            self._update_item_row(self.current_item_index)
+            self._record_progress(self.current_item_index)
             self._go_next()
 
     def _go_next(self):
@@ -426,12 +650,16 @@ class RunChecklistWindow(QMainWindow):
         skipped_count = 0
         incomplete_count = 0
 
-        for idx, item in enumerate(self.checklist_items):
-            status = self.item_statuses.get(idx, "incomplete")
+        if self.checklist_file is not None:
+            items = (ChecklistItem.from_dict(data) for data in self.checklist_file.items())
+        else:
+            items = self.checklist_items
+        for idx, item in enumerate(items):
+            status = self.run.status(idx)
             status_str = "✓ COMPLETE" if status == "complete" else ("⊘ SKIPPED" if status == "skipped" else "○ INCOMPLETE")
 
-            report_lines.append(f"[{status_str}] {item['name']}")
-            report_lines.append(f"  Description: {item['description']}")
+            report_lines.append(f"[{status_str}] {item.name}")
+            report_lines.append(f"  Description: {item.description}")
             report_lines.append("")
 
             if status == "complete":
@@ -460,6 +688,13 @@ class RunChecklistWindow(QMainWindow):
         msg_box.setStyleSheet(self._get_stylesheet())
         msg_box.exec()
 
+    def closeEvent(self, event):
+        """Write any queued progress before the window goes away."""
+        self.query_runner.cancel_all()
+        for writer in self.progress_writers.values():
+            writer.flush(wait=True)
+        super().closeEvent(event)
+
     def _get_button_stylesheet(self, color: str) -> str:
         """Return stylesheet for colored status buttons."""
         return f"""
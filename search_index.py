@@ -0,0 +1,588 @@
+"""On-disk inverted index for searching notes, checklists and cached READMEs offline.
+
+Usage: python search_index.py QUERY [--source notes|checklists|readmes] [--limit N]
+       python search_index.py --benchmark [--docs N] [--queries N]
+
+Every file is split into documents (a note, a checklist item, a README) whose words are
+kept as postings: term -> {document id: term frequency}. Queries require every word,
+each as a prefix like the notes FULLTEXT search, and rank hits with BM25.
+
+The index is a snapshot plus an append-only journal of per-file changes, so updating one
+file appends one line instead of rewriting the index; the journal is folded into a new
+snapshot once it grows past SEARCH_CONFIG['compact_after'] records. As in ChecklistCatalog,
+a file is re-read only when its mtime or size changed. The index is derived from the files,
+so a lost or damaged index is simply rebuilt by refresh().
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+
+from checklist_catalog import CATALOG_FILENAME
+from checklist_loader import StreamingChecklist
+from note_journal import JOURNAL_FILENAME, replay
+
+NOTES = "notes"
+CHECKLISTS = "checklists"
+READMES = "readmes"
+
+# Where each source's files live: user_notes/<username>/notes.jsonl, checklists/*.json and
+# readme_cache/<team id>/<username>.txt
+SOURCE_DIRS = {
+    NOTES: Path("user_notes"),
+    CHECKLISTS: Path("checklists"),
+    READMES: Path("readme_cache"),
+}
+
+INDEX_DIR = Path(".search_index")
+SNAPSHOT_FILENAME = "snapshot.json"
+INDEX_JOURNAL_FILENAME = "journal.jsonl"
+INDEX_VERSION = 1
+
+SEARCH_CONFIG = {
+    'default_limit': 20,           # Hits returned by search()
+    'compact_after': 2000,         # Journal records before the snapshot is rewritten
+    'max_prefix_expansions': 64,   # Index terms one query word may expand to
+    'bm25_k1': 1.2,
+    'bm25_b': 0.75,
+}
+
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 40
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase words of text, leaving out single characters and very long runs."""
+    return [
+        token for token in _TOKEN.findall(text.lower())
+        if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH
+    ]
+
+
+def _term_frequencies(text: str) -> tuple[dict[str, int], int]:
+    """Term -> count for a document's text, plus its length in tokens."""
+    frequencies = {}
+    tokens = tokenize(text)
+    for token in tokens:
+        frequencies[token] = frequencies.get(token, 0) + 1
+    return frequencies, len(tokens)
+
+
+@dataclass
+class SearchHit:
+    """One ranked match; key identifies the document and path the file it came from."""
+    source: str
+    key: str
+    path: Path
+    title: str
+    owner: object
+    score: float
+
+
+class SearchIndex:
+    """Inverted index over the files of each source, kept current incrementally.
+
+    Safe to use from worker threads. Only one process should write a given index
+    directory at a time.
+    """
+
+    def __init__(self, index_dir: Path = INDEX_DIR, source_dirs: dict[str, Path] | None = None):
+        self.index_dir = Path(index_dir)
+        self.source_dirs = {source: Path(path) for source, path in (source_dirs or SOURCE_DIRS).items()}
+        self.snapshot_path = self.index_dir / SNAPSHOT_FILENAME
+        self.journal_path = self.index_dir / INDEX_JOURNAL_FILENAME
+
+        self._lock = threading.RLock()
+        self.files = {}      # file key -> {"mtime_ns", "size", "docs": [document ids]}
+        self.documents = {}  # document id -> {"key", "source", "file", "title", "owner", "length", "terms"}
+        self.postings = {}   # term -> {document id: term frequency}
+        self._lengths = {}   # document id -> length in tokens, for BM25
+        self._total_length = 0
+        self._next_id = 0
+        self._vocabulary = None  # Sorted terms for prefix lookups, rebuilt after changes
+        self._journal_records = 0
+        self._load()
+
+    # Keeping the index current
+
+    def refresh(self, sources: list[str] | None = None) -> bool:
+        """Re-index changed files and drop deleted ones. Returns True if anything changed."""
+        changed = False
+        for source in sources or list(self.source_dirs):
+            seen = set()
+            for path in self._source_files(source):
+                file_key = self._file_key(source, path)
+                seen.add(file_key)
+                if self._update(source, file_key, path):
+                    changed = True
+            prefix = source + "/"
+            with self._lock:
+                removed = [key for key in self.files if key.startswith(prefix) and key not in seen]
+            for file_key in removed:
+                self._replace(file_key, None, [])
+                changed = True
+        return changed
+
+    def update_file(self, path: Path) -> bool:
+        """Re-index one file (e.g. on a watcher event) if it changed. Returns True if it did."""
+        located = self._locate(path)
+        if located is None:
+            return False
+        source, file_key = located
+        return self._update(source, file_key, Path(path))
+
+    def remove_file(self, path: Path) -> bool:
+        """Drop a deleted file's documents. Returns True if it was indexed."""
+        located = self._locate(path)
+        if located is None:
+            return False
+        with self._lock:
+            if located[1] not in self.files:
+                return False
+        self._replace(located[1], None, [])
+        return True
+
+    def _update(self, source: str, file_key: str, path: Path) -> bool:
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return self.remove_file(path)
+
+        with self._lock:
+            entry = self.files.get(file_key)
+        if entry and entry["mtime_ns"] == stat_result.st_mtime_ns and entry["size"] == stat_result.st_size:
+            return False
+
+        try:
+            documents = self._read_documents(source, file_key, path)
+        except Exception:
+            documents = []  # Unreadable or half-written; indexed again when it next changes
+        self._replace(file_key, (stat_result.st_mtime_ns, stat_result.st_size), documents)
+        return True
+
+    def _replace(self, file_key: str, signature: tuple[int, int] | None, documents: list[dict],
+                 log: bool = True):
+        """Swap a file's documents for new ones (none and no signature removes the file)."""
+        with self._lock:
+            for doc_id in self.files.pop(file_key, {}).get("docs", []):
+                self._remove_document(doc_id)
+            if signature is not None:
+                self.files[file_key] = {
+                    "mtime_ns": signature[0],
+                    "size": signature[1],
+                    "docs": [self._add_document(file_key, document) for document in documents],
+                }
+            self._vocabulary = None
+
+            if log:
+                self._append_journal({"file": file_key, "signature": signature, "docs": documents})
+
+    def _add_document(self, file_key: str, document: dict) -> str:
+        # Short string ids keep postings small and are valid JSON object keys as they are
+        doc_id = str(self._next_id)
+        self._next_id += 1
+        self.documents[doc_id] = {
+            "key": document["key"],
+            "source": document["source"],
+            "file": file_key,
+            "title": document["title"],
+            "owner": document.get("owner"),
+            "length": document["length"],
+            # Only needed to remove the document again, so kept as one string rather than a dict
+            "terms": " ".join(document["terms"]),
+        }
+        self._lengths[doc_id] = document["length"]
+        self._total_length += document["length"]
+        for term, frequency in document["terms"].items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+        return doc_id
+
+    def _remove_document(self, doc_id: str):
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return
+        del self._lengths[doc_id]
+        self._total_length -= document["length"]
+        for term in document["terms"].split():
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+
+    # Reading source files
+
+    def _source_files(self, source: str) -> list[Path]:
+        """Files currently on disk for a source."""
+        directory = self.source_dirs[source]
+        if not directory.exists():
+            return []
+        if source == NOTES:
+            return sorted(directory.glob(f"*/{JOURNAL_FILENAME}"))
+        if source == CHECKLISTS:
+            return sorted(p for p in directory.glob("*.json") if p.name != CATALOG_FILENAME)
+        return sorted(directory.glob("*/*.txt"))
+
+    def _locate(self, path: Path) -> tuple[str, str] | None:
+        """(source, file key) for a path inside one of the source directories."""
+        path = Path(path)
+        for source, directory in self.source_dirs.items():
+            try:
+                relative = path.absolute().relative_to(directory.absolute())
+            except ValueError:
+                continue
+            if source == CHECKLISTS and path.name == CATALOG_FILENAME:
+                return None
+            if source == NOTES and path.name != JOURNAL_FILENAME:
+                return None
+            expected = (1, ".json") if source == CHECKLISTS else (2, ".jsonl" if source == NOTES else ".txt")
+            if (len(relative.parts), path.suffix) != expected:
+                return None
+            return source, self._file_key(source, path)
+        return None
+
+    def _file_key(self, source: str, path: Path) -> str:
+        relative = Path(path).absolute().relative_to(self.source_dirs[source].absolute())
+        return f"{source}/{relative.as_posix()}"
+
+    def _read_documents(self, source: str, file_key: str, path: Path) -> list[dict]:
+        """Split a file into documents: one per note, checklist item or README."""
+        if source == NOTES:
+            notes, _, _ = replay(path)
+            return [
+                _document(NOTES, f"{file_key}#{note_id}", note["title"], path.parent.name,
+                          f"{note['title']}\n{note['content']}")
+                for note_id, note in notes.items()
+            ]
+
+        if source == CHECKLISTS:
+            # Items are read one at a time, so large imported checklists are never held whole
+            checklist = StreamingChecklist(path)
+            documents = []
+            for position, item in enumerate(checklist.items()):
+                name = item.get("name") or f"Item {position + 1}"
+                text = "\n".join(str(item.get(field) or "") for field in ("name", "description", "how_to"))
+                documents.append(_document(
+                    CHECKLISTS, f"{file_key}#{position}", f"{checklist.name}: {name}", checklist.team_id,
+                    f"{checklist.name}\n{text}",
+                ))
+            return documents
+
+        with open(path, "r", errors="replace") as f:
+            content = f.read()
+        team = path.parent.name
+        return [_document(READMES, file_key, f"{path.stem}'s README", int(team) if team.isdigit() else team, content)]
+
+    # Searching
+
+    def search(self, text: str, limit: int = SEARCH_CONFIG['default_limit'],
+               sources: list[str] | None = None, owner=None) -> list[SearchHit]:
+        """Documents containing every word of text (as a prefix), best BM25 score first.
+
+        sources restricts the hit to some sources; owner to one user's notes or one team's
+        checklists and READMEs.
+        """
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms:
+            return []
+
+        with self._lock:
+            if not self.documents:
+                return []
+            k1, b = SEARCH_CONFIG['bm25_k1'], SEARCH_CONFIG['bm25_b']
+            count = len(self.documents)
+            average_length = max(self._total_length / count, 1.0)
+            lengths = self._lengths
+
+            expansions = [self._expand(term) for term in terms]
+            if not all(expansions):
+                return []
+            # Start from the rarest word so later words only check surviving candidates
+            expansions.sort(key=lambda words: sum(len(self.postings[word]) for word in words))
+
+            def idf(word):
+                frequency = len(self.postings[word])
+                return math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+
+            scores = {}
+            for word in expansions[0]:
+                word_idf = idf(word)
+                for doc_id, frequency in self.postings[word].items():
+                    score = word_idf * frequency * (k1 + 1) / (
+                        frequency + k1 * (1 - b + b * lengths[doc_id] / average_length))
+                    if score > scores.get(doc_id, 0.0):
+                        scores[doc_id] = score
+
+            if sources is not None or owner is not None:
+                wanted = set(sources) if sources is not None else None
+                documents = self.documents
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if (wanted is None or documents[doc_id]["source"] in wanted)
+                    and (owner is None or documents[doc_id]["owner"] == owner)
+                }
+
+            for words in expansions[1:]:
+                weighted = [(self.postings[word], idf(word)) for word in words]
+                narrowed = {}
+                for doc_id, score in scores.items():
+                    best = 0.0
+                    for postings, word_idf in weighted:
+                        frequency = postings.get(doc_id)
+                        if frequency:
+                            best = max(best, word_idf * frequency * (k1 + 1) / (
+                                frequency + k1 * (1 - b + b * lengths[doc_id] / average_length)))
+                    if best:
+                        narrowed[doc_id] = score + best
+                scores = narrowed
+                if not scores:
+                    return []
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda pair: pair[1])
+            hits = []
+            for doc_id, score in top:
+                document = self.documents[doc_id]
+                source = document["source"]
+                path = self.source_dirs[source] / document["file"].split("/", 1)[1]
+                hits.append(SearchHit(source, document["key"], path, document["title"], document["owner"], score))
+            return hits
+
+    def _expand(self, prefix: str) -> list[str]:
+        """Index terms starting with prefix: the exact term first, then others in order."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        limit = SEARCH_CONFIG['max_prefix_expansions']
+        words = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and len(words) < limit and vocabulary[position].startswith(prefix):
+            words.append(vocabulary[position])
+            position += 1
+        return words
+
+    # Persistence
+
+    def _load(self):
+        """Read the snapshot and replay the journal on top of it."""
+        try:
+            with open(self.snapshot_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                # Postings are stored as they are held, so loading is one JSON decode
+                self.files = data["files"]
+                self.documents = data["documents"]
+                self.postings = data["postings"]
+                self._next_id = data["next_id"]
+                self._lengths = {doc_id: document["length"] for doc_id, document in self.documents.items()}
+                self._total_length = sum(self._lengths.values())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Search index snapshot unreadable, rebuilding: {e}")
+            self._clear()
+
+        try:
+            with open(self.journal_path, "rb+") as f:
+                intact = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A write cut short by a crash; cut it off so later appends stay readable
+                        f.truncate(intact)
+                        break
+                    signature = tuple(record["signature"]) if record["signature"] else None
+                    self._replace(record["file"], signature, record["docs"], log=False)
+                    self._journal_records += 1
+                    intact += len(line)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Search index journal unreadable: {e}")
+
+    def _clear(self):
+        self.files, self.documents, self.postings, self._lengths = {}, {}, {}, {}
+        self._total_length = 0
+        self._next_id = 0
+        self._vocabulary = None
+
+    def _append_journal(self, record: dict):
+        """Record one file's change; compacts into a new snapshot once the journal is long."""
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, "a") as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._journal_records += 1
+            if self._journal_records >= SEARCH_CONFIG['compact_after']:
+                self.compact()
+        except OSError as e:
+            print(f"Could not update search index: {e}")
+
+    def compact(self):
+        """Write the whole index as a new snapshot and start an empty journal."""
+        with self._lock:
+            data = {
+                "version": INDEX_VERSION,
+                "next_id": self._next_id,
+                "files": self.files,
+                "documents": self.documents,
+                "postings": self.postings,
+            }
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            try:
+                self.index_dir.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.snapshot_path)
+                # Replaying a journal already in the snapshot is harmless, so a crash here loses nothing
+                open(self.journal_path, "w").close()
+                self._journal_records = 0
+            except OSError as e:
+                print(f"Could not save search index: {e}")
+
+
+def _document(source: str, key: str, title: str, owner, text: str) -> dict:
+    terms, length = _term_frequencies(text)
+    return {"key": key, "source": source, "title": title, "owner": owner, "length": length, "terms": terms}
+
+
+def get_search_index() -> SearchIndex:
+    """Return the process-wide search index, creating it on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex()
+    return _index
+
+
+def search(text: str, limit: int = SEARCH_CONFIG['default_limit'], sources: list[str] | None = None,
+           owner=None) -> list[SearchHit]:
+    """Search notes, checklists and cached READMEs through the process-wide index"""
+    return get_search_index().search(text, limit, sources, owner)
+
+
+def benchmark(doc_count: int = 100000, query_count: int = 200, seed: int = 7) -> dict:
+    """Time building, persisting, reloading and querying an index of synthetic notes."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 10)))
+        for _ in range(20000)
+    ]
+    # Zipf-like word frequencies, as in real text
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        index = SearchIndex(root / "index", {NOTES: root / "notes"})
+
+        start = time.perf_counter()
+        with index._lock:
+            for number in range(doc_count):
+                words = rng.choices(vocabulary, cum_weights=weights, k=rng.randint(20, 120))
+                file_key = f"{NOTES}/user{number % 50}/note{number}.json"
+                document = _document(NOTES, file_key, " ".join(words[:4]), f"user{number % 50}", " ".join(words))
+                index._replace(file_key, (number, len(words)), [document], log=False)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.compact()
+        save_seconds = time.perf_counter() - start
+        snapshot_bytes = index.snapshot_path.stat().st_size
+
+        start = time.perf_counter()
+        index = SearchIndex(root / "index", {NOTES: root / "notes"})
+        load_seconds = time.perf_counter() - start
+
+        # Single-file updates append to the journal instead of rewriting the snapshot
+        start = time.perf_counter()
+        for number in range(100):
+            file_key = f"{NOTES}/user0/note{number}.json"
+            document = _document(NOTES, file_key, "edited", "user0", " ".join(rng.choices(vocabulary, cum_weights=weights, k=50)))
+            index._replace(file_key, (number, 1), [document])
+        update_ms = (time.perf_counter() - start) * 1000 / 100
+
+        queries = []
+        for _ in range(query_count):
+            words = rng.choices(vocabulary, cum_weights=weights, k=rng.randint(1, 3))
+            # Some queries are typed-ahead prefixes rather than whole words
+            queries.append(" ".join(word[:rng.randint(3, len(word))] for word in words))
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+
+    return {
+        'documents': doc_count,
+        'terms': len(index.postings),
+        'build_seconds': build_seconds,
+        'save_seconds': save_seconds,
+        'snapshot_mb': snapshot_bytes / 1_000_000,
+        'load_seconds': load_seconds,
+        'update_ms': update_ms,
+        'query_p50_ms': latencies[len(latencies) // 2],
+        'query_p95_ms': latencies[int(len(latencies) * 0.95)],
+        'query_max_ms': latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search notes, checklists and cached READMEs offline.")
+    parser.add_argument("query", nargs="*", help="words to search for")
+    parser.add_argument("--source", choices=[NOTES, CHECKLISTS, READMES], action="append",
+                        help="only search this source (repeatable)")
+    parser.add_argument("--limit", type=int, default=SEARCH_CONFIG['default_limit'], help="maximum hits")
+    parser.add_argument("--benchmark", action="store_true", help="time the index on synthetic documents")
+    parser.add_argument("--docs", type=int, default=100000, help="documents for --benchmark")
+    parser.add_argument("--queries", type=int, default=200, help="queries for --benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        result = benchmark(args.docs, args.queries)
+        print(f"{result['documents']} documents, {result['terms']} distinct terms")
+        print(f"Build: {result['build_seconds']:.1f}s, snapshot: {result['save_seconds']:.1f}s "
+              f"({result['snapshot_mb']:.0f} MB), reload: {result['load_seconds']:.1f}s")
+        print(f"Single-file update: {result['update_ms']:.2f} ms")
+        print(f"Query latency: p50 {result['query_p50_ms']:.2f} ms, p95 {result['query_p95_ms']:.2f} ms, "
+              f"max {result['query_max_ms']:.2f} ms")
+        return
+
+    if not args.query:
+        parser.error("a query is required unless --benchmark is given")
+
+    index = get_search_index()
+    start = time.perf_counter()
+    index.refresh()
+    refreshed = time.perf_counter() - start
+    hits = index.search(" ".join(args.query), args.limit, args.source)
+    if not hits:
+        print("No matches.")
+        sys.exit(1)
+    for hit in hits:
+        print(f"{hit.score:6.2f}  [{hit.source}] {hit.title}  ({hit.path})")
+    print(f"{len(hits)} hit(s); index refreshed in {refreshed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Shared table model for CyberPatriot Runbook data views
+Rows are stored column-by-column and only formatted when a view asks for a visible cell
+"""
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+
+class RowTableModel(QAbstractTableModel):
+    """Read-only table model backed by column-oriented row buffers"""
+
+    # Role that exposes the raw (unformatted) value, used for sorting
+    RawValueRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, headers: list[str], parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._columns = [[] for _ in self._headers]
+        self._row_count = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """Number of buffered rows"""
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        """Number of columns"""
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Return display text or the raw value for a single cell"""
+        if not index.isValid():
+            return None
+        value = self._columns[index.column()][index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(value)
+        if role == self.RawValueRole:
+            return value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """Return column headers"""
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal and 0 <= section < len(self._headers):
+            return self._headers[section]
+        if orientation == Qt.Orientation.Vertical:
+            return section + 1
+        return None
+
+    def set_rows(self, rows):
+        """Replace the model contents with a sequence of row tuples"""
+        self.beginResetModel()
+        self._columns = self._to_columns(rows)
+        self._row_count = len(self._columns[0]) if self._columns else 0
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Append row tuples to the end of the model"""
+        self.insert_rows(self._row_count, rows)
+
+    def insert_rows(self, position: int, rows):
+        """Insert row tuples before the row at position"""
+        new_columns = self._to_columns(rows)
+        count = len(new_columns[0]) if new_columns else 0
+        if not count:
+            return
+        self.beginInsertRows(QModelIndex(), position, position + count - 1)
+        for column, values in zip(self._columns, new_columns):
+            column[position:position] = values
+        self._row_count += count
+        self.endInsertRows()
+
+    def merge_rows(self, rows, key_column: int = 0, at_top: bool = False):
+        """Overwrite rows whose key is already present and insert the rest at the top or bottom"""
+        positions = {key: row for row, key in enumerate(self._columns[key_column])}
+        new_rows = []
+        for values in rows:
+            row = positions.get(values[key_column])
+            if row is None:
+                new_rows.append(values)
+                continue
+            for column, value in zip(self._columns, values):
+                column[row] = value
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._headers) - 1))
+        self.insert_rows(0 if at_top else self._row_count, new_rows)
+
+    def rows_where(self, column: int, values) -> list[int]:
+        """Return the indexes of rows whose value in column is one of values"""
+        values = set(values)
+        return [row for row, value in enumerate(self._columns[column]) if value in values]
+
+    def update_rows(self, rows: list[int], column: int, value):
+        """Set one column of several rows to value, signalling a single changed range"""
+        if not rows:
+            return
+        for row in rows:
+            self._columns[column][row] = value
+        self.dataChanged.emit(self.index(min(rows), column), self.index(max(rows), column))
+
+    def remove_rows(self, rows: list[int]):
+        """Remove rows by index, one contiguous block at a time from the bottom up"""
+        rows = sorted(set(rows), reverse=True)
+        i = 0
+        while i < len(rows):
+            last = first = rows[i]
+            i += 1
+            while i < len(rows) and rows[i] == first - 1:
+                first = rows[i]
+                i += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for column in self._columns:
+                del column[first:last + 1]
+            self._row_count -= last - first + 1
+            self.endRemoveRows()
+
+    def row_values(self, row: int) -> tuple:
+        """Return the raw values of one row"""
+        return tuple(column[row] for column in self._columns)
+
+    def value(self, row: int, column: int):
+        """Return the raw value of one cell"""
+        return self._columns[column][row]
+
+    def _to_columns(self, rows) -> list[list]:
+        """Transpose row tuples into one list per column"""
+        rows = list(rows)
+        if not rows:
+            return [[] for _ in self._headers]
+        return [list(values) for values in zip(*rows)]
+
+
+def create_proxy_model(source: RowTableModel, parent=None) -> QSortFilterProxyModel:
+    """Wrap a RowTableModel in a proxy that sorts on raw values and filters on any column"""
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(source)
+    proxy.setSortRole(RowTableModel.RawValueRole)
+    proxy.setFilterKeyColumn(-1)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
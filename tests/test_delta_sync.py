@@ -0,0 +1,41 @@
+"""Choosing between a delta fetch and a full reload"""
+from datetime import datetime
+
+from delta_sync import DeltaSync
+
+LOADED = datetime(2024, 1, 1, 12, 0)
+CHANGED = datetime(2024, 1, 1, 12, 5)
+
+
+def synced(count, max_id):
+    sync = DeltaSync({"team_members": "team_members"})
+    sync.record("team_members", (("team_members", count, LOADED, max_id), ("users", 3, LOADED, 3)))
+    return sync
+
+
+def fingerprint(count, max_id):
+    return ("team_members", count, CHANGED, max_id), ("users", 3, LOADED, 3)
+
+
+def test_insert_is_merged():
+    sync = synced(5, 10)
+    action, _ = sync.plan("team_members", fingerprint(6, 11))
+    assert action == DeltaSync.DELTA
+    assert sync.accepts("team_members", fingerprint(6, 11), [(11, "new", 1)])
+
+
+def test_edit_is_merged():
+    sync = synced(5, 10)
+    assert sync.accepts("team_members", fingerprint(5, 10), [(4, "edited", 1)])
+
+
+def test_delete_hidden_by_insert_reloads():
+    sync = synced(5, 10)
+    action, _ = sync.plan("team_members", fingerprint(5, 11))
+    assert action == DeltaSync.DELTA  # Count alone cannot tell
+    assert not sync.accepts("team_members", fingerprint(5, 11), [(11, "new", 1)])
+
+
+def test_delete_reloads():
+    action, _ = synced(5, 10).plan("team_members", fingerprint(4, 10))
+    assert action == DeltaSync.RELOAD
@@ -0,0 +1,92 @@
+"""Keyset pager queries run against an in-memory SQLite copy of the listing tables"""
+import sqlite3
+
+import pytest
+
+from delta_sync import split_changes
+from paging import KeysetPager, ListingRepository, like_pattern
+
+SCHEMA = """
+CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, username TEXT);
+CREATE TABLE teams (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE roles (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE team_members (
+    id INTEGER PRIMARY KEY, team_id INTEGER, user_id INTEGER, role_id INTEGER,
+    status TEXT, created_at TEXT, updated_at TEXT
+);
+"""
+
+LOADED_AT = "2024-01-01 00:00:00"
+SYNCED_AT = "2024-01-01 00:01:00"
+CHANGED_AT = "2024-01-01 00:05:00"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(SCHEMA)
+    connection.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                           [(i, f"User {i}", f"user{i}") for i in range(1, 5)])
+    connection.executemany("INSERT INTO teams VALUES (?, ?)", [(1, "Alpha"), (2, "Bravo")])
+    connection.execute("INSERT INTO roles VALUES (1, 'Member')")
+    # Odd members are in team 1 and even members in team 2, so the first page of two ends at (1, 3)
+    connection.executemany(
+        "INSERT INTO team_members VALUES (?, ?, ?, 1, 'approved', ?, ?)",
+        [(i, 2 - i % 2, i, LOADED_AT, LOADED_AT) for i in range(1, 5)],
+    )
+
+    def run(sql, params):
+        return connection.execute(sql.replace("%s", "?"), params).fetchall()
+
+    monkeypatch.setattr(KeysetPager, "_run", staticmethod(run))
+    return connection
+
+
+def reassign(connection, member_id, team_id):
+    connection.execute("UPDATE team_members SET team_id = ?, updated_at = ? WHERE id = ?",
+                       (team_id, CHANGED_AT, member_id))
+
+
+def test_first_page_stops_at_page_boundary(db):
+    pager = ListingRepository.team_members_pager(page_size=2)
+    assert [row[0] for row in pager.fetch_next()] == [1, 3]
+    assert pager.has_more
+
+
+def test_member_moved_past_loaded_pages_is_dropped(db):
+    pager = ListingRepository.team_members_pager(page_size=2)
+    pager.fetch_next()
+
+    reassign(db, 1, 2)
+    upserts, removed = split_changes(pager.fetch_changed(SYNCED_AT))
+
+    assert upserts == []
+    assert removed == [1]
+    assert [row[0] for row in pager.fetch_next()] == [1, 2]  # Back at its new place in team 2
+
+
+def test_member_moved_into_loaded_pages_is_merged(db):
+    pager = ListingRepository.team_members_pager(page_size=2)
+    pager.fetch_next()
+
+    reassign(db, 2, 1)
+    upserts, removed = split_changes(pager.fetch_changed(SYNCED_AT))
+
+    assert [(row[0], row[3]) for row in upserts] == [(2, "Alpha")]
+    assert removed == []
+
+
+def test_all_rows_belong_once_every_page_is_loaded(db):
+    pager = ListingRepository.team_members_pager(page_size=10)
+    pager.fetch_next()
+    assert not pager.has_more
+
+    reassign(db, 1, 2)
+    upserts, removed = split_changes(pager.fetch_changed(SYNCED_AT))
+
+    assert [(row[0], row[3]) for row in upserts] == [(1, "Bravo")]
+    assert removed == []
+
+
+def test_like_pattern_escapes_wildcards():
+    assert like_pattern("50%_off\\") == "%50\\%\\_off\\\\%"
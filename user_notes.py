@@ -1,9 +1,7 @@
 """Script for user-specific notes management."""
 
 import sys
-import json
 from pathlib import Path
-from datetime import datetime
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -20,10 +18,20 @@ from PySide6.QtWidgets import (
     QDialog,
     QFormLayout,
     QComboBox,
+    QCheckBox,
+    QInputDialog,
 )
-from PySide6.QtCore import Qt, QSize, QDateTime
+from PySide6.QtCore import Qt, QSize, QDateTime, QTimer
 from PySide6.QtGui import QFont, QColor
 
+from async_query import AsyncQueryRunner
+from auth import PasswordManager
+from file_watcher import DirectoryWatcher, REMOVED
+from notes_repository import NotesRepository, SEARCH_LIMIT
+from note_crypto import get_note_key_cache, encrypt_content, decrypt_content
+from note_journal import NoteJournal, JOURNAL_CONFIG, new_note_id
+from search_index import get_search_index, tokenize, NOTES
+
 
 class NotesWindow(QMainWindow):
     """Main window for user-specific notes."""
@@ -35,9 +43,21 @@ class NotesWindow(QMainWindow):
         self.setStyleSheet(self._get_stylesheet())
         self.notes_dir = Path("user_notes")
         self.notes_dir.mkdir(exist_ok=True)
+        self.watcher = DirectoryWatcher(self.notes_dir, suffix=".jsonl", include_subdirs=True, parent=self)
+        self.watcher.files_changed.connect(self._on_note_files_changed)
+        self.journals = {}  # username -> NoteJournal, opened when first needed
+        self.imported_users = set()  # Users whose journalled notes were copied into the database this session
         self.current_user = None
-        self.current_notes = {}
-        self.users = self._load_users()
+        self.current_user_id = None
+        self.current_notes = {}  # note id -> note data; database notes have int ids, journalled notes str ids
+        self.current_note_id = None
+        self.editor_dirty = False  # Edits not yet saved or autosaved
+        self.notes_pager = None
+        self.offline = False  # True while notes come from files because the database is unreachable
+        self.search_text = ""
+        self.key_cache = get_note_key_cache()
+        self.users = {}
+        self.query_runner = AsyncQueryRunner(self)
         self._init_ui()
 
     def _load_users(self):
@@ -94,8 +114,21 @@ class NotesWindow(QMainWindow):
         notes_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
         left_panel.addWidget(notes_label)
 
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search notes...")
+        self.search_input.textChanged.connect(self._on_search_changed)
+        left_panel.addWidget(self.search_input)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self._run_search)
+
         self.notes_list = QListWidget()
         self.notes_list.itemClicked.connect(self._on_note_clicked)
+        scroll_bar = self.notes_list.verticalScrollBar()
+        scroll_bar.valueChanged.connect(
+            lambda value: self._load_more_notes() if value >= scroll_bar.maximum() - 5 else None
+        )
         left_panel.addWidget(self.notes_list)
 
         # Right panel: Note content
@@ -112,6 +145,13 @@ class NotesWindow(QMainWindow):
         self.note_content.setPlaceholderText("Type your note here...")
         right_panel.addWidget(self.note_content)
 
+        self.note_title_input.textEdited.connect(self._on_editor_edited)
+        self.note_content.textChanged.connect(self._on_editor_edited)
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setInterval(JOURNAL_CONFIG['autosave_seconds'] * 1000)
+        self.autosave_timer.timeout.connect(self._autosave)
+        self.autosave_timer.start()
+
         # Action buttons
         button_layout = QHBoxLayout()
         new_btn = QPushButton("New Note")
@@ -120,9 +160,12 @@ class NotesWindow(QMainWindow):
         save_btn.clicked.connect(self._save_note)
         delete_btn = QPushButton("Delete Note")
         delete_btn.clicked.connect(self._delete_note)
+        self.encrypt_check = QCheckBox("Encrypt")
+        self.encrypt_check.setToolTip("Store the note's content encrypted with your password")
         button_layout.addWidget(new_btn)
         button_layout.addWidget(save_btn)
         button_layout.addWidget(delete_btn)
+        button_layout.addWidget(self.encrypt_check)
         button_layout.addStretch()
         right_panel.addLayout(button_layout)
 
@@ -148,6 +191,17 @@ class NotesWindow(QMainWindow):
         main_layout.addLayout(bottom_button_layout)
 
         central_widget.setLayout(main_layout)
+        self._request_users()
+
+    def _request_users(self):
+        """Load users in the background and fill the user combo when they arrive."""
+        self.user_combo.setEnabled(False)
+        self.query_runner.submit("users", self._load_users, on_result=self._on_users_loaded)
+
+    def _on_users_loaded(self, users):
+        """Apply the loaded users to the user combo."""
+        self.users = users
+        self.user_combo.setEnabled(True)
         self._load_users_combo()
 
     def _load_users_combo(self):
@@ -165,49 +219,352 @@ class NotesWindow(QMainWindow):
             self.note_title_input.clear()
             self.note_content.setPlainText("")
             return
-        
+
+        self._autosave()  # Keep the previous user's unsaved edits
         self.current_user = username
+        self.current_user_id = self.users.get(username)
+        self._clear_editor()
         self._load_notes()
 
     def _load_notes(self):
-        """Load notes for the selected user."""
+        """Load the first page of the selected user's notes, or search hits if a search is active."""
         if not self.current_user:
             return
 
+        if self.search_text:
+            self._run_search()
+            return
+
         self.notes_list.clear()
-        user_notes_dir = self.notes_dir / self.current_user
-        if not user_notes_dir.exists():
-            user_notes_dir.mkdir(parents=True, exist_ok=True)
+        self.current_notes = {}
+        if self.current_user_id is None:
+            self._load_local_notes()
+            return
+
+        if self.current_user not in self.imported_users:
+            # Notes saved while offline (or by older versions) move into the database first
+            username = self.current_user
+            self.query_runner.submit(
+                "notes", self._import_local_notes, self.current_user_id, self._journal(),
+                on_result=lambda imported: self._on_local_notes_imported(username, imported),
+                on_error=self._on_query_failed,
+            )
             return
 
-        notes_files = list(user_notes_dir.glob("*.json"))
+        self.notes_pager = NotesRepository.notes_pager(self.current_user_id)
+        self.query_runner.submit(
+            "notes", self.notes_pager.fetch_next,
+            on_result=self._on_notes_loaded, on_error=self._on_query_failed,
+        )
+
+    @staticmethod
+    def _import_local_notes(user_id, journal):
+        """Copy a user's journalled notes into the database, then delete them from the journal.
+
+        Returns the number imported, or None if the database is unreachable.
+        """
+        journal.refresh()
+        if not journal.notes:
+            return 0
+        result = NotesRepository.import_notes(user_id, journal.notes)
+        if result is None:
+            return None
+        imported, present = result
+        for note_id in imported + present:
+            journal.delete(note_id)  # Recorded as imported; the database copy is now the note
+        get_search_index().update_file(journal.path)
+        return len(imported)
+
+    def _on_local_notes_imported(self, username, imported):
+        """List the user's database notes once their local notes have been imported."""
+        if imported is None:
+            self._load_local_notes()  # Database unreachable; keep working from the journal
+            return
+        self.imported_users.add(username)
+        if imported:
+            print(f"Imported {imported} locally saved note(s) for {username} into the database")
+        if username == self.current_user:
+            self._load_notes()
+
+    def _load_more_notes(self):
+        """Append the next page of notes when the list is scrolled near its end."""
+        if (self.offline or self.search_text or self.notes_pager is None or not self.notes_pager.has_more
+                or self.query_runner.is_loading("notes")):
+            return
+        self.query_runner.submit(
+            "notes", self.notes_pager.fetch_next,
+            on_result=self._on_notes_loaded, on_error=self._on_query_failed,
+        )
+
+    def _on_notes_loaded(self, rows):
+        """Add a page of (id, title, created_at, updated_at, is_encrypted) rows to the list."""
+        if rows is None:
+            self._load_local_notes()  # Database unreachable; fall back to notes saved on disk
+            return
+
+        self.offline = False
+        for note_id, title, created_at, updated_at, is_encrypted in rows:
+            note_data = {
+                "title": title,
+                "content": None,  # Loaded (and decrypted) when the note is opened
+                "created": self._format_time(created_at),
+                "modified": self._format_time(updated_at),
+                "encrypted": bool(is_encrypted),
+            }
+            self.current_notes[note_id] = note_data
+            self._add_note_item(note_id, note_data)
+
+    def _load_local_notes(self):
+        """List the selected user's journalled notes, newest first (used while the database is unreachable)."""
+        self.offline = True
+        self.notes_list.clear()
+        journal = self._journal()
+        journal.refresh()
         self.current_notes = {}
 
-        for note_file in sorted(notes_files):
-            try:
-                with open(note_file, "r") as f:
-                    note_data = json.load(f)
-                
-                note_id = note_file.stem
-                self.current_notes[note_id] = note_data
-                
-                title = note_data.get("title", "Untitled")
-                timestamp = note_data.get("created", "Unknown date")
-                
-                display_text = f"{title} ({timestamp})"
-                list_item = QListWidgetItem(display_text)
-                list_item.setData(Qt.ItemDataRole.UserRole, note_id)
-                self.notes_list.addItem(list_item)
-            except Exception:
-                pass
+        for note_id, note in sorted(journal.notes.items(), key=lambda item: item[1]["modified"], reverse=True):
+            note_data = dict(note)
+            self.current_notes[note_id] = note_data
+            self._add_note_item(note_id, note_data)
+
+    def _journal(self):
+        """The selected user's note journal, recovered from disk the first time it is used."""
+        journal = self.journals.get(self.current_user)
+        if journal is None:
+            journal = self.journals[self.current_user] = NoteJournal(self.notes_dir / self.current_user)
+        return journal
+
+    def _format_time(self, value):
+        """Format a database timestamp like the timestamps stored in note files."""
+        return value.strftime("%Y-%m-%d %H:%M") if value else "Unknown date"
+
+    def _note_display_text(self, note_data):
+        """Return the list label for a note."""
+        title = note_data.get("title", "Untitled")
+        timestamp = note_data.get("created", "Unknown date")
+        if note_data.get("encrypted"):
+            return f"{title} ({timestamp}) [encrypted]"
+        return f"{title} ({timestamp})"
+
+    def _add_note_item(self, note_id, note_data, row=None):
+        """Add a list item for a note at row (default: the end)."""
+        list_item = QListWidgetItem(self._note_display_text(note_data))
+        list_item.setData(Qt.ItemDataRole.UserRole, note_id)
+        if row is None:
+            self.notes_list.addItem(list_item)
+        else:
+            self.notes_list.insertItem(row, list_item)
+        return list_item
+
+    def _find_note_row(self, note_id):
+        """Return the list row showing a note, or -1."""
+        for row in range(self.notes_list.count()):
+            if self.notes_list.item(row).data(Qt.ItemDataRole.UserRole) == note_id:
+                return row
+        return -1
+
+    def _upsert_note_item(self, note_id, note_data):
+        """Update a note's list item in place, or add it at the top as the newest note."""
+        self.current_notes[note_id] = note_data
+        row = self._find_note_row(note_id)
+        if row >= 0:
+            self.notes_list.item(row).setText(self._note_display_text(note_data))
+            return
+        self._add_note_item(note_id, note_data, 0)
+
+    def _remove_note_item(self, note_id):
+        """Remove a note from the list and cache."""
+        self.current_notes.pop(note_id, None)
+        row = self._find_note_row(note_id)
+        if row >= 0:
+            self.notes_list.takeItem(row)
+
+    def _on_note_files_changed(self, events):
+        """Re-index changed journals, and re-list the selected user's notes if another process saved some."""
+        index = get_search_index()
+        for event, path in events:
+            if event == REMOVED:
+                index.remove_file(path)
+            else:
+                index.update_file(path)
+
+        if not self.current_user or not self.offline or self.search_text:
+            return  # Files only back the list while the database is unreachable
+
+        journal = self._journal()
+        # Our own saves are already applied, so refresh() only finds records written elsewhere
+        if any(path == journal.path for _, path in events) and journal.refresh():
+            self._load_local_notes()
+
+    def _on_search_changed(self, _text):
+        """Restart the search delay while the user is typing."""
+        self.search_timer.start()
+
+    def _run_search(self):
+        """Show the notes matching the search box, best match first; an empty box restores the list."""
+        text = self.search_input.text().strip()
+        if not self.current_user:
+            return
+        if not text:
+            if self.search_text:
+                self.search_text = ""
+                self._load_notes()
+            return
+
+        self.search_text = text
+        if self.offline or self.current_user_id is None:
+            self._search_local_notes(text)
+            return
+        self.query_runner.submit(
+            "search", NotesRepository.search, self.current_user_id, text,
+            on_result=self._on_search_results, on_error=self._on_query_failed,
+        )
+
+    def _on_search_results(self, hits):
+        """List ranked search hits; note bodies are still loaded only when opened."""
+        if not self.search_text:
+            return  # The search box was cleared while the query ran
+        if hits is None:
+            self._load_local_notes()
+            self._search_local_notes(self.search_text)
+            return
+
+        self.notes_list.clear()
+        for hit in hits:
+            note_data = self.current_notes.get(hit["id"]) or {
+                "title": hit["title"],
+                "content": None,
+                "created": self._format_time(hit["created_at"]),
+                "modified": self._format_time(hit["updated_at"]),
+                "encrypted": bool(hit["is_encrypted"]),
+            }
+            self.current_notes[hit["id"]] = note_data
+            self._add_note_item(hit["id"], note_data)
+
+    def _search_local_notes(self, text):
+        """List the notes on disk matching the search, best match first, using the offline index."""
+        self.notes_list.clear()
+        if tokenize(text):
+            index = get_search_index()
+            index.refresh([NOTES])
+            for hit in index.search(text, SEARCH_LIMIT, [NOTES], owner=self.current_user):
+                note_id = hit.key.rsplit("#", 1)[1]
+                if note_id in self.current_notes:
+                    self._add_note_item(note_id, self.current_notes[note_id])
+            return
+
+        # Nothing indexable (single characters); fall back to a substring match
+        needle = text.lower()
+        for note_id, note_data in self.current_notes.items():
+            if needle in note_data.get("title", "").lower() or needle in (note_data.get("content") or "").lower():
+                self._add_note_item(note_id, note_data)
 
     def _on_note_clicked(self, item):
         """Handle note selection."""
         note_id = item.data(Qt.ItemDataRole.UserRole)
-        if note_id in self.current_notes:
-            note_data = self.current_notes[note_id]
-            self.note_title_input.setText(note_data.get("title", ""))
-            self.note_content.setPlainText(note_data.get("content", ""))
+        if note_id not in self.current_notes:
+            return
+        if note_id != self.current_note_id:
+            self._autosave()  # Keep unsaved edits to the note being left
+        self.current_note_id = note_id
+        note_data = self.current_notes[note_id]
+        if note_data.get("content") is None and note_data.get("ciphertext") is None:
+            self.query_runner.submit(
+                "note", NotesRepository.get_note, note_id, self.current_user_id,
+                on_result=self._on_note_loaded, on_error=self._on_query_failed,
+            )
+            return
+        self._show_note(note_id)
+
+    def _on_note_loaded(self, note):
+        """Cache an opened note's content and show it if it is still selected."""
+        if note is None:
+            QMessageBox.critical(self, "Error", "Could not load the note from the database.")
+            return
+        note_data = self.current_notes.setdefault(note["id"], {})
+        note_data.update({
+            "title": note["title"],
+            "content": None if note["is_encrypted"] else note["content"],
+            "created": self._format_time(note["created_at"]),
+            "modified": self._format_time(note["updated_at"]),
+            "encrypted": bool(note["is_encrypted"]),
+        })
+        if note["is_encrypted"]:
+            # Kept encrypted until shown; the plaintext only ever lives in memory
+            note_data["ciphertext"] = note["content"]
+            note_data["key_salt"] = note["encryption_key_salt"]
+        if self.current_note_id == note["id"]:
+            self._show_note(note["id"])
+
+    def _show_note(self, note_id):
+        """Show a cached note in the editor, decrypting it first if needed."""
+        note_data = self.current_notes[note_id]
+        if note_data.get("content") is None and note_data.get("ciphertext") is not None:
+            key = self.key_cache.key(self.current_user_id, note_data["key_salt"])
+            if key is None:
+                # Derive the key once; every other note under the same salt then opens at once
+                self._request_unlock(lambda: self._show_note(note_id) if self.current_note_id == note_id else None)
+                return
+            try:
+                note_data["content"] = decrypt_content(key, note_data["ciphertext"], self.current_user_id)
+            except ValueError as e:
+                QMessageBox.critical(self, "Error", f"Could not decrypt the note: {str(e)}")
+                return
+        self.note_title_input.setText(note_data.get("title", ""))
+        self.note_content.setPlainText(note_data.get("content") or "")
+        self.encrypt_check.setChecked(note_data.get("encrypted", False))
+        self.editor_dirty = False
+
+    def _request_unlock(self, then):
+        """Ask for the selected user's password, derive their note key and run then once unlocked."""
+        password, accepted = QInputDialog.getText(
+            self, "Unlock Encrypted Notes", f"Password for {self.current_user}:", QLineEdit.EchoMode.Password
+        )
+        if not accepted or not password:
+            return
+        self.query_runner.submit(
+            "unlock", self._unlock_notes, self.current_user_id, password,
+            on_result=lambda unlocked: self._on_unlocked(unlocked, then),
+            on_error=self._on_query_failed,
+        )
+
+    @staticmethod
+    def _unlock_notes(user_id, password):
+        """Check the password and cache the user's note keys on a worker thread.
+
+        Returns True once unlocked, False for a wrong password and None if the database is
+        unreachable. The password is checked first so a typo can never encrypt a note under
+        a key nobody can derive again.
+        """
+        material = NotesRepository.key_material(user_id)
+        if material is None:
+            return None
+        password_hash, key_salts = material
+        if not password_hash or not PasswordManager.verify_password(password, password_hash):
+            return False
+        get_note_key_cache().unlock(user_id, password, key_salts)
+        return True
+
+    def _on_unlocked(self, unlocked, then):
+        """Continue what needed the key, or report why the notes stay locked."""
+        if unlocked is None:
+            QMessageBox.critical(self, "Error", "Cannot connect to database")
+        elif not unlocked:
+            QMessageBox.warning(self, "Incorrect Password", "The password is incorrect.")
+        else:
+            then()
+
+    def _clear_editor(self):
+        """Empty the editor and forget the selected note."""
+        self.current_note_id = None
+        self.note_title_input.clear()
+        self.note_content.setPlainText("")
+        self.notes_list.setCurrentRow(-1)
+        self.editor_dirty = False
+
+    def _on_query_failed(self, message):
+        """Report a background notes query that raised."""
+        QMessageBox.critical(self, "Error", f"Notes operation failed: {message}")
 
     def _new_note(self):
         """Create a new note."""
@@ -215,9 +572,21 @@ class NotesWindow(QMainWindow):
             QMessageBox.warning(self, "No User", "Please select a user first.")
             return
 
-        self.note_title_input.clear()
-        self.note_content.setPlainText("")
-        self.notes_list.setCurrentRow(-1)
+        self._autosave()
+        self._clear_editor()
+
+    def _on_editor_edited(self, *_):
+        self.editor_dirty = True
+
+    def _autosave(self):
+        """Append unsaved edits to the journal while notes are kept locally."""
+        if (not self.editor_dirty or not self.offline or not self.current_user
+                or self.encrypt_check.isChecked()):
+            return  # Database notes are saved explicitly; encrypted ones never touch disk
+        title = self.note_title_input.text().strip()
+        if not title:
+            return  # Nothing to list it under yet
+        self._save_local_note(self.current_note_id, title, self.note_content.toPlainText().strip(), quiet=True)
 
     def _save_note(self):
         """Save the current note."""
@@ -236,28 +605,90 @@ class NotesWindow(QMainWindow):
             QMessageBox.warning(self, "Validation Error", "Note content cannot be empty.")
             return
 
-        # Create note ID based on title
-        note_id = title.lower().replace(" ", "_")[:20]
-        
+        encrypt = self.encrypt_check.isChecked()
+        if self.offline or self.current_user_id is None:
+            if encrypt:
+                QMessageBox.warning(self, "Database Unavailable",
+                                    "Encrypted notes can only be saved while the database is reachable.")
+                return
+            self._save_local_note(self.current_note_id, title, content)
+            return
+
+        key_salt, stored = None, content
+        if encrypt:
+            current = self.key_cache.current(self.current_user_id)
+            if current is None:
+                self._request_unlock(self._save_note)
+                return
+            key_salt, key = current
+            stored = encrypt_content(key, content, self.current_user_id)
+
+        selected = self.current_note_id
+        note_id = selected if isinstance(selected, int) else None
+        self.query_runner.submit(
+            "save", NotesRepository.save_note, self.current_user_id, title, stored, note_id,
+            encryption_key_salt=key_salt,
+            on_result=lambda saved: self._on_note_saved(selected, title, content, saved, encrypt),
+            on_error=self._on_query_failed,
+        )
+
+    def _on_note_saved(self, selected, title, content, saved, encrypted=False):
+        """Move a saved note to the top of the list, as the most recently updated.
+
+        selected is the note that was open when the save started; if the user has opened
+        another note since, the editor stays on that one.
+        """
+        if saved is None:
+            if encrypted:
+                # Never fall back to writing the plaintext of an encrypted note to disk
+                QMessageBox.critical(self, "Error", "Cannot connect to database; the note was not saved.")
+                return
+            # Database went away; keep the note on disk rather than losing it
+            self._save_local_note(selected, title, content)
+            return
+
+        note_id = saved["id"]
         note_data = {
             "title": title,
             "content": content,
-            "created": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "modified": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "created": self._format_time(saved["created_at"]),
+            "modified": self._format_time(saved["updated_at"]),
+            "encrypted": encrypted,
         }
-
-        user_notes_dir = self.notes_dir / self.current_user
-        user_notes_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_note_item(note_id)
+        self.current_notes[note_id] = note_data
+        list_item = self._add_note_item(note_id, note_data, 0)
+        if self.current_note_id == selected:
+            self.notes_list.setCurrentItem(list_item)
+            self.current_note_id = note_id
+            self.editor_dirty = False
+        QMessageBox.information(self, "Success", "Note saved successfully!")
+
+    def _save_local_note(self, selected, title, content, quiet=False):
+        """Record the note that was open as selected in the user's journal; quiet for autosaves, which report nothing."""
+        # Notes that came from the database get a journal id of their own
+        note_id = selected if isinstance(selected, str) else new_note_id()
+        journal = self._journal()
 
         try:
-            note_file = user_notes_dir / f"{note_id}.json"
-            with open(note_file, "w") as f:
-                json.dump(note_data, f, indent=2)
-            
-            QMessageBox.information(self, "Success", "Note saved successfully!")
-            self._load_notes()
+            note_data = dict(journal.put(note_id, title, content))
+            get_search_index().update_file(journal.path)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save note: {str(e)}")
+            if quiet:
+                print(f"Autosave failed: {e}")
+            else:
+                QMessageBox.critical(self, "Error", f"Failed to save note: {str(e)}")
+            return
+
+        self.imported_users.discard(self.current_user)  # Imported on the next load that reaches the database
+        self._upsert_note_item(note_id, note_data)
+        if self.current_note_id == selected:
+            self.editor_dirty = False
+            self.current_note_id = note_id
+            if not quiet:
+                self.notes_list.setCurrentRow(self._find_note_row(note_id))
+        if not quiet:
+            QMessageBox.information(self, "Success", "Note saved locally (database unavailable).")
 
     def _delete_note(self):
         """Delete the selected note."""
@@ -275,19 +706,31 @@ class NotesWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             note_id = current_item.data(Qt.ItemDataRole.UserRole)
-            user_notes_dir = self.notes_dir / self.current_user
-            note_file = user_notes_dir / f"{note_id}.json"
-
+            if isinstance(note_id, int):
+                self.query_runner.submit(
+                    "delete", NotesRepository.delete_note, note_id, self.current_user_id,
+                    on_result=lambda deleted: self._on_note_deleted(note_id, deleted),
+                    on_error=self._on_query_failed,
+                )
+                return
+
+            journal = self._journal()
             try:
-                if note_file.exists():
-                    note_file.unlink()
-                QMessageBox.information(self, "Success", "Note deleted successfully!")
-                self._load_notes()
-                self.note_title_input.clear()
-                self.note_content.setPlainText("")
+                journal.delete(note_id)
+                get_search_index().update_file(journal.path)
+                self._on_note_deleted(note_id, True)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete note: {str(e)}")
 
+    def _on_note_deleted(self, note_id, deleted):
+        """Drop a deleted note from the list and clear the editor."""
+        if not deleted:
+            QMessageBox.critical(self, "Error", "The note was not deleted: it no longer exists or the database is unreachable.")
+            return
+        QMessageBox.information(self, "Success", "Note deleted successfully!")
+        self._remove_note_item(note_id)
+        self._clear_editor()
+
     def _get_stylesheet(self) -> str:
         """Return the stylesheet for the window."""
         return """
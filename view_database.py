@@ -2,19 +2,323 @@
 Database Viewer for CyberPatriot Runbook
 View and manage all database records including users, teams, roles, and approvals using PySide6 GUI
 """
+import json
 import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from db_config import get_connection, close_connection
+from table_model import RowTableModel, create_proxy_model
+from paging import ListingRepository
+from async_query import AsyncQueryRunner
+from reference_cache import get_reference_cache
+from audit_log import AuditRepository, audit, get_audit_writer
+from delta_sync import DeltaSync, DEFAULT_POLL_INTERVAL_MS, split_changes
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QTabWidget, QDialog, QFormLayout, QLineEdit, QComboBox
+    QLabel, QPushButton, QTableView, QAbstractItemView, QHeaderView, QMessageBox, QTabWidget, QDialog, QFormLayout, QLineEdit, QComboBox, QCheckBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 
+@dataclass
+class DatabaseStatistics:
+    """Totals shown on the Statistics tab"""
+    total_users: int = 0
+    total_teams: int = 0
+    total_members: int = 0
+    pending: int = 0
+    approved: int = 0
+    members_by_role: list[tuple[str, int]] = field(default_factory=list)
+
+
+class StatisticsRepository:
+    """Repository for viewer statistics"""
+
+    # User and team totals come from their own one-row SELECT, joined to one pass over team_members
+    # grouped by role; LEFT JOIN ON TRUE keeps the totals row even when there are no roles
+    STATISTICS_QUERY = """
+        SELECT
+            totals.users,
+            totals.teams,
+            by_role.name,
+            by_role.members,
+            by_role.pending,
+            by_role.approved
+        FROM (SELECT (SELECT COUNT(*) FROM users) AS users, (SELECT COUNT(*) FROM teams) AS teams) totals
+        LEFT JOIN (
+            SELECT
+                r.name,
+                COUNT(tm.id) AS members,
+                COALESCE(SUM(tm.status = 'pending'), 0) AS pending,
+                COALESCE(SUM(tm.status = 'approved'), 0) AS approved
+            FROM roles r
+            LEFT JOIN team_members tm ON r.id = tm.role_id
+            GROUP BY r.id, r.name
+        ) by_role ON TRUE
+        ORDER BY by_role.members DESC
+    """
+
+    @staticmethod
+    def get_statistics() -> DatabaseStatistics | None:
+        """Compute all viewer statistics in a single round trip"""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(StatisticsRepository.STATISTICS_QUERY)
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            close_connection(connection)
+
+        stats = DatabaseStatistics()
+        for total_users, total_teams, role, count, pending, approved in rows:
+            stats.total_users = int(total_users)
+            stats.total_teams = int(total_teams)
+            if role is None:
+                continue  # No roles; only the totals row came back
+            stats.members_by_role.append((role, int(count)))
+            stats.total_members += int(count)
+            stats.pending += int(pending)
+            stats.approved += int(approved)
+        return stats
+
+
+class ViewerRepository:
+    """Repository for the viewer's unpaged listings"""
+
+    @staticmethod
+    def _fetch_all(query: str, params=()) -> list[tuple] | None:
+        """Run a query and return all rows (None if the database is unreachable)"""
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        finally:
+            close_connection(connection)
+
+    @staticmethod
+    def fetch_teams() -> list[tuple] | None:
+        """All teams with their creator's name, newest first"""
+        return ViewerRepository._fetch_all("""
+            SELECT t.id, t.name, t.team_code, t.division, u.name, t.created_at
+            FROM teams t
+            LEFT JOIN users u ON t.created_by_user_id = u.id
+            ORDER BY t.created_at DESC
+        """)
+
+    @staticmethod
+    def fetch_teams_changed(since) -> list[tuple] | None:
+        """Teams updated at or after since, each ending in a still-listed flag"""
+        return ViewerRepository._fetch_all("""
+            SELECT t.id, t.name, t.team_code, t.division, u.name, t.created_at, 1
+            FROM teams t
+            LEFT JOIN users u ON t.created_by_user_id = u.id
+            WHERE t.updated_at >= %s
+        """, (since,))
+
+    @staticmethod
+    def fetch_pending_approvals() -> list[tuple] | None:
+        """Pending memberships, oldest request first"""
+        return ViewerRepository._fetch_all("""
+            SELECT 
+                tm.id,
+                u.name,
+                u.username,
+                t.name,
+                t.team_code,
+                r.name,
+                tm.created_at
+            FROM team_members tm
+            JOIN users u ON tm.user_id = u.id
+            JOIN teams t ON tm.team_id = t.id
+            JOIN roles r ON tm.role_id = r.id
+            WHERE tm.status = 'pending'
+            ORDER BY tm.created_at ASC
+        """)
+
+    @staticmethod
+    def fetch_pending_changed(since) -> list[tuple] | None:
+        """Memberships updated at or after since, flagged by whether they are still pending"""
+        return ViewerRepository._fetch_all("""
+            SELECT tm.id, u.name, u.username, t.name, t.team_code, r.name, tm.created_at,
+                   tm.status = 'pending'
+            FROM team_members tm
+            JOIN users u ON tm.user_id = u.id
+            JOIN teams t ON tm.team_id = t.id
+            JOIN roles r ON tm.role_id = r.id
+            WHERE tm.updated_at >= %s
+            ORDER BY tm.created_at ASC
+        """, (since,))
+
+    @staticmethod
+    def fetch_roles() -> list[tuple] | None:
+        """Roles with their member counts"""
+        return ViewerRepository._fetch_all("""
+            SELECT r.id, r.name, COUNT(tm.id)
+            FROM roles r
+            LEFT JOIN team_members tm ON r.id = tm.role_id
+            GROUP BY r.id, r.name
+            ORDER BY r.id
+        """)
+
+
+    # Column whose maximum changes whenever a row is written (roles has no updated_at)
+    VERSION_COLUMNS = {
+        'users': 'updated_at',
+        'teams': 'updated_at',
+        'team_members': 'updated_at',
+        'roles': 'id',
+    }
+
+    @staticmethod
+    def fetch_fingerprint(tables) -> tuple | None:
+        """Row count, latest change and highest id for each table, in one round trip
+
+        Two equal fingerprints mean none of the tables were written in between.
+        """
+        tables = sorted(tables)
+        query = " UNION ALL ".join(
+            f"SELECT '{table}', COUNT(*), MAX({ViewerRepository.VERSION_COLUMNS[table]}), MAX(id) FROM {table}"
+            for table in tables
+        )
+        rows = ViewerRepository._fetch_all(query)
+        return tuple(rows) if rows is not None else None
+
+
+class MembershipRepository:
+    """Bulk membership changes; each runs as one UPDATE in a single transaction and queues its audit events"""
+
+    @staticmethod
+    def set_status(member_ids: list[int], status: str) -> list[int] | None:
+        """Approve or reject pending memberships. Returns the ids that changed (None if the database is unreachable)
+
+        Rows that are no longer pending, e.g. handled from another window meanwhile, are left alone.
+        """
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            placeholders = ", ".join(["%s"] * len(member_ids))
+            cursor.execute(
+                f"SELECT id, team_id FROM team_members WHERE id IN ({placeholders}) AND status = 'pending' FOR UPDATE",
+                list(member_ids)
+            )
+            teams = dict(cursor.fetchall())
+            changed = list(teams)
+            if changed:
+                placeholders = ", ".join(["%s"] * len(changed))
+                cursor.execute(
+                    f"UPDATE team_members SET status = %s WHERE id IN ({placeholders})", [status] + changed
+                )
+            connection.commit()
+            cursor.close()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            close_connection(connection)
+
+        for member_id in changed:
+            audit(f"membership_{status}", "team_member", member_id, "pending", status, team_id=teams[member_id])
+        return changed
+
+    @staticmethod
+    def reassign(member_ids: list[int], team_id: int) -> tuple[list[int], list[int]] | None:
+        """Move memberships to another team. Returns (ids that changed, ids skipped) (None if the database is unreachable)
+
+        A membership is skipped when its user already belongs to the team, so a user never
+        ends up on a team twice.
+        """
+        connection = get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            placeholders = ", ".join(["%s"] * len(member_ids))
+            cursor.execute(
+                f"SELECT id, team_id, user_id FROM team_members WHERE id IN ({placeholders}) AND team_id <> %s FOR UPDATE",
+                list(member_ids) + [team_id]
+            )
+            candidates = cursor.fetchall()
+            taken = set()
+            if candidates:
+                placeholders = ", ".join(["%s"] * len(candidates))
+                cursor.execute(
+                    f"SELECT user_id FROM team_members WHERE team_id = %s AND user_id IN ({placeholders}) FOR UPDATE",
+                    [team_id] + [user_id for _, _, user_id in candidates]
+                )
+                taken = {user_id for (user_id,) in cursor.fetchall()}
+            previous, skipped = [], []
+            for member_id, old_team_id, user_id in candidates:
+                if user_id in taken:
+                    skipped.append(member_id)
+                else:
+                    taken.add(user_id)  # One of several selected memberships of the same user
+                    previous.append((member_id, old_team_id))
+            changed = [member_id for member_id, _ in previous]
+            if changed:
+                placeholders = ", ".join(["%s"] * len(changed))
+                cursor.execute(
+                    f"UPDATE team_members SET team_id = %s WHERE id IN ({placeholders})", [team_id] + changed
+                )
+            connection.commit()
+            cursor.close()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            close_connection(connection)
+
+        for member_id, old_team_id in previous:
+            audit("membership_reassigned", "team_member", member_id, old_team_id, team_id, team_id=team_id)
+        return changed, skipped
+
+
+# Tables each viewer query reads, used to decide whether a loaded tab is stale
+QUERY_TABLES = {
+    "users": ["users"],
+    "teams": ["teams", "users"],
+    "team_members": ["team_members", "users", "teams", "roles"],
+    "pending": ["team_members", "users", "teams", "roles"],
+    "roles": ["roles", "team_members"],
+    "statistics": ["users", "teams", "team_members", "roles"],
+}
+
+# Table whose updated_at watermark lets a query refresh with a delta; the rest always reload
+DELTA_TABLES = {
+    "users": "users",
+    "teams": "teams",
+    "team_members": "team_members",
+    "pending": "team_members",
+}
+
+# Days of rolled-up audit counts shown on the Statistics tab
+AUDIT_ACTIVITY_DAYS = 14
+
+# Days of a member's audit events shown by View History; the window limits the scan to those months
+MEMBER_HISTORY_DAYS = 365
+
+# Rows sampled when fitting columns to their contents
+COLUMN_SIZE_SAMPLE_ROWS = 200
+
+
 class DatabaseViewerWindow(QMainWindow):
     """Main database viewer application"""
     
-    def __init__(self):
+    def __init__(self, poll_interval_ms: int = DEFAULT_POLL_INTERVAL_MS):
         super().__init__()
         self.setWindowTitle("CyberPatriot Runbook - Database Viewer")
         self.setGeometry(100, 100, 1200, 700)
@@ -50,6 +354,32 @@ class DatabaseViewerWindow(QMainWindow):
         self.tabs.addTab(self.roles_tab, "Roles")
         self.tabs.addTab(self.statistics_tab, "Statistics")
         
+        # Queries run in the background; each query key maps to the tab it fills
+        self.query_runner = AsyncQueryRunner(self)
+        self.tab_for_query = {
+            "users": (self.all_users_tab, "All Users"),
+            "teams": (self.teams_tab, "Teams"),
+            "team_members": (self.team_members_tab, "Team Members"),
+            "pending": (self.pending_approvals_tab, "Pending Approvals"),
+            "roles": (self.roles_tab, "Roles"),
+            "statistics": (self.statistics_tab, "Statistics"),
+        }
+        self.query_for_tab = {tab: key for key, (tab, _) in self.tab_for_query.items()}
+        self.loaders = {
+            "users": self.load_all_users,
+            "teams": self.load_teams,
+            "team_members": self.load_team_members,
+            "pending": self.load_pending_approvals,
+            "roles": self.load_roles,
+            "statistics": self.load_statistics,
+        }
+        self.delta_sync = DeltaSync(DELTA_TABLES)  # Watermarks of the tables each tab was last synced with
+        self.query_timings = {}  # query key -> seconds the last load took
+        self.sized_views = set()  # Tables whose columns were fitted to their first rows
+        self.refresh_pending = set()
+        self.refresh_started = 0.0
+        self.query_runner.loading_changed.connect(self._on_loading_changed)
+        
         # Initialize tabs
         self.init_all_users_tab()
         self.init_teams_tab()
@@ -58,23 +388,91 @@ class DatabaseViewerWindow(QMainWindow):
         self.init_roles_tab()
         self.init_statistics_tab()
         
+        # Listings refreshed by merging changed rows: query key -> (fetch changes since, model, new rows on top)
+        self.delta_listings = {
+            "users": (lambda since: self.users_pager.fetch_changed(since), self.users_model, True),
+            "teams": (ViewerRepository.fetch_teams_changed, self.teams_model, True),
+            "team_members": (lambda since: self.team_members_pager.fetch_changed(since), self.team_members_model, False),
+            "pending": (ViewerRepository.fetch_pending_changed, self.pending_model, False),
+        }
+        
+        # Tabs load on first activation and afterwards fetch only what changed
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self._on_tab_changed(self.tabs.currentIndex())
+        
         # Refresh button
         refresh_layout = QHBoxLayout()
         refresh_btn = QPushButton("Refresh All")
         refresh_btn.clicked.connect(self.refresh_all_data)
+        
+        # Auto-refresh polls the visible tab; an unchanged tab costs one fingerprint query
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval_ms)
+        self.poll_timer.timeout.connect(self._poll_current_tab)
+        auto_refresh = QCheckBox(f"Auto-refresh every {poll_interval_ms // 1000}s")
+        auto_refresh.toggled.connect(lambda checked: self.poll_timer.start() if checked else self.poll_timer.stop())
+        refresh_layout.addWidget(auto_refresh)
         refresh_layout.addStretch()
         refresh_layout.addWidget(refresh_btn)
         layout.addLayout(refresh_layout)
     
+    def _create_table(self, layout, headers, on_filter=None):
+        """Create a filter box and a sortable table view backed by a RowTableModel
+        
+        Without on_filter the box filters loaded rows through the proxy model; with it,
+        on_filter(text) is called once typing pauses so the query can filter server-side.
+        """
+        filter_input = QLineEdit()
+        filter_input.setPlaceholderText("Filter...")
+        layout.addWidget(filter_input)
+        
+        model = RowTableModel(headers, self)
+        proxy = create_proxy_model(model, self)
+        if on_filter is None:
+            filter_input.textChanged.connect(proxy.setFilterFixedString)
+        else:
+            filter_timer = QTimer(self)
+            filter_timer.setSingleShot(True)
+            filter_timer.setInterval(300)
+            filter_timer.timeout.connect(lambda: on_filter(filter_input.text().strip()))
+            filter_input.textChanged.connect(lambda _text: filter_timer.start())
+        
+        view = QTableView()
+        view.setModel(proxy)
+        view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        view.horizontalHeader().setResizeContentsPrecision(COLUMN_SIZE_SAMPLE_ROWS)
+        # Keep the query's ordering until the user clicks a header
+        view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        view.setSortingEnabled(True)
+        layout.addWidget(view)
+        return view, model
+    
+    def _fetch_on_scroll(self, view, fetch_more):
+        """Call fetch_more when a table is scrolled close to its last loaded row"""
+        scroll_bar = view.verticalScrollBar()
+        scroll_bar.valueChanged.connect(
+            lambda value: fetch_more() if value >= scroll_bar.maximum() - 20 else None
+        )
+    
+    def _selected_rows(self, view, model):
+        """Return the raw values of the rows selected in a table view"""
+        proxy = view.model()
+        return [
+            model.row_values(proxy.mapToSource(index).row())
+            for index in view.selectionModel().selectedRows()
+        ]
+    
     def init_all_users_tab(self):
         """Initialize the All Users tab"""
         layout = QVBoxLayout(self.all_users_tab)
         
-        self.users_table = QTableWidget()
-        self.users_table.setColumnCount(6)
-        self.users_table.setHorizontalHeaderLabels(["ID", "Name", "Username", "Email", "Active", "Created At"])
-        self.users_table.resizeColumnsToContents()
-        layout.addWidget(self.users_table)
+        self.users_search = ""
+        self.users_table, self.users_model = self._create_table(
+            layout, ["ID", "Name", "Username", "Email", "Active", "Created At"], on_filter=self.filter_users
+        )
+        self._fetch_on_scroll(self.users_table, self.load_more_users)
         
         # Action buttons
         button_layout = QHBoxLayout()
@@ -86,18 +484,12 @@ class DatabaseViewerWindow(QMainWindow):
         button_layout.addWidget(edit_btn)
         button_layout.addWidget(delete_btn)
         layout.addLayout(button_layout)
-        
-        self.load_all_users()
     
     def init_teams_tab(self):
         """Initialize the Teams tab"""
         layout = QVBoxLayout(self.teams_tab)
         
-        self.teams_table = QTableWidget()
-        self.teams_table.setColumnCount(6)
-        self.teams_table.setHorizontalHeaderLabels(["ID", "Team Name", "Team Code", "Division", "Created By", "Created At"])
-        self.teams_table.resizeColumnsToContents()
-        layout.addWidget(self.teams_table)
+        self.teams_table, self.teams_model = self._create_table(layout, ["ID", "Team Name", "Team Code", "Division", "Created By", "Created At"])
         
         # Action buttons
         button_layout = QHBoxLayout()
@@ -112,41 +504,41 @@ class DatabaseViewerWindow(QMainWindow):
         button_layout.addWidget(edit_btn)
         button_layout.addWidget(delete_btn)
         layout.addLayout(button_layout)
-        
-        self.load_teams()
     
     def init_team_members_tab(self):
         """Initialize the Team Members tab"""
         layout = QVBoxLayout(self.team_members_tab)
         
-        self.team_members_table = QTableWidget()
-        self.team_members_table.setColumnCount(7)
-        self.team_members_table.setHorizontalHeaderLabels(["Member ID", "User Name", "Username", "Team", "Role", "Status", "Joined"])
-        self.team_members_table.resizeColumnsToContents()
-        layout.addWidget(self.team_members_table)
+        self.team_members_search = ""
+        self.team_members_table, self.team_members_model = self._create_table(
+            layout, ["Member ID", "User Name", "Username", "Team", "Role", "Status", "Joined"], on_filter=self.filter_team_members
+        )
+        self._fetch_on_scroll(self.team_members_table, self.load_more_team_members)
         
         # Action buttons
         button_layout = QHBoxLayout()
+        button_layout.addWidget(QLabel("Status:"))
+        self.member_status_combo = QComboBox()
+        self.member_status_combo.addItems(["All Statuses", "pending", "approved", "rejected"])
+        self.member_status_combo.currentTextChanged.connect(lambda _text: self.load_team_members())
+        button_layout.addWidget(self.member_status_combo)
         reassign_btn = QPushButton("Reassign to Team")
         reassign_btn.clicked.connect(self.reassign_member)
         unassign_btn = QPushButton("Unassign from Team")
         unassign_btn.clicked.connect(self.unassign_member)
+        history_btn = QPushButton("View History")
+        history_btn.clicked.connect(self.show_member_history)
         button_layout.addStretch()
         button_layout.addWidget(reassign_btn)
         button_layout.addWidget(unassign_btn)
+        button_layout.addWidget(history_btn)
         layout.addLayout(button_layout)
-        
-        self.load_team_members()
     
     def init_pending_approvals_tab(self):
         """Initialize the Pending Approvals tab"""
         layout = QVBoxLayout(self.pending_approvals_tab)
         
-        self.pending_table = QTableWidget()
-        self.pending_table.setColumnCount(7)
-        self.pending_table.setHorizontalHeaderLabels(["Member ID", "User Name", "Username", "Team Name", "Team Code", "Role", "Requested"])
-        self.pending_table.resizeColumnsToContents()
-        layout.addWidget(self.pending_table)
+        self.pending_table, self.pending_model = self._create_table(layout, ["Member ID", "User Name", "Username", "Team Name", "Team Code", "Role", "Requested"])
         
         # Action buttons
         button_layout = QHBoxLayout()
@@ -158,20 +550,12 @@ class DatabaseViewerWindow(QMainWindow):
         button_layout.addWidget(approve_btn)
         button_layout.addWidget(reject_btn)
         layout.addLayout(button_layout)
-        
-        self.load_pending_approvals()
     
     def init_roles_tab(self):
         """Initialize the Roles tab"""
         layout = QVBoxLayout(self.roles_tab)
         
-        self.roles_table = QTableWidget()
-        self.roles_table.setColumnCount(3)
-        self.roles_table.setHorizontalHeaderLabels(["Role ID", "Role Name", "User Count"])
-        self.roles_table.resizeColumnsToContents()
-        layout.addWidget(self.roles_table)
-        
-        self.load_roles()
+        self.roles_table, self.roles_model = self._create_table(layout, ["Role ID", "Role Name", "User Count"])
     
     def init_statistics_tab(self):
         """Initialize the Statistics tab"""
@@ -185,250 +569,283 @@ class DatabaseViewerWindow(QMainWindow):
         self.stats_label.setFont(stats_font)
         layout.addWidget(self.stats_label)
         
-        layout.addStretch()
-        
-        self.load_statistics()
+        # Daily audit counts from audit_daily_summary, newest day first
+        layout.addWidget(QLabel(f"<b>Audit Activity (last {AUDIT_ACTIVITY_DAYS} days)</b>"))
+        self.audit_table, self.audit_model = self._create_table(
+            layout, ["Day", "Team", "Action", "Resource", "Events"]
+        )
     
-    def load_all_users(self):
-        """Load all users into the table"""
-        connection = get_connection()
-        if not connection:
+    def _on_loading_changed(self, key, loading):
+        """Show a loading marker on the tab whose query is running"""
+        if key not in self.tab_for_query:
+            return
+        tab, title = self.tab_for_query[key]
+        index = self.tabs.indexOf(tab)
+        self.tabs.setTabText(index, f"{title} (loading...)" if loading else title)
+        
+        if not loading and key in self.refresh_pending:
+            self.refresh_pending.discard(key)
+            if not self.refresh_pending:
+                self._report_refresh()
+    
+    def _report_refresh(self):
+        """Show how long Refresh All took overall and per query"""
+        total = time.perf_counter() - self.refresh_started
+        lines = [f"All data refreshed successfully in {total:.2f}s", ""]
+        for key, (_, title) in self.tab_for_query.items():
+            lines.append(f"{title}: {self.query_timings.get(key, 0.0):.2f}s")
+        QMessageBox.information(self, "Success", "\n".join(lines))
+    
+    def _on_tab_changed(self, index):
+        """Load a tab on first activation, or bring it up to date if its tables changed since"""
+        key = self.query_for_tab.get(self.tabs.widget(index))
+        if key is None or self.query_runner.is_loading(key):
+            return
+        if not self.delta_sync.is_loaded(key):
+            self.loaders[key]()
+            return
+        self._sync(key)
+    
+    def _poll_current_tab(self):
+        """Auto-refresh tick: bring the visible tab up to date"""
+        key = self.query_for_tab.get(self.tabs.currentWidget())
+        if key is None or not self.delta_sync.is_loaded(key) or self.query_runner.is_loading(key):
+            return
+        self._sync(key)
+    
+    def _sync(self, key):
+        """Fingerprint a tab's tables, then fetch only what changed"""
+        self.query_runner.submit(
+            f"fingerprint:{key}", ViewerRepository.fetch_fingerprint, QUERY_TABLES[key],
+            on_result=lambda fingerprint: self._on_fingerprint(key, fingerprint),
+        )
+    
+    def _on_fingerprint(self, key, fingerprint):
+        """Merge a delta into a tab, reload it, or leave it, depending on what changed"""
+        if fingerprint is None or self.query_runner.is_loading(key):
+            return
+        action, since = self.delta_sync.plan(key, fingerprint)
+        if action == DeltaSync.RELOAD:
+            self.loaders[key]()
+        elif action == DeltaSync.DELTA:
+            fetch_changes, model, at_top = self.delta_listings[key]
+            self.query_runner.submit(
+                key, fetch_changes, since,
+                on_result=lambda rows: self._on_changes_loaded(key, fingerprint, model, at_top, rows),
+                on_error=self._on_load_failed,
+            )
+    
+    def _on_changes_loaded(self, key, fingerprint, model, at_top, rows):
+        """Merge changed rows into a model and advance its watermark"""
+        if rows is None:
+            return  # Database unreachable; the old watermark is kept and the next sync retries
+        if not self.delta_sync.accepts(key, fingerprint, rows):
+            self.loaders[key]()  # Rows were deleted as well as inserted
+            return
+        upserts, removed = split_changes(rows)
+        model.remove_rows(model.rows_where(0, removed))
+        model.merge_rows(upserts, at_top=at_top)
+        self.delta_sync.record(key, fingerprint)
+    
+    def _load(self, key, fetch, apply):
+        """Run fetch in the background, then hand its result to apply on the GUI thread"""
+        self.query_runner.submit(
+            key, self._fetch_timed, key, fetch,
+            on_result=lambda result: self._on_loaded(key, apply, result),
+            on_error=self._on_load_failed,
+        )
+    
+    @staticmethod
+    def _fetch_timed(key, fetch):
+        """Worker-thread half of _load: fingerprint the tables, then run the query"""
+        start = time.perf_counter()
+        fingerprint = ViewerRepository.fetch_fingerprint(QUERY_TABLES[key])
+        result = fetch()
+        return fingerprint, result, time.perf_counter() - start
+    
+    def _on_loaded(self, key, apply, result):
+        """Record a finished load and display its rows"""
+        fingerprint, data, elapsed = result
+        self.query_timings[key] = elapsed
+        self.delta_sync.record(key, fingerprint)
+        apply(data)
+    
+    def _on_load_failed(self, message):
+        """Report a background query that raised"""
+        QMessageBox.critical(self, "Error", f"Failed to load data: {message}")
+    
+    def _show_rows(self, view, model, rows):
+        """Replace a table's rows with a query result"""
+        if rows is None:
             QMessageBox.critical(self, "Error", "Cannot connect to database")
             return
         
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT u.id, u.name, u.username, u.email, u.is_active, u.created_at
-                FROM users u
-                ORDER BY u.created_at DESC
-            """)
-            
-            rows = cursor.fetchall()
-            self.users_table.setRowCount(len(rows))
-            
-            for row_idx, row_data in enumerate(rows):
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.users_table.setItem(row_idx, col_idx, item)
-            
-            self.users_table.resizeColumnsToContents()
-            cursor.close()
-        finally:
-            close_connection(connection)
+        model.set_rows(rows)
+        if rows and view not in self.sized_views:
+            # Fit columns once; later reloads keep the widths (and any the user dragged)
+            view.resizeColumnsToContents()
+            self.sized_views.add(view)
+    
+    def load_all_users(self):
+        """Load the first page of users into the table"""
+        self.users_pager = ListingRepository.users_pager(search=self.users_search)
+        self._load(
+            "users",
+            self.users_pager.fetch_next,
+            lambda rows: self._show_rows(self.users_table, self.users_model, rows),
+        )
+    
+    def load_more_users(self):
+        """Append the next page of users"""
+        if not self.users_pager.has_more or self.query_runner.is_loading("users"):
+            return
+        self.query_runner.submit(
+            "users", self.users_pager.fetch_next,
+            on_result=lambda rows: self.users_model.append_rows(rows or []),
+            on_error=self._on_load_failed,
+        )
+    
+    def filter_users(self, search):
+        """Reload users matching a name/username search"""
+        self.users_search = search
+        self.load_all_users()
     
     def load_teams(self):
         """Load all teams into the table"""
-        connection = get_connection()
-        if not connection:
-            QMessageBox.critical(self, "Error", "Cannot connect to database")
-            return
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT t.id, t.name, t.team_code, t.division, u.name, t.created_at
-                FROM teams t
-                LEFT JOIN users u ON t.created_by_user_id = u.id
-                ORDER BY t.created_at DESC
-            """)
-            
-            rows = cursor.fetchall()
-            self.teams_table.setRowCount(len(rows))
-            
-            for row_idx, row_data in enumerate(rows):
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.teams_table.setItem(row_idx, col_idx, item)
-            
-            self.teams_table.resizeColumnsToContents()
-            cursor.close()
-        finally:
-            close_connection(connection)
+        self._load(
+            "teams",
+            ViewerRepository.fetch_teams,
+            lambda rows: self._show_rows(self.teams_table, self.teams_model, rows),
+        )
     
     def load_team_members(self):
-        """Load all team members into the table"""
-        connection = get_connection()
-        if not connection:
-            QMessageBox.critical(self, "Error", "Cannot connect to database")
+        """Load the first page of team members into the table"""
+        status = self.member_status_combo.currentText()
+        self.team_members_pager = ListingRepository.team_members_pager(
+            search=self.team_members_search,
+            status=None if status == "All Statuses" else status,
+        )
+        self._load(
+            "team_members",
+            self.team_members_pager.fetch_next,
+            lambda rows: self._show_rows(self.team_members_table, self.team_members_model, rows),
+        )
+    
+    def load_more_team_members(self):
+        """Append the next page of team members"""
+        if not self.team_members_pager.has_more or self.query_runner.is_loading("team_members"):
             return
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT 
-                    tm.id,
-                    u.name,
-                    u.username,
-                    t.name,
-                    r.name,
-                    tm.status,
-                    tm.created_at
-                FROM team_members tm
-                JOIN users u ON tm.user_id = u.id
-                JOIN teams t ON tm.team_id = t.id
-                JOIN roles r ON tm.role_id = r.id
-                ORDER BY tm.status DESC, t.name, u.name
-            """)
-            
-            rows = cursor.fetchall()
-            self.team_members_table.setRowCount(len(rows))
-            
-            for row_idx, row_data in enumerate(rows):
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.team_members_table.setItem(row_idx, col_idx, item)
-            
-            self.team_members_table.resizeColumnsToContents()
-            cursor.close()
-        finally:
-            close_connection(connection)
+        self.query_runner.submit(
+            "team_members", self.team_members_pager.fetch_next,
+            on_result=lambda rows: self.team_members_model.append_rows(rows or []),
+            on_error=self._on_load_failed,
+        )
+    
+    def filter_team_members(self, search):
+        """Reload team members matching a name/username/team search"""
+        self.team_members_search = search
+        self.load_team_members()
     
     def load_pending_approvals(self):
         """Load all pending approvals into the table"""
-        connection = get_connection()
-        if not connection:
-            QMessageBox.critical(self, "Error", "Cannot connect to database")
-            return
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT 
-                    tm.id,
-                    u.name,
-                    u.username,
-                    t.name,
-                    t.team_code,
-                    r.name,
-                    tm.created_at
-                FROM team_members tm
-                JOIN users u ON tm.user_id = u.id
-                JOIN teams t ON tm.team_id = t.id
-                JOIN roles r ON tm.role_id = r.id
-                WHERE tm.status = 'pending'
-                ORDER BY tm.created_at ASC
-            """)
-            
-            rows = cursor.fetchall()
-            self.pending_table.setRowCount(len(rows))
-            
-            for row_idx, row_data in enumerate(rows):
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.pending_table.setItem(row_idx, col_idx, item)
-            
-            self.pending_table.resizeColumnsToContents()
-            cursor.close()
-        finally:
-            close_connection(connection)
+        self._load(
+            "pending",
+            ViewerRepository.fetch_pending_approvals,
+            lambda rows: self._show_rows(self.pending_table, self.pending_model, rows),
+        )
     
     def load_roles(self):
         """Load all roles into the table"""
-        connection = get_connection()
-        if not connection:
-            QMessageBox.critical(self, "Error", "Cannot connect to database")
-            return
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT r.id, r.name, COUNT(tm.id)
-                FROM roles r
-                LEFT JOIN team_members tm ON r.id = tm.role_id
-                GROUP BY r.id, r.name
-                ORDER BY r.id
-            """)
-            
-            rows = cursor.fetchall()
-            self.roles_table.setRowCount(len(rows))
-            
-            for row_idx, row_data in enumerate(rows):
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.roles_table.setItem(row_idx, col_idx, item)
-            
-            self.roles_table.resizeColumnsToContents()
-            cursor.close()
-        finally:
-            close_connection(connection)
+        self._load(
+            "roles",
+            ViewerRepository.fetch_roles,
+            lambda rows: self._show_rows(self.roles_table, self.roles_model, rows),
+        )
     
     def load_statistics(self):
         """Load and display database statistics"""
-        connection = get_connection()
-        if not connection:
+        self._load(
+            "statistics",
+            StatisticsRepository.get_statistics,
+            self._show_statistics,
+        )
+        self.query_runner.submit(
+            "audit_activity", self._fetch_audit_activity,
+            on_result=self._show_audit_activity,
+            on_error=self._on_load_failed,
+        )
+    
+    @staticmethod
+    def _fetch_audit_activity() -> list[tuple] | None:
+        """Rolled-up audit counts for recent days with team names resolved (worker thread)"""
+        counts = AuditRepository.daily_counts(since=date.today() - timedelta(days=AUDIT_ACTIVITY_DAYS))
+        if counts is None:
+            return None
+        
+        team_names = {team['id']: team['name'] for team in get_reference_cache().teams()}
+        rows = []
+        for count in reversed(counts):
+            rows.append((
+                count['day'],
+                team_names.get(count['team_id'], "-"),
+                count['action'],
+                count['resource_type'] or "-",
+                count['event_count'],
+            ))
+        return rows
+    
+    def _show_audit_activity(self, rows):
+        """Fill the audit activity table; a connection failure is already reported by the statistics load"""
+        if rows is not None:
+            self._show_rows(self.audit_table, self.audit_model, rows)
+    
+    def _show_statistics(self, stats):
+        """Render a DatabaseStatistics result on the Statistics tab"""
+        if stats is None:
             QMessageBox.critical(self, "Error", "Cannot connect to database")
             return
         
-        try:
-            cursor = connection.cursor()
-            
-            # Get statistics
-            cursor.execute("SELECT COUNT(*) FROM users")
-            total_users = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM teams")
-            total_teams = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM team_members")
-            total_members = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM team_members WHERE status = 'pending'")
-            pending = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM team_members WHERE status = 'approved'")
-            approved = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT r.name, COUNT(tm.id)
-                FROM roles r
-                LEFT JOIN team_members tm ON r.id = tm.role_id
-                GROUP BY r.id, r.name
-                ORDER BY COUNT(tm.id) DESC
-            """)
-            role_stats = cursor.fetchall()
-            
-            # Format statistics text
-            stats_text = f"""
+        # Format statistics text
+        stats_text = f"""
 <b>Database Statistics</b><br><br>
 <b>Overall:</b><br>
-Total Users: {total_users}<br>
-Total Teams: {total_teams}<br>
-Total Team Members: {total_members}<br><br>
+Total Users: {stats.total_users}<br>
+Total Teams: {stats.total_teams}<br>
+Total Team Members: {stats.total_members}<br><br>
 
 <b>Approval Status:</b><br>
-Pending: {pending}<br>
-Approved: {approved}<br><br>
+Pending: {stats.pending}<br>
+Approved: {stats.approved}<br><br>
 
 <b>Members by Role:</b><br>
 """
-            for role, count in role_stats:
-                stats_text += f"{role}: {count}<br>"
-            
-            self.stats_label.setText(stats_text)
-            
-            cursor.close()
-        finally:
-            close_connection(connection)
+        for role, count in stats.members_by_role:
+            stats_text += f"{role}: {count}<br>"
+        
+        audit_stats = get_audit_writer().stats()
+        stats_text += f"""<br>
+<b>Audit Log Writer:</b><br>
+Written: {audit_stats['written']}<br>
+Waiting: {audit_stats['backlog']}<br>
+Dropped: {audit_stats['dropped']}<br>
+Failed Flushes: {audit_stats['failed_flushes']}<br>
+"""
+        
+        self.stats_label.setText(stats_text)
     
     def edit_user(self):
         """Edit selected user"""
-        selected_rows = self.users_table.selectionModel().selectedRows()
+        selected_rows = self._selected_rows(self.users_table, self.users_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a user to edit")
             return
         
-        row_idx = selected_rows[0].row()
-        user_id = int(self.users_table.item(row_idx, 0).text())
-        name = self.users_table.item(row_idx, 1).text()
-        username = self.users_table.item(row_idx, 2).text()
-        email = self.users_table.item(row_idx, 3).text()
-        is_active = self.users_table.item(row_idx, 4).text()
+        row = selected_rows[0]
+        user_id = row[0]
+        name = row[1]
+        username = row[2] or ""
+        email = row[3]
+        is_active = row[4]
         
         # Create edit dialog
         from PySide6.QtWidgets import QDialog, QLineEdit, QCheckBox, QDialogButtonBox
@@ -455,7 +872,7 @@ Approved: {approved}<br><br>
         
         layout.addWidget(QLabel("Active:"))
         active_checkbox = QCheckBox("User is active")
-        active_checkbox.setChecked(is_active.lower() == "true" or is_active == "1")
+        active_checkbox.setChecked(bool(is_active))
         layout.addWidget(active_checkbox)
         
         # Dialog buttons
@@ -479,6 +896,12 @@ Approved: {approved}<br><br>
                       active_checkbox.isChecked(), user_id))
                 connection.commit()
                 cursor.close()
+                audit(
+                    "user_updated", "user", user_id,
+                    json.dumps({"name": name, "username": username, "email": email, "is_active": bool(is_active)}),
+                    json.dumps({"name": name_input.text(), "username": username_input.text(),
+                                "email": email_input.text(), "is_active": active_checkbox.isChecked()}),
+                )
                 QMessageBox.information(self, "Success", "User updated successfully")
                 self.load_all_users()
             except Exception as e:
@@ -488,14 +911,14 @@ Approved: {approved}<br><br>
     
     def delete_user(self):
         """Delete selected user"""
-        selected_rows = self.users_table.selectionModel().selectedRows()
+        selected_rows = self._selected_rows(self.users_table, self.users_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a user to delete")
             return
         
-        row_idx = selected_rows[0].row()
-        user_id = int(self.users_table.item(row_idx, 0).text())
-        username = self.users_table.item(row_idx, 2).text()
+        row = selected_rows[0]
+        user_id = row[0]
+        username = row[2]
         
         # Confirm deletion
         reply = QMessageBox.question(
@@ -519,6 +942,7 @@ Approved: {approved}<br><br>
                 cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
                 connection.commit()
                 cursor.close()
+                audit("user_deleted", "user", user_id, username, description=f"Deleted user '{username}' and their memberships")
                 QMessageBox.information(self, "Success", f"User '{username}' deleted successfully")
                 self.load_all_users()
             except Exception as e:
@@ -584,8 +1008,13 @@ Approved: {approved}<br><br>
                     INSERT INTO teams (name, team_code, division)
                     VALUES (%s, %s, %s)
                 """, (team_name, team_code, division))
+                team_id = cursor.lastrowid
                 connection.commit()
                 cursor.close()
+                audit("team_created", "team", team_id, new_value=json.dumps(
+                    {"name": team_name, "team_code": team_code, "division": division}
+                ), team_id=team_id)
+                get_reference_cache().invalidate_teams()
                 QMessageBox.information(self, "Success", f"Team '{team_name}' created successfully")
                 self.load_teams()
             except Exception as e:
@@ -595,18 +1024,18 @@ Approved: {approved}<br><br>
     
     def edit_team(self):
         """Edit selected team"""
-        selected_rows = self.teams_table.selectionModel().selectedRows()
+        selected_rows = self._selected_rows(self.teams_table, self.teams_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a team to edit")
             return
         
         from PySide6.QtWidgets import QDialog, QLineEdit, QComboBox, QLabel, QDialogButtonBox
         
-        row_idx = selected_rows[0].row()
-        team_id = int(self.teams_table.item(row_idx, 0).text())
-        team_name = self.teams_table.item(row_idx, 1).text()
-        team_code = self.teams_table.item(row_idx, 2).text()
-        division = self.teams_table.item(row_idx, 3).text()
+        row = selected_rows[0]
+        team_id = row[0]
+        team_name = row[1]
+        team_code = row[2]
+        division = row[3]
         
         dialog = QDialog(self)
         dialog.setWindowTitle("Edit Team")
@@ -665,6 +1094,13 @@ Approved: {approved}<br><br>
                 """, (new_name, new_code, new_division, team_id))
                 connection.commit()
                 cursor.close()
+                audit(
+                    "team_updated", "team", team_id,
+                    json.dumps({"name": team_name, "team_code": team_code, "division": division}),
+                    json.dumps({"name": new_name, "team_code": new_code, "division": new_division}),
+                    team_id=team_id,
+                )
+                get_reference_cache().invalidate_teams()
                 QMessageBox.information(self, "Success", "Team updated successfully")
                 self.load_teams()
             except Exception as e:
@@ -674,14 +1110,14 @@ Approved: {approved}<br><br>
     
     def delete_team(self):
         """Delete selected team"""
-        selected_rows = self.teams_table.selectionModel().selectedRows()
+        selected_rows = self._selected_rows(self.teams_table, self.teams_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a team to delete")
             return
         
-        row_idx = selected_rows[0].row()
-        team_id = int(self.teams_table.item(row_idx, 0).text())
-        team_name = self.teams_table.item(row_idx, 1).text()
+        row = selected_rows[0]
+        team_id = row[0]
+        team_name = row[1]
         
         # Confirm deletion
         reply = QMessageBox.question(
@@ -705,6 +1141,9 @@ Approved: {approved}<br><br>
                 cursor.execute("DELETE FROM teams WHERE id = %s", (team_id,))
                 connection.commit()
                 cursor.close()
+                audit("team_deleted", "team", team_id, team_name,
+                      description=f"Deleted team '{team_name}' and its memberships", team_id=team_id)
+                get_reference_cache().invalidate_teams()
                 QMessageBox.information(self, "Success", f"Team '{team_name}' deleted successfully")
                 self.load_teams()
             except Exception as e:
@@ -714,109 +1153,90 @@ Approved: {approved}<br><br>
                 close_connection(connection)
     
     def approve_member(self):
-        """Approve selected pending member"""
-        selected_rows = self.pending_table.selectionModel().selectedRows()
+        """Approve the selected pending members"""
+        selected_rows = self._selected_rows(self.pending_table, self.pending_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a member to approve")
             return
         
-        row_idx = selected_rows[0].row()
-        member_id = int(self.pending_table.item(row_idx, 0).text())
-        username = self.pending_table.item(row_idx, 2).text()
-        team_name = self.pending_table.item(row_idx, 3).text()
-        team_code = self.pending_table.item(row_idx, 4).text()
-        
-        connection = get_connection()
-        if not connection:
-            QMessageBox.critical(self, "Error", "Cannot connect to database")
+        changed = self._set_member_status(selected_rows, "approved", "approve")
+        if changed is None:
             return
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                UPDATE team_members SET status = 'approved'
-                WHERE id = %s
-            """, (member_id,))
-            connection.commit()
-            cursor.close()
-            QMessageBox.information(self, "Success", f"Approved '{username}' for team '{team_name}' ({team_code})")
-            self.load_pending_approvals()
-            self.load_team_members()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to approve member: {str(e)}")
-        finally:
-            close_connection(connection)
+        if len(selected_rows) == 1 and changed:
+            row = selected_rows[0]
+            QMessageBox.information(self, "Success", f"Approved '{row[2]}' for team '{row[3]}' ({row[4]})")
+        else:
+            QMessageBox.information(self, "Success", self._bulk_summary("Approved", changed, selected_rows))
     
     def reject_member(self):
-        """Reject selected pending member"""
-        selected_rows = self.pending_table.selectionModel().selectedRows()
+        """Reject the selected pending members"""
+        selected_rows = self._selected_rows(self.pending_table, self.pending_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a member to reject")
             return
         
-        row_idx = selected_rows[0].row()
-        member_id = int(self.pending_table.item(row_idx, 0).text())
-        username = self.pending_table.item(row_idx, 2).text()
-        team_name = self.pending_table.item(row_idx, 3).text()
-        team_code = self.pending_table.item(row_idx, 4).text()
+        if len(selected_rows) == 1:
+            row = selected_rows[0]
+            question = f"Are you sure you want to reject '{row[2]}' from team '{row[3]}' ({row[4]})?"
+        else:
+            question = f"Are you sure you want to reject {len(selected_rows)} selected members?"
         
         # Confirm rejection
         reply = QMessageBox.question(
             self,
             "Confirm Reject",
-            f"Are you sure you want to reject '{username}' from team '{team_name}' ({team_code})?",
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            connection = get_connection()
-            if not connection:
-                QMessageBox.critical(self, "Error", "Cannot connect to database")
+            changed = self._set_member_status(selected_rows, "rejected", "reject")
+            if changed is None:
                 return
-            
-            try:
-                cursor = connection.cursor()
-                cursor.execute("""
-                    UPDATE team_members SET status = 'rejected'
-                    WHERE id = %s
-                """, (member_id,))
-                connection.commit()
-                cursor.close()
-                QMessageBox.information(self, "Success", f"Rejected '{username}' from team '{team_name}' ({team_code})")
-                self.load_pending_approvals()
-                self.load_team_members()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to reject member: {str(e)}")
-            finally:
-                close_connection(connection)
+            if len(selected_rows) == 1 and changed:
+                row = selected_rows[0]
+                QMessageBox.information(self, "Success", f"Rejected '{row[2]}' from team '{row[3]}' ({row[4]})")
+            else:
+                QMessageBox.information(self, "Success", self._bulk_summary("Rejected", changed, selected_rows))
+    
+    def _set_member_status(self, selected_rows, status, verb):
+        """Apply a status to the selected memberships and patch both membership tables; None on failure"""
+        try:
+            changed = MembershipRepository.set_status([row[0] for row in selected_rows], status)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to {verb} members: {str(e)}")
+            return None
+        if changed is None:
+            QMessageBox.critical(self, "Error", "Cannot connect to database")
+            return None
+        
+        self.pending_model.remove_rows(self.pending_model.rows_where(0, changed))
+        rows = self.team_members_model.rows_where(0, changed)
+        if self.member_status_combo.currentText() in ("All Statuses", status):
+            self.team_members_model.update_rows(rows, 5, status)
+        else:
+            self.team_members_model.remove_rows(rows)  # No longer matches the status filter
+        return changed
+    
+    def _bulk_summary(self, done, changed, selected_rows) -> str:
+        """Describe how many of the selected memberships a bulk action changed"""
+        message = f"{done} {len(changed)} member(s)"
+        skipped = len(selected_rows) - len(changed)
+        if skipped:
+            message += f"\n{skipped} member(s) were already changed elsewhere and were left alone"
+        return message
     
     def reassign_member(self):
-        """Reassign selected member to a different team"""
-        selected_rows = self.team_members_table.selectionModel().selectedRows()
+        """Reassign the selected members to a different team"""
+        selected_rows = self._selected_rows(self.team_members_table, self.team_members_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a member to reassign")
             return
         
         from PySide6.QtWidgets import QDialog, QComboBox, QLabel, QDialogButtonBox
         
-        row_idx = selected_rows[0].row()
-        member_id = int(self.team_members_table.item(row_idx, 0).text())
-        username = self.team_members_table.item(row_idx, 2).text()
-        current_team = self.team_members_table.item(row_idx, 3).text()
-        
         # Get all available teams
-        connection = get_connection()
-        if not connection:
-            QMessageBox.critical(self, "Error", "Cannot connect to database")
-            return
-        
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute("SELECT id, name, team_code FROM teams ORDER BY name")
-            teams = cursor.fetchall()
-            cursor.close()
-        finally:
-            close_connection(connection)
+        teams = get_reference_cache().teams()
         
         if not teams:
             QMessageBox.warning(self, "No Teams", "No teams available in the system")
@@ -829,12 +1249,15 @@ Approved: {approved}<br><br>
         
         layout = QVBoxLayout(dialog)
         
-        layout.addWidget(QLabel(f"Reassigning '{username}' from '{current_team}'"))
+        if len(selected_rows) == 1:
+            layout.addWidget(QLabel(f"Reassigning '{selected_rows[0][2]}' from '{selected_rows[0][3]}'"))
+        else:
+            layout.addWidget(QLabel(f"Reassigning {len(selected_rows)} selected members"))
         layout.addWidget(QLabel("Select new team:"))
         
         team_combo = QComboBox()
         for team in teams:
-            team_combo.addItem(f"{team['name']} ({team['team_code']})", team['id'])
+            team_combo.addItem(f"{team['name']} ({team['team_code']})", team)
         layout.addWidget(team_combo)
         
         # Dialog buttons
@@ -844,41 +1267,88 @@ Approved: {approved}<br><br>
         layout.addWidget(buttons)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            new_team_id = team_combo.currentData()
+            new_team = team_combo.currentData()
             
-            connection = get_connection()
-            if not connection:
+            try:
+                result = MembershipRepository.reassign([row[0] for row in selected_rows], new_team['id'])
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to reassign member: {str(e)}")
+                return
+            if result is None:
                 QMessageBox.critical(self, "Error", "Cannot connect to database")
                 return
+            changed, skipped = result
             
-            try:
-                cursor = connection.cursor()
-                cursor.execute("""
-                    UPDATE team_members SET team_id = %s
-                    WHERE id = %s
-                """, (new_team_id, member_id))
-                connection.commit()
-                cursor.close()
+            self.team_members_model.update_rows(self.team_members_model.rows_where(0, changed), 3, new_team['name'])
+            pending_rows = self.pending_model.rows_where(0, changed)
+            self.pending_model.update_rows(pending_rows, 3, new_team['name'])
+            self.pending_model.update_rows(pending_rows, 4, new_team['team_code'])
                 
-                new_team_name = team_combo.currentText()
-                QMessageBox.information(self, "Success", f"Reassigned '{username}' to {new_team_name}")
-                self.load_team_members()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to reassign member: {str(e)}")
-            finally:
-                close_connection(connection)
+            new_team_name = team_combo.currentText()
+            if len(selected_rows) == 1 and skipped:
+                QMessageBox.warning(
+                    self, "Already a Member", f"'{selected_rows[0][2]}' is already a member of {new_team_name}"
+                )
+            elif len(selected_rows) == 1:
+                QMessageBox.information(self, "Success", f"Reassigned '{selected_rows[0][2]}' to {new_team_name}")
+            else:
+                message = f"Reassigned {len(changed)} member(s) to {new_team_name}"
+                if skipped:
+                    usernames = [row[2] for row in selected_rows if row[0] in skipped]
+                    message += f"\n\nSkipped {len(skipped)} already on that team: {', '.join(usernames)}"
+                QMessageBox.information(self, "Success", message)
+    
+    def show_member_history(self):
+        """Show the audit events of the selected membership"""
+        selected_rows = self._selected_rows(self.team_members_table, self.team_members_model)
+        if not selected_rows:
+            QMessageBox.warning(self, "No Selection", "Please select a member to view")
+            return
+        
+        row = selected_rows[0]
+        self.query_runner.submit(
+            "member_history", AuditRepository.find_events, "team_member", row[0],
+            since=datetime.now() - timedelta(days=MEMBER_HISTORY_DAYS),
+            on_result=lambda events: self._show_member_history(row, events),
+            on_error=self._on_load_failed,
+        )
+    
+    def _show_member_history(self, row, events):
+        """Display a membership's audit events, newest first, in a dialog"""
+        if events is None:
+            QMessageBox.critical(self, "Error", "Cannot connect to database")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"History of '{row[2]}' in '{row[3]}'")
+        dialog.setGeometry(200, 200, 700, 400)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"Changes in the last {MEMBER_HISTORY_DAYS} days"))
+        
+        table, model = self._create_table(layout, ["When", "Action", "Previous", "New", "Description"])
+        model.set_rows([
+            (event['created_at'], event['action'], event['previous_value'] or "",
+             event['new_value'] or "", event['description'] or "")
+            for event in events
+        ])
+        table.resizeColumnsToContents()
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(dialog.accept)
+        layout.addWidget(close_btn)
+        dialog.exec()
     
     def unassign_member(self):
         """Remove member from their current team"""
-        selected_rows = self.team_members_table.selectionModel().selectedRows()
+        selected_rows = self._selected_rows(self.team_members_table, self.team_members_model)
         if not selected_rows:
             QMessageBox.warning(self, "No Selection", "Please select a member to unassign")
             return
         
-        row_idx = selected_rows[0].row()
-        member_id = int(self.team_members_table.item(row_idx, 0).text())
-        username = self.team_members_table.item(row_idx, 2).text()
-        team_name = self.team_members_table.item(row_idx, 3).text()
+        row = selected_rows[0]
+        member_id = row[0]
+        username = row[2]
+        team_name = row[3]
         
         # Confirm unassignment
         reply = QMessageBox.question(
@@ -896,12 +1366,19 @@ Approved: {approved}<br><br>
             
             try:
                 cursor = connection.cursor()
+                # The listing shows team names, which are not unique; file the event under the row's own team
+                cursor.execute("SELECT team_id FROM team_members WHERE id = %s FOR UPDATE", (member_id,))
+                membership = cursor.fetchone()
                 # Delete the team membership
                 cursor.execute("""
                     DELETE FROM team_members WHERE id = %s
                 """, (member_id,))
                 connection.commit()
                 cursor.close()
+                if membership:
+                    audit("membership_removed", "team_member", member_id, team_name,
+                          description=f"Unassigned '{username}' from team '{team_name}'",
+                          team_id=membership[0])
                 QMessageBox.information(self, "Success", f"Unassigned '{username}' from team '{team_name}'")
                 self.load_team_members()
             except Exception as e:
@@ -910,14 +1387,19 @@ Approved: {approved}<br><br>
                 close_connection(connection)
     
     def refresh_all_data(self):
-        """Refresh all data in all tabs"""
-        self.load_all_users()
-        self.load_teams()
-        self.load_team_members()
-        self.load_pending_approvals()
-        self.load_roles()
-        self.load_statistics()
-        QMessageBox.information(self, "Success", "All data refreshed successfully")
+        """Refresh all data in all tabs
+        
+        Every query is submitted at once, so they run concurrently on separate pooled connections.
+        """
+        self.refresh_pending = set(self.tab_for_query)
+        self.refresh_started = time.perf_counter()
+        for load in self.loaders.values():
+            load()
+    
+    def closeEvent(self, event):
+        """Drop outstanding background queries when the window closes"""
+        self.query_runner.cancel_all()
+        super().closeEvent(event)
 
     def _get_stylesheet(self) -> str:
         """Return the stylesheet for the window."""
@@ -961,7 +1443,7 @@ Approved: {approved}<br><br>
         QPushButton:pressed {
             background-color: #3d8b40;
         }
-        QTableWidget {
+        QTableView {
             border: 1px solid #cccccc;
             border-radius: 4px;
             background-color: white;